@@ -0,0 +1,116 @@
+"""
+Бюджеты запросов к БД для маршрутов API.
+
+Для каждого маршрута `router_v1` и HTTP-метода задается максимальное
+количество SQL-запросов и суммарное время их выполнения. Бюджеты
+проверяются тестами (tests/test_24_query_budgets.py) и, при включенной
+настройке QUERY_BUDGET_LOGGING, middleware `QueryBudgetMiddleware`.
+"""
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Budget(NamedTuple):
+    """Бюджет маршрута: количество запросов и время в миллисекундах."""
+
+    queries: int
+    db_time_ms: float
+
+
+# Один запрос на чтение версий кешей (`api.v1.cache.get_version`),
+# запись добавляет еще увеличение версий после фиксации транзакции.
+READ = Budget(queries=5, db_time_ms=50)
+WRITE = Budget(queries=14, db_time_ms=100)
+# Удаление пользователя или произведения каскадно удаляет отзывы
+# и комментарии, обработчики сигналов пересчитывают счетчики
+# для каждого удаленного объекта.
+CASCADE = Budget(queries=20, db_time_ms=200)
+
+ROUTE_BUDGETS: Dict[str, Dict[str, Budget]] = {
+    'api-root': {'GET': Budget(queries=1, db_time_ms=10)},
+    'users-list': {'GET': READ, 'POST': WRITE},
+    'users-detail': {'GET': READ, 'PATCH': WRITE, 'DELETE': CASCADE},
+    'users-me': {'GET': READ, 'PATCH': WRITE},
+    'categories-list': {'GET': READ, 'POST': WRITE},
+    'categories-detail': {'DELETE': WRITE},
+    'genres-list': {'GET': READ, 'POST': WRITE},
+    'genres-detail': {'DELETE': WRITE},
+    'titles-list': {'GET': READ, 'POST': WRITE},
+    'titles-detail': {'GET': READ, 'PATCH': WRITE, 'DELETE': CASCADE},
+    'titles-bulk': {'POST': Budget(queries=20, db_time_ms=200)},
+    'titles-export': {'GET': READ},
+    'titles-top': {'GET': READ},
+    'reviews-list': {'GET': READ, 'POST': WRITE},
+    'reviews-detail': {'GET': READ, 'PATCH': WRITE, 'DELETE': WRITE},
+    'comments-list': {'GET': READ, 'POST': WRITE},
+    'comments-detail': {'GET': READ, 'PATCH': WRITE, 'DELETE': WRITE},
+}
+
+
+def get_budget(route_name: Optional[str], method: str) -> Optional[Budget]:
+    """Возвращает бюджет маршрута или None, если он не задан."""
+    return ROUTE_BUDGETS.get(route_name, {}).get(method)
+
+
+class QueryRecorder:
+    """
+    Записывает SQL-запросы соединения и время их выполнения.
+
+    Использует `connection.execute_wrapper()`, поэтому работает
+    и при DEBUG = False.
+    """
+
+    def __init__(self, using: str = DEFAULT_DB_ALIAS) -> None:
+        self.connection = connections[using]
+        self.queries: List[dict] = []
+        self._wrapper = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                'sql': sql,
+                'params': params,
+                'duration_ms': (time.perf_counter() - started) * 1000,
+            })
+
+    def __enter__(self):
+        self._wrapper = self.connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._wrapper.__exit__(exc_type, exc_value, traceback)
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def db_time_ms(self) -> float:
+        return sum(query['duration_ms'] for query in self.queries)
+
+    def format_queries(self) -> str:
+        return '\n'.join(
+            f'{number}. [{query["duration_ms"]:.2f} мс] {query["sql"]}'
+            for number, query in enumerate(self.queries, 1)
+        )
+
+
+def check_budget(budget: Budget, recorder: QueryRecorder) -> List[str]:
+    """Возвращает описания нарушений бюджета (пустой список, если их нет)."""
+    violations = []
+    if recorder.count > budget.queries:
+        violations.append(
+            f'запросов {recorder.count} при бюджете {budget.queries}'
+        )
+    if recorder.db_time_ms > budget.db_time_ms:
+        violations.append(
+            f'время БД {recorder.db_time_ms:.2f} мс '
+            f'при бюджете {budget.db_time_ms} мс'
+        )
+    return violations
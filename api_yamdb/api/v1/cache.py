@@ -0,0 +1,192 @@
+"""Кеширование ответов API каталога."""
+import threading
+import time
+from hashlib import md5
+from typing import Dict, Iterable, Optional
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+
+from reviews.models import ResourceVersion
+
+from .metrics import observe_cache_access
+
+CATALOG_VERSION_KEY = 'api:v1:catalog:version'
+RESPONSE_KEY_PREFIX = 'api:v1:response'
+STATS_KEY_PREFIX = 'api:v1:response:stats'
+
+
+class VersionScope(threading.local):
+    """Версии, прочитанные в текущем запросе (см. `begin_version_scope`)."""
+
+    active = False
+    versions: Optional[Dict[str, int]] = None
+
+
+_scope = VersionScope()
+
+
+def begin_version_scope() -> None:
+    """
+    Начинает область чтения версий (запрос к API).
+
+    Внутри области версии читаются из БД одним запросом при первом
+    обращении и запоминаются до конца области.
+    """
+    _scope.active, _scope.versions = True, None
+
+
+def end_version_scope() -> None:
+    """Завершает область чтения версий."""
+    _scope.active, _scope.versions = False, None
+
+
+def get_version(key: str) -> int:
+    """
+    Возвращает значение счетчика версии.
+
+    Счетчики хранятся в БД (`ResourceVersion`), поэтому изменения,
+    сделанные одним процессом, видны всем процессам. Счетчик,
+    который еще не увеличивался, равен нулю.
+    """
+    if not _scope.active:
+        return ResourceVersion.objects.filter(name=key).values_list(
+            'value', flat=True
+        ).first() or 0
+    if _scope.versions is None:
+        _scope.versions = dict(
+            ResourceVersion.objects.values_list('name', 'value')
+        )
+    return _scope.versions.get(key, 0)
+
+
+def bump_version(*keys: str) -> None:
+    """
+    Увеличивает счетчики версий одним запросом.
+
+    Отсутствующий счетчик создается со значением из текущего
+    времени, чтобы версии не повторяли уже выданные до очистки
+    таблицы.
+    """
+    updated = ResourceVersion.objects.filter(name__in=keys).update(
+        value=F('value') + 1
+    )
+    if updated < len(set(keys)):
+        existing = set(ResourceVersion.objects.filter(
+            name__in=keys
+        ).values_list('name', flat=True))
+        ResourceVersion.objects.bulk_create(
+            [
+                ResourceVersion(name=key, value=time.time_ns())
+                for key in set(keys) - existing
+            ],
+            ignore_conflicts=True,
+        )
+        _scope.versions = None
+    elif _scope.versions is not None:
+        # Версии, прочитанные в запросе, не больше текущих в БД,
+        # поэтому увеличения достаточно без повторного чтения.
+        for key in set(keys):
+            if key in _scope.versions:
+                _scope.versions[key] += 1
+            else:
+                _scope.versions = None
+                break
+
+
+def bump_and_get_version(key: str, *keys: str) -> int:
+    """
+    Увеличивает счетчики версий и возвращает новое значение `key`.
+
+    Чтение выполняется в той же транзакции, что и увеличение,
+    поэтому значение соответствует именно этому увеличению.
+    Прочитанные версии запоминаются в области запроса.
+    """
+    with transaction.atomic():
+        bump_version(key, *keys)
+        versions = dict(
+            ResourceVersion.objects.values_list('name', 'value')
+        )
+    if _scope.active:
+        _scope.versions = versions
+    return versions[key]
+
+
+def get_catalog_version() -> int:
+    """
+    Возвращает текущую версию каталога.
+
+    Версия входит в ключи кеша ответов, поэтому ее увеличение
+    делает недействительными все закешированные ответы каталога.
+    """
+    return get_version(CATALOG_VERSION_KEY)
+
+
+def bump_catalog_version() -> None:
+    """Увеличивает версию каталога."""
+    bump_version(CATALOG_VERSION_KEY)
+
+
+def get_request_role(request) -> str:
+    """Возвращает роль пользователя для ключа кеша."""
+    user = request.user
+    if not user or not user.is_authenticated:
+        return 'anonymous'
+    if user.is_admin:
+        return 'admin'
+    return user.role
+
+
+def get_request_digest(request, *extra) -> str:
+    """
+    Возвращает хеш представления ответа на запрос.
+
+    Учитываются путь, отсортированные параметры запроса
+    (фильтры, поиск, пагинация), роль пользователя и `extra`.
+    """
+    params = sorted(
+        (name, value)
+        for name, values in request.query_params.lists()
+        for value in values
+    )
+    raw_key = f'{request.path}|{params}|{get_request_role(request)}|{extra}'
+    return md5(raw_key.encode()).hexdigest()
+
+
+def build_response_cache_key(request, version: int) -> str:
+    """Строит ключ кеша ответа для версии каталога."""
+    return f'{RESPONSE_KEY_PREFIX}:{version}:{get_request_digest(request)}'
+
+
+def _stats_key(endpoint: str, outcome: str) -> str:
+    return f'{STATS_KEY_PREFIX}:{endpoint}:{outcome}'
+
+
+def record_cache_access(endpoint: str, hit: bool) -> None:
+    """Увеличивает счетчик попаданий или промахов кеша эндпоинта."""
+    observe_cache_access(endpoint, hit)
+    key = _stats_key(endpoint, 'hits' if hit else 'misses')
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def get_cache_stats(endpoints: Iterable[str]) -> Dict[str, Dict[str, int]]:
+    """Возвращает счетчики попаданий и промахов кеша по эндпоинтам."""
+    endpoints = list(endpoints)
+    keys = [
+        _stats_key(endpoint, outcome)
+        for endpoint in endpoints
+        for outcome in ('hits', 'misses')
+    ]
+    values = cache.get_many(keys)
+    return {
+        endpoint: {
+            outcome: values.get(_stats_key(endpoint, outcome), 0)
+            for outcome in ('hits', 'misses')
+        }
+        for endpoint in endpoints
+    }
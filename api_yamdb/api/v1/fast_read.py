@@ -0,0 +1,246 @@
+"""
+Быстрое чтение списков без построения объектов модели и ModelSerializer.
+
+Строки выбираются через `values_list()` и сразу упаковываются в объекты
+с `__slots__`, а ответ строится по заранее составленному плану полей.
+Порядок и представление полей совпадают с сериализаторами,
+поэтому JSON ответа побайтно совпадает с обычным путем.
+"""
+from collections import defaultdict
+from functools import lru_cache
+from itertools import islice
+from operator import attrgetter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.db.models.query import ValuesListIterable
+from django.utils.functional import cached_property
+
+from reviews.models import Title
+
+from .serializers import (CommentSerializer, ReviewSerializer,
+                          TitleReadSerializer)
+
+
+class RowIterable(ValuesListIterable):
+    """Итератор QuerySet, возвращающий строки плана вместо кортежей."""
+
+    row_class = None
+    attributes: Tuple[str, ...] = ()
+
+    def __iter__(self):
+        row_class, attributes = self.row_class, self.attributes
+        for values in super().__iter__():
+            yield row_class(attributes, values)
+
+
+def make_row_class(name: str, attributes: Iterable[str]):
+    """Создает класс строки с `__slots__` для атрибутов плана."""
+
+    def __init__(self, names, values):
+        for attribute, value in zip(names, values):
+            setattr(self, attribute, value)
+
+    return type(name, (), {
+        '__slots__': tuple(attributes),
+        '__init__': __init__,
+    })
+
+
+@lru_cache(maxsize=None)
+def get_row_iterable(row_class, attributes: Tuple[str, ...]):
+    """Возвращает класс итератора для набора выбираемых атрибутов."""
+    return type(
+        f'{row_class.__name__}Iterable',
+        (RowIterable,),
+        {'row_class': row_class, 'attributes': attributes},
+    )
+
+
+class ReadPlan:
+    """
+    План быстрого чтения для сериализатора.
+
+    `columns` сопоставляет атрибуты строки с выражениями `values_list()`,
+    `field_columns` - поля ответа с нужными им атрибутами (по умолчанию
+    атрибут с именем поля), `related_attributes` - атрибуты, заполняемые
+    в `load_related()` отдельными запросами.
+    """
+
+    serializer_class = None
+    columns: Dict[str, str] = {}
+    field_columns: Dict[str, Tuple[str, ...]] = {}
+    related_attributes: Tuple[str, ...] = ()
+
+    def __init__(self) -> None:
+        self.row_class = make_row_class(
+            f'{type(self).__name__}Row',
+            tuple(self.columns) + self.related_attributes,
+        )
+
+    @cached_property
+    def field_names(self) -> Tuple[str, ...]:
+        return tuple(self.serializer_class.Meta.fields)
+
+    @cached_property
+    def getters(self) -> Dict[str, Callable]:
+        return self.get_getters()
+
+    def get_getters(self) -> Dict[str, Callable]:
+        """Возвращает функции получения значений полей ответа из строки."""
+        return {name: attrgetter(name) for name in self.field_names}
+
+    def get_attributes(self, model, fields: Optional[List[str]],
+                       ordering: Iterable = (), annotations: Iterable = ()):
+        """
+        Возвращает атрибуты строки, которые нужно выбрать из БД.
+
+        Кроме выбранных полей выбираются поля сортировки модели
+        и запроса (по ним строится курсор пагинации) и аннотации
+        QuerySet, которые есть в `columns`.
+        """
+        attributes = {model._meta.pk.name, *annotations}
+        attributes.update(name.lstrip('-') for name in model._meta.ordering)
+        attributes.update(
+            name.lstrip('-') for name in ordering if isinstance(name, str)
+        )
+        for name in self.field_names if fields is None else fields:
+            attributes.update(self.field_columns.get(name, (name,)))
+        return tuple(name for name in self.columns if name in attributes)
+
+    def get_queryset(self, queryset, fields: Optional[List[str]] = None):
+        """Превращает QuerySet модели в QuerySet строк плана."""
+        attributes = self.get_attributes(
+            queryset.model, fields, queryset.query.order_by,
+            queryset.query.annotations,
+        )
+        queryset = queryset.prefetch_related(None).values_list(
+            *(self.columns[name] for name in attributes)
+        )
+        queryset._iterable_class = get_row_iterable(
+            self.row_class, attributes
+        )
+        return queryset
+
+    def load_related(self, rows: List, fields: Optional[List[str]]) -> None:
+        """Загружает связанные данные для строк страницы."""
+
+    def serialize(self, rows: Iterable,
+                  fields: Optional[List[str]] = None) -> List[dict]:
+        """Строит данные ответа для строк."""
+        rows = list(rows)
+        self.load_related(rows, fields)
+        plan = [
+            (name, getter) for name, getter in self.getters.items()
+            if fields is None or name in fields
+        ]
+        return [{name: getter(row) for name, getter in plan} for row in rows]
+
+    def iterate(self, queryset, chunk_size: int,
+                fields: Optional[List[str]] = None) -> Iterable[dict]:
+        """Лениво строит данные для всего QuerySet, читая БД частями."""
+        rows = self.get_queryset(queryset, fields).iterator(
+            chunk_size=chunk_size
+        )
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            yield from self.serialize(chunk, fields)
+
+
+class TitleReadPlan(ReadPlan):
+    """План чтения произведений для `TitleReadSerializer`."""
+
+    serializer_class = TitleReadSerializer
+    columns = {
+        'id': 'id',
+        'name': 'name',
+        'year': 'year',
+        'description': 'description',
+        'category_name': 'category__name',
+        'category_slug': 'category__slug',
+        'rating': 'rating',
+    }
+    field_columns = {
+        'genre': (),
+        'category': ('category_name', 'category_slug'),
+    }
+    related_attributes = ('genre',)
+
+    def get_getters(self):
+        getters = super().get_getters()
+        getters['category'] = self.get_category
+        return getters
+
+    @staticmethod
+    def get_category(row):
+        if row.category_slug is None:
+            return None
+        return {'name': row.category_name, 'slug': row.category_slug}
+
+    def load_related(self, rows, fields):
+        """Загружает жанры страницы одним запросом к промежуточной таблице."""
+        if fields is not None and 'genre' not in fields:
+            return
+        through = Title.genre.through
+        links = through.objects.filter(
+            title_id__in=[row.id for row in rows]
+        ).order_by('genre__name', 'genre_id').values_list(
+            'title_id', 'genre__name', 'genre__slug'
+        )
+        genres = defaultdict(list)
+        for title_id, name, slug in links:
+            genres[title_id].append({'name': name, 'slug': slug})
+        for row in rows:
+            row.genre = genres.get(row.id, [])
+
+
+# Поля родителя, выбранные вместе со списком (`NestedParentMixin`).
+PARENT_COLUMNS = {
+    'parent_count': 'parent_count',
+    'parent_version': 'parent_version',
+}
+
+
+class AuthorPubDatePlan(ReadPlan):
+    """План чтения объектов с автором и датой публикации."""
+
+    def get_getters(self):
+        getters = super().get_getters()
+        pub_date = self.serializer_class().fields['pub_date']
+        getters['pub_date'] = (
+            lambda row: pub_date.to_representation(row.pub_date)
+        )
+        return getters
+
+
+class ReviewReadPlan(AuthorPubDatePlan):
+    """План чтения отзывов для `ReviewSerializer`."""
+
+    serializer_class = ReviewSerializer
+    columns = {
+        'id': 'id',
+        'text': 'text',
+        'author': 'author__username',
+        'score': 'score',
+        'pub_date': 'pub_date',
+        **PARENT_COLUMNS,
+    }
+
+
+class CommentReadPlan(AuthorPubDatePlan):
+    """План чтения комментариев для `CommentSerializer`."""
+
+    serializer_class = CommentSerializer
+    columns = {
+        'id': 'id',
+        'text': 'text',
+        'author': 'author__username',
+        'pub_date': 'pub_date',
+        **PARENT_COLUMNS,
+    }
+
+
+title_read_plan = TitleReadPlan()
+review_read_plan = ReviewReadPlan()
+comment_read_plan = CommentReadPlan()
@@ -0,0 +1,82 @@
+"""Поля сериализаторов API."""
+import threading
+from typing import Dict, Optional
+
+from django.utils.encoding import smart_str
+from rest_framework import serializers
+
+from .cache import bump_version, get_version
+
+
+class SlugCache:
+    """
+    Версионированный кеш процесса slug -> объект для небольших справочников.
+
+    Кеш загружает таблицу целиком одним запросом. Версия хранится
+    в БД (`ResourceVersion`) и увеличивается сигналами при сохранении
+    или удалении объектов, поэтому все процессы перечитывают таблицу
+    после изменений.
+    """
+
+    def __init__(self, model, slug_field: str = 'slug') -> None:
+        self.model = model
+        self.slug_field = slug_field
+        self.version_key = (
+            f'api:v1:slug_cache:{model._meta.label_lower}:version'
+        )
+        self.lock = threading.Lock()
+        self.version: Optional[int] = None
+        self.objects: Dict[str, object] = {}
+
+    def __deepcopy__(self, memo):
+        """Копии полей сериализатора используют общий кеш."""
+        return self
+
+    def bump_version(self) -> None:
+        """Делает кеш недействительным во всех процессах."""
+        bump_version(self.version_key)
+
+    def load(self, version: int) -> None:
+        objects = {
+            getattr(obj, self.slug_field): obj
+            for obj in self.model.objects.all()
+        }
+        with self.lock:
+            self.objects, self.version = objects, version
+
+    def get(self, slug: str):
+        """
+        Возвращает объект по slug или None, если объект не найден.
+
+        Таблица перечитывается только при смене версии: slug,
+        которого нет в кеше текущей версии, не существует.
+        """
+        version = get_version(self.version_key)
+        if version != self.version:
+            self.load(version)
+        return self.objects.get(slug)
+
+
+class CachedSlugRelatedField(serializers.SlugRelatedField):
+    """
+    SlugRelatedField, разрешающий slug через `SlugCache`.
+
+    Проверка и сообщения об ошибках совпадают с SlugRelatedField,
+    но запрос к БД выполняется только при изменении справочника.
+    """
+
+    def __init__(self, slug_cache: SlugCache, **kwargs) -> None:
+        self.slug_cache = slug_cache
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, (dict, list)):
+            self.fail('invalid')
+        obj = self.slug_cache.get(smart_str(data))
+        if obj is None:
+            self.fail(
+                'does_not_exist',
+                slug_name=self.slug_field,
+                value=smart_str(data),
+            )
+        return obj
@@ -1,7 +1,10 @@
 """Фильтры."""
+from django import forms
 from django_filters import rest_framework as api_filter
+from rest_framework.filters import OrderingFilter
 
 from reviews.models import Title
+from reviews.search import search_titles
 
 
 class TitleFilter(api_filter.FilterSet):
@@ -10,7 +13,44 @@ class TitleFilter(api_filter.FilterSet):
     name = api_filter.CharFilter(field_name='name', lookup_expr='icontains')
     genre = api_filter.CharFilter(field_name='genre__slug')
     category = api_filter.CharFilter(field_name='category__slug')
+    search = api_filter.CharFilter(method='filter_search')
 
     class Meta:
         model = Title
-        fields = ('name', 'year', 'genre', 'category')
+        fields = ('name', 'year', 'genre', 'category', 'search')
+
+    def filter_search(self, queryset, name, value):
+        """Полнотекстовый поиск по названию с сортировкой по релевантности."""
+        return search_titles(queryset, value)
+
+
+class StableOrderingFilter(OrderingFilter):
+    """
+    Сортировка по параметру `ordering` с `id` в конце.
+
+    Значения полей сортировки (например, `rating`) могут совпадать,
+    поэтому `id` делает порядок однозначным, и страницы limit/offset
+    не теряют и не повторяют строки.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if ordering and not any(
+                isinstance(name, str) and name.lstrip('-') in ('id', 'pk')
+                for name in ordering):
+            ordering = [*ordering, 'id']
+        return ordering
+
+
+class TitleTopFacetForm(forms.Form):
+    """Фасет рейтинга лучших произведений: жанр, категория и год."""
+
+    genre = forms.SlugField(required=False)
+    category = forms.SlugField(required=False)
+    year = forms.IntegerField(required=False)
+
+    def clean(self):
+        return {
+            name: value if value not in ('', None) else None
+            for name, value in super().clean().items()
+        }
@@ -0,0 +1,136 @@
+"""
+Рейтинг лучших произведений по фасетам (жанр, категория, год).
+
+Для каждого запрошенного сочетания фасетов в кеше хранится
+отсортированный список пар (рейтинг, id) с запасом сверх размера
+рейтинга. Изменение самих произведений увеличивает версию рейтинга,
+и списки строятся заново при следующем запросе.
+
+Изменение отзыва увеличивает версию оценок (`LEADERBOARD_SCORES_KEY`),
+которая тоже входит в ключ списка. Процесс, изменивший отзыв,
+переносит списки фасетов произведения под новую версию без пересчета,
+остальные списки (и все списки других процессов) строятся заново
+при следующем запросе, поэтому устаревший рейтинг не отдается.
+"""
+from hashlib import md5
+from itertools import product
+from typing import List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from reviews.models import Title
+
+from .cache import bump_and_get_version, bump_version, get_version
+
+LEADERBOARD_VERSION_KEY = 'api:v1:leaderboard:version'
+LEADERBOARD_SCORES_KEY = 'api:v1:leaderboard:scores'
+LEADERBOARD_KEY_PREFIX = 'api:v1:leaderboard'
+
+
+def get_capacity() -> int:
+    """Количество записей, хранимых для фасета."""
+    return settings.TITLE_TOP_SIZE * 2
+
+
+def bump_leaderboard_version() -> None:
+    """Делает недействительными рейтинги всех фасетов."""
+    bump_version(LEADERBOARD_VERSION_KEY)
+
+
+def _rank(entry: list) -> tuple:
+    """Ключ сортировки записи: рейтинг по убыванию, затем id."""
+    return -entry[0], entry[1]
+
+
+def get_facet_key(version: int, scores: int, genre: Optional[str],
+                  category: Optional[str], year: Optional[int]) -> str:
+    facet = md5(f'{genre}|{category}|{year}'.encode()).hexdigest()
+    return f'{LEADERBOARD_KEY_PREFIX}:{version}:{scores}:{facet}'
+
+
+def compute_facet(genre: Optional[str], category: Optional[str],
+                  year: Optional[int]) -> dict:
+    """Строит список лучших произведений фасета по базе данных."""
+    queryset = Title.objects.filter(rating__isnull=False)
+    if genre is not None:
+        queryset = queryset.filter(genre__slug=genre)
+    if category is not None:
+        queryset = queryset.filter(category__slug=category)
+    if year is not None:
+        queryset = queryset.filter(year=year)
+    capacity = get_capacity()
+    entries = [
+        list(entry) for entry in queryset.order_by('-rating', 'id')
+        .values_list('rating', 'id')[:capacity + 1]
+    ]
+    return {
+        'entries': entries[:capacity],
+        'complete': len(entries) <= capacity,
+    }
+
+
+def get_top_ids(genre: Optional[str] = None, category: Optional[str] = None,
+                year: Optional[int] = None) -> List[int]:
+    """Возвращает id лучших произведений фасета по убыванию рейтинга."""
+    key = get_facet_key(
+        get_version(LEADERBOARD_VERSION_KEY),
+        get_version(LEADERBOARD_SCORES_KEY),
+        genre, category, year,
+    )
+    board = cache.get(key)
+    size = settings.TITLE_TOP_SIZE
+    if board is None or (
+            not board['complete'] and len(board['entries']) < size):
+        board = compute_facet(genre, category, year)
+        cache.set(key, board, settings.TITLE_TOP_CACHE_TIMEOUT)
+    return [title_id for _, title_id in board['entries'][:size]]
+
+
+def update_title(title_id: int, *keys: str) -> None:
+    """
+    Обновляет позицию произведения в рейтингах всех его фасетов.
+
+    Увеличивает версию оценок (и версии `keys` тем же запросом)
+    и переносит уже построенные рейтинги процесса под новую версию.
+    Если произведение не попадает в неполный список, он не изменяется.
+    """
+    scores = bump_and_get_version(LEADERBOARD_SCORES_KEY, *keys)
+    title = Title.objects.filter(pk=title_id).values(
+        'rating', 'year', 'category__slug'
+    ).first()
+    if title is None:
+        return
+    genres = list(
+        Title.genre.through.objects.filter(title_id=title_id)
+        .values_list('genre__slug', flat=True)
+    )
+    version = get_version(LEADERBOARD_VERSION_KEY)
+    facets = list(product(
+        [None, *genres],
+        {None, title['category__slug']},
+        [None, title['year']],
+    ))
+    boards = cache.get_many([
+        get_facet_key(version, scores - 1, *facet) for facet in facets
+    ])
+    updated = {}
+    for facet in facets:
+        board = boards.get(get_facet_key(version, scores - 1, *facet))
+        if board is None:
+            continue
+        entries = [
+            entry for entry in board['entries'] if entry[1] != title_id
+        ]
+        entry = [title['rating'], title_id]
+        if title['rating'] is not None and (
+                board['complete']
+                or entries and _rank(entry) < _rank(entries[-1])):
+            entries.append(entry)
+            entries.sort(key=_rank)
+        if len(entries) > get_capacity():
+            entries = entries[:get_capacity()]
+            board['complete'] = False
+        board['entries'] = entries
+        updated[get_facet_key(version, scores, *facet)] = board
+    cache.set_many(updated, settings.TITLE_TOP_CACHE_TIMEOUT)
@@ -0,0 +1,87 @@
+"""
+Метрики API в формате Prometheus.
+
+Метрики размечаются именем view и действия (`TitleViewSet.list`,
+`APISignUpView.post`). При нескольких процессах (gunicorn, uwsgi)
+нужно задать переменную окружения PROMETHEUS_MULTIPROC_DIR до запуска
+процессов: значения хранятся в общих mmap-файлах этого каталога,
+а эндпоинт `/metrics` собирает их из всех процессов.
+"""
+import os
+
+from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY,
+                               CollectorRegistry, Counter, Histogram,
+                               generate_latest, multiprocess)
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+SIZE_BUCKETS = (
+    256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304,
+)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55)
+
+REQUESTS = Counter(
+    'yamdb_http_requests',
+    'Количество запросов к API.',
+    ('view', 'method', 'status'),
+)
+LATENCY = Histogram(
+    'yamdb_http_request_duration_seconds',
+    'Время обработки запроса.',
+    ('view', 'method'),
+    buckets=LATENCY_BUCKETS,
+)
+RESPONSE_SIZE = Histogram(
+    'yamdb_http_response_size_bytes',
+    'Размер тела ответа (кроме потоковых ответов).',
+    ('view', 'method'),
+    buckets=SIZE_BUCKETS,
+)
+DB_QUERIES = Histogram(
+    'yamdb_db_queries_per_request',
+    'Количество SQL-запросов на запрос к API.',
+    ('view', 'method'),
+    buckets=QUERY_BUCKETS,
+)
+DB_TIME = Histogram(
+    'yamdb_db_time_seconds',
+    'Суммарное время SQL-запросов на запрос к API.',
+    ('view', 'method'),
+    buckets=LATENCY_BUCKETS,
+)
+RESPONSE_CACHE = Counter(
+    'yamdb_response_cache',
+    'Обращения к кешу ответов по результату (hit/miss).',
+    ('view', 'outcome'),
+)
+
+
+def observe_request(view: str, method: str, status: int, duration: float,
+                    size, queries: int, db_time: float) -> None:
+    """Записывает метрики обработанного запроса."""
+    REQUESTS.labels(view, method, str(status)).inc()
+    LATENCY.labels(view, method).observe(duration)
+    if size is not None:
+        RESPONSE_SIZE.labels(view, method).observe(size)
+    DB_QUERIES.labels(view, method).observe(queries)
+    DB_TIME.labels(view, method).observe(db_time)
+
+
+def observe_cache_access(view: str, hit: bool) -> None:
+    """Записывает обращение к кешу ответов."""
+    RESPONSE_CACHE.labels(view, 'hit' if hit else 'miss').inc()
+
+
+def get_registry():
+    """Возвращает реестр метрик текущего процесса или всех процессов."""
+    if 'PROMETHEUS_MULTIPROC_DIR' not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def render_metrics():
+    """Возвращает метрики в текстовом формате Prometheus и content type."""
+    return generate_latest(get_registry()), CONTENT_TYPE_LATEST
@@ -0,0 +1,133 @@
+"""Middleware API."""
+import logging
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from .budgets import QueryRecorder, check_budget, get_budget
+from .metrics import observe_request
+from .profiler import profile_request
+
+logger = logging.getLogger('budgets')
+
+
+def get_view_name(request) -> str:
+    """Возвращает имя view для логов, например `TitleViewSet.list`."""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return request.path
+    view_class = getattr(match.func, 'cls', None)
+    if view_class is None:
+        return match.view_name
+    actions = getattr(match.func, 'actions', None) or {}
+    action = actions.get(request.method.lower(), request.method.lower())
+    return f'{view_class.__name__}.{action}'
+
+
+class QueryBudgetMiddleware:
+    """
+    Логирует превышение бюджетов запросов к БД (см. `api.v1.budgets`).
+
+    Подключается только при QUERY_BUDGET_LOGGING = True.
+    """
+
+    def __init__(self, get_response):
+        if not settings.QUERY_BUDGET_LOGGING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+        match = getattr(request, 'resolver_match', None)
+        budget = get_budget(
+            match.url_name if match else None, request.method
+        )
+        if budget is not None:
+            violations = check_budget(budget, recorder)
+            if violations:
+                logger.warning(
+                    'Превышен бюджет %s %s (%s): %s\n%s',
+                    request.method,
+                    request.path,
+                    get_view_name(request),
+                    '; '.join(violations),
+                    recorder.format_queries(),
+                )
+        return response
+
+
+class ProfilerMiddleware:
+    """
+    Профилирование запроса к API по требованию администратора.
+
+    Профиль снимается, если запрос к `/api/v1/` содержит заголовок
+    X-Profile или параметр `profile` и выполнен администратором.
+    Для остальных запросов проверяется только наличие триггера.
+    """
+
+    path_prefix = '/api/v1/'
+    header = 'X-Profile'
+    query_param = 'profile'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def is_triggered(self, request) -> bool:
+        return request.path.startswith(self.path_prefix) and (
+            self.header in request.headers
+            or self.query_param in request.GET
+        )
+
+    def is_admin(self, request) -> bool:
+        user = getattr(request, 'user', None)
+        if user is None or not user.is_authenticated:
+            try:
+                result = JWTAuthentication().authenticate(request)
+            except AuthenticationFailed:
+                return False
+            user = result[0] if result else None
+        return bool(user and user.is_authenticated and user.is_admin)
+
+    def __call__(self, request):
+        if not self.is_triggered(request) or not self.is_admin(request):
+            return self.get_response(request)
+        return profile_request(
+            request, self.get_response, lambda: get_view_name(request)
+        )
+
+
+class MetricsMiddleware:
+    """
+    Сбор метрик запросов (см. `api.v1.metrics`).
+
+    Подключается только при METRICS_ENABLED = True.
+    """
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+        if getattr(request, 'resolver_match', None) is None:
+            view = 'unresolved'
+        else:
+            view = get_view_name(request)
+        observe_request(
+            view,
+            request.method,
+            response.status_code,
+            duration,
+            None if response.streaming else len(response.content),
+            recorder.count,
+            recorder.db_time_ms / 1000,
+        )
+        return response
@@ -0,0 +1,485 @@
+"""Миксины для ViewSet API."""
+from http import HTTPStatus
+from itertools import islice
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import F, prefetch_related_objects
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.http import parse_etags
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .cache import (build_response_cache_key, get_catalog_version,
+                    get_request_digest, record_cache_access)
+from .renderers import FastJSONRenderer
+
+
+class ResponseCacheMixin:
+    """
+    Базовый миксин кеширования ответов GET-запросов.
+
+    Ответы хранятся в кеше Django и становятся недействительными
+    при изменении версии каталога (см. `api.v1.signals`).
+    """
+
+    cached_actions = ()
+    cache_timeout = settings.RESPONSE_CACHE_TIMEOUT
+
+    def get_cache_endpoint(self) -> str:
+        return f'{type(self).__name__}.{self.action}'
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        """Возвращает ответ из кеша или вызывает обработчик и кеширует его."""
+        key = build_response_cache_key(request, get_catalog_version())
+        data = cache.get(key)
+        if data is not None:
+            record_cache_access(self.get_cache_endpoint(), hit=True)
+            return Response(data)
+        record_cache_access(self.get_cache_endpoint(), hit=False)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, self.cache_timeout)
+        return response
+
+
+class CachedListMixin(ResponseCacheMixin):
+    """Кеширование ответов списка объектов."""
+
+    cached_actions = ('list',)
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+
+class CachedRetrieveMixin(CachedListMixin):
+    """Кеширование ответов списка и отдельного объекта."""
+
+    cached_actions = ('list', 'retrieve')
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class ConditionalGetMixin:
+    """
+    Условные GET-запросы по ETag.
+
+    ETag строится из счетчика версии ресурса (`get_etag_version`)
+    и параметров запроса. Если заголовок If-None-Match совпадает
+    с ETag, ответ 304 возвращается до выборки и сериализации данных;
+    `If-None-Match: *` дает 304 только для существующего ресурса.
+    При `etag_after_response = True` для запросов без If-None-Match
+    версия читается после обработчика, когда она уже выбрана
+    вместе с данными (`NestedParentMixin`).
+    """
+
+    etag_after_response = False
+
+    def get_etag_version(self):
+        """Возвращает версию ресурса или None, если ETag не нужен."""
+        return None
+
+    def get_etag(self, request):
+        version = self.get_etag_version()
+        if version is None:
+            return None
+        digest = get_request_digest(
+            request, version, request.accepted_renderer.format
+        )
+        return f'"{digest}"'
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        """Возвращает 304 при совпадении ETag или ответ обработчика."""
+        if_none_match = request.headers.get('If-None-Match')
+        etag_first = bool(if_none_match) or not self.etag_after_response
+        etag = self.get_etag(request) if etag_first else None
+        if etag is not None and if_none_match:
+            if etag in parse_etags(if_none_match):
+                return Response(
+                    status=HTTPStatus.NOT_MODIFIED, headers={'ETag': etag}
+                )
+        response = handler(request, *args, **kwargs)
+        if response.status_code != HTTPStatus.OK:
+            return response
+        if not etag_first:
+            etag = self.get_etag(request)
+        if etag is not None and if_none_match == '*':
+            # `*` совпадает с любым существующим ресурсом: это известно
+            # только после ответа обработчика со статусом 200.
+            return Response(
+                status=HTTPStatus.NOT_MODIFIED, headers={'ETag': etag}
+            )
+        if etag is not None:
+            response['ETag'] = etag
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class NestedParentMixin:
+    """
+    Вложенный ресурс, выбираемый вместе с полями родителя.
+
+    QuerySet дочерних объектов фильтруется по id родителей из url
+    (`parent_lookups`: аргумент url - условие фильтра), а поля
+    родителя `parent_fields` выбираются тем же запросом через JOIN
+    в аннотации `parent_<ключ>`. Родитель выбирается отдельным
+    запросом (`get_parent()`), только если его поля нужны до выборки
+    (ETag для If-None-Match, создание объекта) или страница пуста:
+    тогда запрос проверяет, что родитель существует.
+
+    Атрибуты `parent_field` (внешний ключ на родителя) и `parent_lookups`
+    обязательны: условия фильтра `<parent_field>_id`
+    и `<parent_field>__<поле>` задают и выборку самого родителя.
+    """
+
+    parent_field = None
+    parent_lookups = {}
+    parent_fields = {}
+    etag_after_response = True
+
+    def get_parent(self):
+        """
+        Возвращает родителя из url или вызывает Http404.
+
+        Родитель выбирается одним запросом по всем аргументам url,
+        поэтому проверяется и его связь с родителями верхних уровней.
+        """
+        if not hasattr(self, '_parent'):
+            prefix = f'{self.parent_field}__'
+            lookups = {}
+            for kwarg, lookup in self.parent_lookups.items():
+                if lookup == f'{self.parent_field}_id':
+                    lookup = 'pk'
+                elif lookup.startswith(prefix):
+                    lookup = lookup[len(prefix):]
+                lookups[lookup] = self.kwargs[kwarg]
+            model = self.get_queryset().model._meta.get_field(
+                self.parent_field
+            ).related_model
+            self._parent = get_object_or_404(model, **lookups)
+        return self._parent
+
+    def filter_by_parent(self, queryset):
+        """Фильтрует QuerySet по url и добавляет поля родителя."""
+        return queryset.filter(**{
+            lookup: self.kwargs[kwarg]
+            for kwarg, lookup in self.parent_lookups.items()
+        }).annotate(**{
+            f'parent_{key}': F(f'{self.parent_field}__{name}')
+            for key, name in self.parent_fields.items()
+        })
+
+    def remember_parent(self, objects):
+        """Запоминает поля родителя из первого выбранного объекта."""
+        if objects and not hasattr(self, '_parent_values'):
+            self._parent_values = {
+                key: getattr(objects[0], f'parent_{key}')
+                for key in self.parent_fields
+            }
+
+    def get_parent_value(self, key):
+        values = getattr(self, '_parent_values', None)
+        if values is None:
+            return getattr(self.get_parent(), self.parent_fields[key])
+        return values[key]
+
+    def get_pagination_count(self, page=None):
+        self.remember_parent(page)
+        return self.get_parent_value('count')
+
+    def get_etag_version(self):
+        return self.get_parent_value('version')
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if page is not None:
+            self.remember_parent(page)
+            if not page:
+                self.get_parent()
+        return page
+
+    def get_object(self):
+        obj = super().get_object()
+        self.remember_parent([obj])
+        return obj
+
+
+class SparseFieldsetMixin:
+    """
+    Выбор полей ответа параметрами запроса `fields` и `omit`.
+
+    Выбранные поля передаются сериализатору через контекст
+    (`sparse_fields`), а из запроса к БД исключаются столбцы
+    невыбранных полей. Столбцы сортировки запроса загружаются всегда:
+    по ним строится курсор пагинации. Связи из `select_related_fields`
+    и `prefetch_related_fields` загружаются, только если поле выбрано.
+    """
+
+    sparse_actions = ('list', 'retrieve')
+    select_related_fields = ()
+    prefetch_related_fields = ()
+
+    @staticmethod
+    def _parse_field_names(value):
+        return [name.strip() for name in value.split(',') if name.strip()]
+
+    def get_sparse_fields(self):
+        """Возвращает список выбранных полей или None, если выбраны все."""
+        if self.action not in self.sparse_actions:
+            return None
+        fields = self.request.query_params.get('fields')
+        omit = self.request.query_params.get('omit')
+        if not fields and not omit:
+            return None
+        available = self.get_serializer_class().Meta.fields
+        requested = self._parse_field_names(fields or '') or available
+        omitted = self._parse_field_names(omit or '')
+        unknown = set(requested).union(omitted).difference(available)
+        if unknown:
+            raise ValidationError({
+                'fields': f'Неизвестные поля: {", ".join(sorted(unknown))}.'
+            })
+        return [
+            name for name in available
+            if name in requested and name not in omitted
+        ]
+
+    def get_sparse_columns(self, model, fields, ordering=()):
+        """Возвращает столбцы модели для выбранных полей и сортировки."""
+        columns = {model._meta.pk.name}
+        columns.update(name.lstrip('-') for name in model._meta.ordering)
+        ordering = [
+            name.lstrip('-') for name in ordering if isinstance(name, str)
+        ]
+        for name in [*fields, *ordering]:
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if field.concrete and not field.many_to_many:
+                columns.add(name)
+        return sorted(columns)
+
+    def apply_sparse_fieldset(self, queryset):
+        """Ограничивает связи запроса выбранными полями."""
+        fields = self.get_sparse_fields()
+        for name in self.select_related_fields:
+            if fields is None or name in fields:
+                queryset = queryset.select_related(name)
+        for name in self.prefetch_related_fields:
+            if fields is None or name in fields:
+                queryset = queryset.prefetch_related(name)
+        return queryset
+
+    def filter_queryset(self, queryset):
+        """
+        Ограничивает столбцы запроса выбранными полями.
+
+        Столбцы выбираются после фильтров, когда сортировка
+        запроса (параметр `ordering`) уже известна.
+        """
+        queryset = super().filter_queryset(queryset)
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            queryset = queryset.only(*self.get_sparse_columns(
+                queryset.model, fields, queryset.query.order_by
+            ))
+        return queryset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['sparse_fields'] = self.get_sparse_fields()
+        return context
+
+
+class BatchLookupMixin:
+    """
+    Выборка нескольких объектов списка за один запрос.
+
+    Параметр `batch_query_param` (например, `?ids=3,1,2`) задает
+    значения поля `batch_lookup_field`. Объекты выбираются одним
+    запросом `IN` и возвращаются в порядке значений, без пагинации.
+    Отсутствующие объекты пропускаются. Количество значений
+    ограничено настройкой `BATCH_LOOKUP_MAX_SIZE`.
+    """
+
+    batch_query_param = 'ids'
+    batch_lookup_field = 'pk'
+    batch_value_type = int
+
+    def get_batch_values(self):
+        """Возвращает значения из параметра запроса или None."""
+        raw = self.request.query_params.get(self.batch_query_param)
+        if raw is None:
+            return None
+        try:
+            values = [
+                self.batch_value_type(value.strip())
+                for value in raw.split(',') if value.strip()
+            ]
+        except ValueError:
+            raise ValidationError({
+                self.batch_query_param: 'Передайте значения через запятую.'
+            })
+        values = list(dict.fromkeys(values))
+        if len(values) > settings.BATCH_LOOKUP_MAX_SIZE:
+            raise ValidationError({
+                self.batch_query_param: (
+                    'Можно запросить не более '
+                    f'{settings.BATCH_LOOKUP_MAX_SIZE} объектов.'
+                )
+            })
+        return values
+
+    def list(self, request, *args, **kwargs):
+        values = self.get_batch_values()
+        if values is None:
+            return super().list(request, *args, **kwargs)
+        objects = {
+            getattr(obj, self.batch_lookup_field): obj
+            for obj in self.get_queryset().filter(
+                **{f'{self.batch_lookup_field}__in': values}
+            )
+        }
+        serializer = self.get_serializer(
+            [objects[value] for value in values if value in objects],
+            many=True,
+        )
+        return Response(serializer.data)
+
+
+class FastReadMixin:
+    """
+    Быстрое чтение списка по плану `fast_read_plan` (см. `api.v1.fast_read`).
+
+    Включается настройкой `FAST_READ_ENABLED`. Фильтрация, пагинация
+    и выбор полей работают так же, как при чтении через сериализатор.
+    """
+
+    fast_read_plan = None
+
+    def list(self, request, *args, **kwargs):
+        if self.fast_read_plan is None or not settings.FAST_READ_ENABLED:
+            return super().list(request, *args, **kwargs)
+        fields = self.get_serializer_context().get('sparse_fields')
+        queryset = self.fast_read_plan.get_queryset(
+            self.filter_queryset(self.get_queryset()), fields
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(
+                self.fast_read_plan.serialize(page, fields)
+            )
+        return Response(self.fast_read_plan.serialize(queryset, fields))
+
+
+class StreamingPageMixin:
+    """
+    Потоковая отдача больших страниц списка.
+
+    Если запрошен `limit` не меньше `STREAMING_RESPONSE_MIN_LIMIT`,
+    а ответ кодируется `FastJSONRenderer`, ответ отправляется
+    через `StreamingHttpResponse` частями по
+    `STREAMING_RESPONSE_CHUNK_SIZE` объектов.
+
+    Если пагинатор умеет выбирать страницу лениво
+    (`paginate_queryset_lazily`), строки страницы читаются из БД
+    и сериализуются по частям во время отправки ответа, а сама
+    страница в памяти не собирается. Такие ответы не кешируются
+    (`ResponseCacheMixin`), но проверка ETag сохраняется.
+    """
+
+    def can_stream_lazily(self, request) -> bool:
+        paginator = self.paginator
+        if (paginator is None
+                or not hasattr(paginator, 'paginate_queryset_lazily')
+                or not paginator.supports_lazy_page(request)):
+            return False
+        batch_query_param = getattr(self, 'batch_query_param', None)
+        return (
+            isinstance(request.accepted_renderer, FastJSONRenderer)
+            and batch_query_param not in request.query_params
+            and paginator.get_limit(request)
+            >= settings.STREAMING_RESPONSE_MIN_LIMIT
+        )
+
+    def list(self, request, *args, **kwargs):
+        if not self.can_stream_lazily(request):
+            return super().list(request, *args, **kwargs)
+        conditional_response = getattr(self, 'conditional_response', None)
+        if conditional_response is None:
+            return self.stream_list(request, *args, **kwargs)
+        return conditional_response(self.stream_list, request, *args, **kwargs)
+
+    def stream_list(self, request, *args, **kwargs):
+        """Возвращает страницу списка с ленивым итератором `results`."""
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginator.paginate_queryset_lazily(
+            queryset, request, view=self
+        )
+        return self.get_paginated_response(self.iterate_page(page))
+
+    def iterate_page(self, page):
+        """Лениво сериализует объекты страницы частями."""
+        chunk_size = settings.STREAMING_RESPONSE_CHUNK_SIZE
+        plan = getattr(self, 'fast_read_plan', None)
+        if plan is not None and settings.FAST_READ_ENABLED:
+            fields = self.get_serializer_context().get('sparse_fields')
+            yield from plan.iterate(page, chunk_size, fields)
+            return
+        objects = page.iterator(chunk_size=chunk_size)
+        while True:
+            chunk = list(islice(objects, chunk_size))
+            if not chunk:
+                break
+            prefetch_related_objects(chunk, *page._prefetch_related_lookups)
+            yield from self.get_serializer(chunk, many=True).data
+
+    def should_stream(self, response) -> bool:
+        if self.paginator is None:
+            return False
+        limit = self.paginator.get_limit(self.request)
+        return (
+            isinstance(response, Response)
+            and response.status_code == HTTPStatus.OK
+            and response.data is not None
+            and isinstance(
+                getattr(response, 'accepted_renderer', None),
+                FastJSONRenderer,
+            )
+            and limit is not None
+            and limit >= settings.STREAMING_RESPONSE_MIN_LIMIT
+        )
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        if self.action != 'list' or not self.should_stream(response):
+            return response
+        renderer = response.accepted_renderer
+        streaming = StreamingHttpResponse(
+            renderer.render_stream(
+                response.data, settings.STREAMING_RESPONSE_CHUNK_SIZE
+            ),
+            status=response.status_code,
+            content_type=response.accepted_media_type,
+        )
+        for header, value in response.items():
+            if header.lower() != 'content-type':
+                streaming[header] = value
+        return streaming
@@ -1,9 +1,378 @@
 """Пагинация API."""
+from collections import OrderedDict
+from functools import reduce
+from hashlib import md5
+from operator import and_, or_
+
 from django.conf import settings
-from rest_framework.pagination import LimitOffsetPagination
+from django.core import signing
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, FieldDoesNotExist
+from django.db.models import F, Q
+from django.db.models.constants import LOOKUP_SEP
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 class BaseLimitOffsetPagination(LimitOffsetPagination):
-    """Базовый класс пагинации."""
+    """
+    Базовый класс пагинации.
+
+    Выбирает limit + 1 строк, поэтому ссылка `next` не зависит от `count`.
+    Способ подсчета `count` задается параметром запроса `count`:
+    - `exact` (по умолчанию) - точный COUNT(*);
+    - `cached` - COUNT(*), закешированный для данного фильтра
+      на `PAGINATION_COUNT_CACHE_TIMEOUT` секунд;
+    - `false` - подсчет не выполняется, `count` равен None.
+    Если view реализует `get_pagination_count(page)`, то счетчик берется
+    из денормализованных данных без запроса COUNT(*); метод получает
+    выбранную страницу или None, если страница еще не выбрана.
+    `limit` ограничен настройкой `MAX_PAGE_SIZE`.
+    """
 
     default_limit = settings.DEFAULT_PAGE_SIZE
+    max_limit = settings.MAX_PAGE_SIZE
+    count_query_param = 'count'
+    count_modes = ('exact', 'cached', 'false')
+    count_cache_timeout = settings.PAGINATION_COUNT_CACHE_TIMEOUT
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+
+        self.offset = self.get_offset(request)
+        self.request = request
+        page = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_next = len(page) > self.limit
+        page = page[:self.limit]
+
+        if self.offset == 0 and not self.has_next:
+            self.count = len(page)
+        else:
+            self.count = self.get_page_count(queryset, request, view, page)
+        if (self.count is not None and self.count > self.limit
+                and self.template is not None):
+            self.display_page_controls = True
+        return page
+
+    def supports_lazy_page(self, request) -> bool:
+        """Можно ли выбрать страницу запроса без чтения ее строк."""
+        return self.get_limit(request) is not None
+
+    def paginate_queryset_lazily(self, queryset, request, view=None):
+        """
+        Возвращает QuerySet страницы, не выполняя его.
+
+        Наличие следующей страницы проверяется запросом одного id
+        после страницы, а строки страницы читаются при итерации,
+        поэтому страница не хранится в памяти целиком.
+        """
+        self.limit = self.get_limit(request)
+        self.offset = self.get_offset(request)
+        self.request = request
+        end = self.offset + self.limit
+        self.has_next = queryset.values_list('pk', flat=True)[
+            end:end + 1
+        ].exists()
+        self.count = self.get_page_count(queryset, request, view)
+        return queryset[self.offset:end]
+
+    def get_count_mode(self, request):
+        mode = request.query_params.get(self.count_query_param, 'exact')
+        return mode if mode in self.count_modes else 'exact'
+
+    def get_page_count(self, queryset, request, view=None, page=None):
+        """Возвращает количество объектов согласно режиму подсчета."""
+        mode = self.get_count_mode(request)
+        if mode == 'false':
+            return None
+        get_pagination_count = getattr(view, 'get_pagination_count', None)
+        if get_pagination_count is not None:
+            count = get_pagination_count(page)
+            if count is not None:
+                return count
+        if mode == 'cached':
+            return self.get_cached_count(queryset)
+        return self.get_count(queryset)
+
+    def get_cached_count(self, queryset):
+        """Возвращает COUNT(*), закешированный по SQL-запросу фильтра."""
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except EmptyResultSet:
+            return 0
+        digest = md5(f'{sql}{params}'.encode()).hexdigest()
+        key = f'api:v1:pagination:count:{digest}'
+        count = cache.get(key)
+        if count is None:
+            count = self.get_count(queryset)
+            cache.set(key, count, self.count_cache_timeout)
+        return count
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        offset = self.offset + self.limit
+        return replace_query_param(url, self.offset_query_param, offset)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Пагинация по ключу сортировки (keyset).
+
+    Курсор хранит значения ключа сортировки последнего (или первого)
+    объекта страницы и подписывается с помощью `django.core.signing`
+    без метки времени, поэтому курсор (и ETag страницы) не меняется
+    со временем.
+    Ключ строится из сортировки модели по умолчанию и `id`,
+    поэтому следующая страница выбирается поиском по индексу без OFFSET.
+    NULL в полях ключа сортируются в конце прямого порядка
+    независимо от СУБД.
+    """
+
+    cursor_query_param = 'cursor'
+    limit_query_param = 'limit'
+    default_limit = settings.DEFAULT_PAGE_SIZE
+    max_limit = settings.MAX_PAGE_SIZE
+    cursor_salt = 'api.v1.pagination.keyset'
+    invalid_cursor_message = 'Неверный курсор.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.ordering = self.get_ordering(queryset)
+        self.fields = [
+            queryset.model._meta.get_field(name.lstrip('-'))
+            for name in self.ordering
+        ]
+        position, reverse = self.decode_cursor(request)
+
+        ordering = self.ordering
+        if reverse:
+            ordering = [self._invert(name) for name in ordering]
+        queryset = queryset.order_by(*self.get_order_by(ordering, reverse))
+        if position is not None:
+            queryset = queryset.filter(
+                self.get_seek_filter(ordering, position, reverse)
+            )
+
+        page = list(queryset[:self.limit + 1])
+        has_more = len(page) > self.limit
+        page = page[:self.limit]
+        if reverse:
+            page.reverse()
+
+        self.page = page
+        self.has_next = has_more if not reverse else True
+        self.has_previous = has_more if reverse else position is not None
+        return page
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {
+                    'type': 'string',
+                    'nullable': True,
+                    'format': 'uri',
+                },
+                'previous': {
+                    'type': 'string',
+                    'nullable': True,
+                    'format': 'uri',
+                },
+                'results': schema,
+            },
+        }
+
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params[self.limit_query_param])
+        except (KeyError, ValueError):
+            return self.default_limit
+        if limit <= 0:
+            return self.default_limit
+        return min(limit, self.max_limit)
+
+    def get_ordering(self, queryset):
+        """
+        Возвращает ключ сортировки: сортировка запроса и `id`.
+
+        Сортировка запроса (например, из параметра `ordering`)
+        используется, если она задана полями модели,
+        иначе используется сортировка модели по умолчанию.
+        """
+        model = queryset.model
+        ordering = list(queryset.query.order_by)
+        if not ordering or not all(
+                self._is_seekable(model, name) for name in ordering):
+            ordering = list(model._meta.ordering)
+        ordering = [
+            name for name in ordering
+            if name.lstrip('-') not in ('id', 'pk')
+        ]
+        return ordering + ['id']
+
+    @staticmethod
+    def _is_seekable(model, name):
+        if not isinstance(name, str) or LOOKUP_SEP in name:
+            return False
+        try:
+            field = model._meta.get_field(name.lstrip('-'))
+        except FieldDoesNotExist:
+            return False
+        return field.concrete
+
+    def get_order_by(self, ordering, reverse):
+        """Возвращает сортировку ключа: NULL в конце прямого порядка."""
+        order_by = []
+        for name, field in zip(ordering, self.fields):
+            if not field.null:
+                order_by.append(name)
+                continue
+            nulls = {'nulls_first': True} if reverse else {'nulls_last': True}
+            column = F(name.lstrip('-'))
+            order_by.append(
+                column.desc(**nulls) if name.startswith('-')
+                else column.asc(**nulls)
+            )
+        return order_by
+
+    def get_seek_filter(self, ordering, position, reverse=False):
+        """
+        Строит условие "строго после позиции" для составного ключа.
+
+        Для ключа (a, b) это `a > x OR (a = x AND b > y)`,
+        направление сравнения зависит от направления сортировки поля.
+        Для поля с NULL в конце порядка к `a > x` добавляется
+        `a IS NULL`, для NULL в начале после `a IS NULL` идут
+        все непустые значения.
+        """
+        conditions = []
+        for index, name in enumerate(ordering):
+            nulls_last = self.fields[index].null and not reverse
+            if position[index] is None and nulls_last:
+                continue
+            equal = [
+                self._equal(previous, position[number])
+                for number, previous in enumerate(ordering[:index])
+            ]
+            seek = self._after(name, position[index], nulls_last)
+            conditions.append(reduce(and_, equal + [seek]))
+        return reduce(or_, conditions)
+
+    @staticmethod
+    def _equal(name, value):
+        column = name.lstrip('-')
+        if value is None:
+            return Q(**{f'{column}__isnull': True})
+        return Q(**{column: value})
+
+    @staticmethod
+    def _after(name, value, nulls_last):
+        column = name.lstrip('-')
+        if value is None:
+            return Q(**{f'{column}__isnull': False})
+        lookup = 'lt' if name.startswith('-') else 'gt'
+        seek = Q(**{f'{column}__{lookup}': value})
+        if nulls_last:
+            seek |= Q(**{f'{column}__isnull': True})
+        return seek
+
+    def decode_cursor(self, request):
+        """Возвращает позицию и направление из курсора запроса."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = signing.Signer(salt=self.cursor_salt).unsign_object(
+                encoded
+            )
+            values, reverse = payload['p'], bool(payload['r'])
+            if len(values) != len(self.fields):
+                raise ValueError
+            position = [
+                field.to_python(value)
+                for field, value in zip(self.fields, values)
+            ]
+        except (signing.BadSignature, KeyError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def encode_cursor(self, instance, reverse):
+        """Возвращает подписанный курсор на позицию объекта."""
+        values = [
+            None if field.value_from_object(instance) is None
+            else field.value_to_string(instance)
+            for field in self.fields
+        ]
+        return signing.Signer(salt=self.cursor_salt).sign_object(
+            {'p': values, 'r': int(reverse)},
+            compress=True,
+        )
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self._build_link(self.encode_cursor(self.page[-1], False))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self._build_link(self.encode_cursor(self.page[0], True))
+
+    def _build_link(self, cursor):
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, 'offset')
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    @staticmethod
+    def _invert(name):
+        return name[1:] if name.startswith('-') else f'-{name}'
+
+
+class SwitchablePagination(BaseLimitOffsetPagination):
+    """
+    Пагинация limit/offset с переключением на keyset по запросу.
+
+    Если в запросе передан параметр `cursor` (в том числе пустой),
+    используется `KeysetPagination`, иначе - обычная пагинация
+    limit/offset.
+    """
+
+    keyset_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.keyset_class.cursor_query_param in request.query_params:
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def supports_lazy_page(self, request) -> bool:
+        """Страница по курсору выбирается целиком: курсор строится по ней."""
+        if self.keyset_class.cursor_query_param in request.query_params:
+            return False
+        return super().supports_lazy_page(request)
+
+    def paginate_queryset_lazily(self, queryset, request, view=None):
+        self.keyset = None
+        return super().paginate_queryset_lazily(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
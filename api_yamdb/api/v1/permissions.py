@@ -1,4 +1,6 @@
 """Модуль для классов разрешений API."""
+from django.conf import settings
+from django.utils.crypto import constant_time_compare
 from rest_framework.permissions import SAFE_METHODS, BasePermission
 
 
@@ -11,7 +13,7 @@ class IsAdminModerAuthorOrReadOnly(BasePermission):
     def has_object_permission(self, request, view, obj):
         return (
             request.method in SAFE_METHODS
-            or obj.author == request.user
+            or obj.author_id == request.user.id
             or (request.user.is_authenticated
                 and (request.user.is_moderator or request.user.is_admin))
         )
@@ -30,3 +32,20 @@ class IsAdminOnly(BasePermission):
 
     def has_permission(self, request, view):
         return request.user.is_authenticated and request.user.is_admin
+
+
+class IsAdminOrExportToken(IsAdminOnly):
+    """
+    Доступ для админа или по токену выгрузки каталога.
+
+    Токен передается в заголовке X-Export-Token и сравнивается
+    с настройкой CATALOG_EXPORT_TOKEN. Пустой токен в настройках
+    отключает доступ по токену.
+    """
+
+    def has_permission(self, request, view):
+        token = request.headers.get('X-Export-Token', '')
+        return super().has_permission(request, view) or bool(
+            settings.CATALOG_EXPORT_TOKEN and token
+            and constant_time_compare(token, settings.CATALOG_EXPORT_TOKEN)
+        )
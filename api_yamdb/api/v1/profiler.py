@@ -0,0 +1,140 @@
+"""
+Профилирование отдельных запросов API по требованию администратора.
+
+Профиль запроса включает статистику cProfile, SQL-запросы
+с временем выполнения и планами EXPLAIN. Профили хранятся на диске
+в кольцевом буфере из PROFILER_MAX_ENTRIES записей в PROFILER_DIR.
+"""
+import cProfile
+import io
+import json
+import pstats
+import re
+import time
+import uuid
+from pathlib import Path
+from typing import List, Optional
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+
+from .budgets import QueryRecorder
+
+PROFILE_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+
+def explain(sql: str, params) -> List[str]:
+    """Возвращает план выполнения SELECT-запроса."""
+    prefix = (
+        'EXPLAIN QUERY PLAN' if connection.vendor == 'sqlite' else 'EXPLAIN'
+    )
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f'{prefix} {sql}', params)
+            return [
+                ' '.join(str(value) for value in row)
+                for row in cursor.fetchall()
+            ]
+    except DatabaseError as error:
+        return [f'EXPLAIN недоступен: {error}']
+
+
+class ProfileStore:
+    """Кольцевой буфер профилей на диске."""
+
+    @property
+    def directory(self) -> Path:
+        return Path(settings.PROFILER_DIR)
+
+    def new_id(self) -> str:
+        """Возвращает id профиля, упорядоченный по времени создания."""
+        return f'{time.time_ns():016x}{uuid.uuid4().hex[:16]}'
+
+    def report_path(self, profile_id: str) -> Path:
+        return self.directory / f'{profile_id}.json'
+
+    def stats_path(self, profile_id: str) -> Path:
+        return self.directory / f'{profile_id}.prof'
+
+    def save(self, profile_id: str, report: dict,
+             profiler: cProfile.Profile) -> None:
+        """Сохраняет профиль и удаляет самые старые сверх лимита."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(self.stats_path(profile_id))
+        self.report_path(profile_id).write_text(
+            json.dumps(report, ensure_ascii=False, default=str),
+            encoding='utf-8',
+        )
+        for stale_id in self.list_ids()[settings.PROFILER_MAX_ENTRIES:]:
+            self.report_path(stale_id).unlink(missing_ok=True)
+            self.stats_path(stale_id).unlink(missing_ok=True)
+
+    def list_ids(self) -> List[str]:
+        """Возвращает id сохраненных профилей, новые первыми."""
+        if not self.directory.exists():
+            return []
+        return sorted(
+            (path.stem for path in self.directory.glob('*.json')
+             if PROFILE_ID_PATTERN.match(path.stem)),
+            reverse=True,
+        )
+
+    def get(self, profile_id: str) -> Optional[dict]:
+        """Возвращает отчет профиля или None, если его нет."""
+        if not PROFILE_ID_PATTERN.match(profile_id):
+            return None
+        path = self.report_path(profile_id)
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding='utf-8'))
+
+
+profile_store = ProfileStore()
+
+
+def profile_request(request, get_response, view_name):
+    """
+    Выполняет запрос под cProfile и сохраняет профиль.
+
+    `view_name` вызывается после обработки запроса и возвращает
+    имя view. Возвращает ответ с заголовком X-Profile-Id.
+    """
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    with QueryRecorder() as recorder:
+        profiler.enable()
+        try:
+            response = get_response(request)
+        finally:
+            profiler.disable()
+    duration_ms = (time.perf_counter() - started) * 1000
+
+    stream = io.StringIO()
+    pstats.Stats(profiler, stream=stream).sort_stats(
+        'cumulative'
+    ).print_stats(settings.PROFILER_STATS_LIMIT)
+    queries = [
+        {
+            **query,
+            'plan': (
+                explain(query['sql'], query['params'])
+                if query['sql'].lstrip().upper().startswith('SELECT')
+                else []
+            ),
+        }
+        for query in recorder.queries
+    ]
+    profile_id = profile_store.new_id()
+    profile_store.save(profile_id, {
+        'id': profile_id,
+        'method': request.method,
+        'path': request.get_full_path(),
+        'view': view_name(),
+        'status': response.status_code,
+        'duration_ms': round(duration_ms, 3),
+        'db_time_ms': round(recorder.db_time_ms, 3),
+        'queries': queries,
+        'stats': stream.getvalue(),
+    }, profiler)
+    response['X-Profile-Id'] = profile_id
+    return response
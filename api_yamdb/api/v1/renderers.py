@@ -0,0 +1,171 @@
+"""Рендереры API."""
+import csv
+import json
+from collections.abc import Iterator as IteratorType
+from itertools import islice
+from typing import Iterable, Iterator
+
+from django.conf import settings
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSON-рендерер с кодированием через orjson, если он установлен.
+
+    Без orjson или при запросе отступов используется стандартный
+    `json`. Вывод совпадает с `JSONRenderer` в компактном режиме.
+    Метод `render_stream()` кодирует ответ частями для
+    `StreamingHttpResponse`.
+    """
+
+    if orjson is not None:
+        orjson_options = (
+            orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        if (orjson is None or indent is not None
+                or not self.compact or self.ensure_ascii):
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        return self.dumps(data)
+
+    def dumps(self, data) -> bytes:
+        """Кодирует данные в компактный JSON."""
+        if orjson is not None:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=self.orjson_options,
+            )
+        else:
+            ret = json.dumps(
+                data,
+                cls=self.encoder_class,
+                ensure_ascii=self.ensure_ascii,
+                allow_nan=not self.strict,
+                separators=(',', ':'),
+            ).encode()
+        # Как и JSONRenderer, экранируем разделители строк U+2028 и U+2029,
+        # которые допустимы в JSON, но не в JavaScript.
+        return ret.replace(
+            b'\xe2\x80\xa8', b'\\u2028'
+        ).replace(b'\xe2\x80\xa9', b'\\u2029')
+
+    def render_stream(
+        self, data, chunk_size: int = settings.STREAMING_RESPONSE_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        """
+        Кодирует ответ по частям.
+
+        Словарь-обертка пагинации выводится по ключам, а список
+        (или итератор) `results` - частями по `chunk_size` объектов.
+        Склеенные части совпадают с результатом `render()`.
+        """
+        if not isinstance(data, dict):
+            yield self.dumps(data)
+            return
+        yield b'{'
+        for number, (key, value) in enumerate(data.items()):
+            prefix = b',' if number else b''
+            yield prefix + self.dumps(str(key)) + b':'
+            if key == 'results' and isinstance(value, (list, IteratorType)):
+                yield from self._render_list(value, chunk_size)
+            else:
+                yield self.dumps(value)
+        yield b'}'
+
+    def _render_list(self, items: Iterable,
+                     chunk_size: int) -> Iterator[bytes]:
+        yield b'['
+        iterator = iter(items)
+        separator = b''
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                break
+            yield separator + self.dumps(chunk)[1:-1]
+            separator = b','
+        yield b']'
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Рендерер NDJSON: один JSON-объект на строку."""
+
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = None
+    json_renderer = FastJSONRenderer()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        items = data if isinstance(data, list) else [data]
+        return b''.join(self.render_stream(items))
+
+    def render_stream(self, items: Iterable) -> Iterator[bytes]:
+        """Кодирует объекты по одному на строку."""
+        for item in items:
+            yield self.json_renderer.dumps(item) + b'\n'
+
+
+class _Echo:
+    """Псевдобуфер для csv.writer, возвращающий записанную строку."""
+
+    def write(self, value):
+        return value
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    Рендерер CSV.
+
+    Заголовок строится по ключам первого объекта. Вложенные объекты
+    выводятся значением `slug` (или JSON, если его нет), списки -
+    значениями элементов через запятую.
+    """
+
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+    json_renderer = FastJSONRenderer()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        items = data if isinstance(data, list) else [data]
+        return b''.join(self.render_stream(items))
+
+    def render_stream(self, items: Iterable) -> Iterator[bytes]:
+        """Кодирует объекты построчно, первой строкой выводит заголовок."""
+        writer = csv.writer(_Echo())
+        header = None
+        for item in items:
+            if header is None:
+                header = list(item)
+                yield writer.writerow(header).encode(self.charset)
+            yield writer.writerow(
+                [self.flatten(item.get(name)) for name in header]
+            ).encode(self.charset)
+
+    def flatten(self, value):
+        if value is None:
+            return ''
+        if isinstance(value, dict):
+            if 'slug' in value:
+                return value['slug']
+            return self.json_renderer.dumps(value).decode()
+        if isinstance(value, list):
+            return ','.join(str(self.flatten(item)) for item in value)
+        return value
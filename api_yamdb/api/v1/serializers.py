@@ -2,14 +2,43 @@
 from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
 from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.db import connection, transaction
 from django.shortcuts import get_object_or_404
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 
 from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.signals import titles_bulk_created
 from users.models import User
 
+from .fields import CachedSlugRelatedField, SlugCache
 from .validators import validator_forbidden_name
 
+genre_slug_cache = SlugCache(Genre)
+category_slug_cache = SlugCache(Category)
+
+
+class SparseFieldsSerializerMixin:
+    """
+    Оставляет в ответе только поля из `context['sparse_fields']`.
+
+    Выбор применяется к сериализатору верхнего уровня,
+    вложенные сериализаторы возвращают все свои поля.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selected = self.context.get('sparse_fields')
+        parent = getattr(self, 'parent', None)
+        if isinstance(parent, serializers.ListSerializer):
+            parent = getattr(parent, 'parent', None)
+        if selected is None or parent is not None:
+            return fields
+        return {
+            name: field for name, field in fields.items()
+            if name in selected
+        }
+
 
 class CategorySerializer(serializers.ModelSerializer):
     """Сериализатор для модели Category."""
@@ -27,14 +56,15 @@ class GenreSerializer(serializers.ModelSerializer):
         model = Genre
 
 
-class TitleReadSerializer(serializers.ModelSerializer):
+class TitleReadSerializer(SparseFieldsSerializerMixin,
+                          serializers.ModelSerializer):
     """
     Сериализатор для модели Title.
 
     Преобразует данные для чтения или удаления объектов модели.
     """
 
-    rating = serializers.IntegerField(read_only=True, default=None)
+    rating = serializers.IntegerField(read_only=True)
     genre = GenreSerializer(many=True, read_only=True)
     category = CategorySerializer(read_only=True)
 
@@ -51,6 +81,114 @@ class TitleReadSerializer(serializers.ModelSerializer):
         model = Title
 
 
+class TitleBulkListSerializer(serializers.ListSerializer):
+    """
+    Сериализатор для массового создания объектов модели Title.
+
+    Проверяет каждый объект отдельно и создает произведения
+    одним bulk_create, а связи с жанрами - одной вставкой
+    в промежуточную таблицу. В SQLite id новых строк восстанавливаются
+    в той же транзакции (`bulk_create`), в остальных БД, не возвращающих
+    id из bulk_create, произведения сохраняются по одному
+    с обычными сигналами post_save.
+    """
+
+    default_error_messages = {
+        'max_length': 'Можно передать не более {max_length} произведений.',
+    }
+    max_length = settings.TITLE_BULK_MAX_SIZE
+
+    def validate_each(self):
+        """
+        Проверяет переданные объекты по отдельности.
+
+        Возвращает список проверенных данных и список ошибок
+        с индексами объектов, не прошедших проверку.
+        """
+        data = self.initial_data
+        if not isinstance(data, list):
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    self.error_messages['not_a_list'].format(
+                        input_type=type(data).__name__
+                    )
+                ]
+            })
+        if not data:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    self.error_messages['empty']
+                ]
+            })
+        if len(data) > self.max_length:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    self.error_messages['max_length'].format(
+                        max_length=self.max_length
+                    )
+                ]
+            })
+        validated, errors = [], []
+        for index, item in enumerate(data):
+            try:
+                validated.append(self.child.run_validation(item))
+            except serializers.ValidationError as exc:
+                errors.append({'index': index, 'errors': exc.detail})
+        return validated, errors
+
+    @staticmethod
+    def supports_bulk_create():
+        """Может ли БД вернуть id объектов, созданных bulk_create."""
+        features = connection.features
+        return (features.can_return_rows_from_bulk_insert
+                or connection.vendor == 'sqlite')
+
+    @staticmethod
+    def bulk_create(titles):
+        """
+        Создает произведения через bulk_create и заполняет их id.
+
+        SQLite не возвращает id из INSERT, но внутри транзакции
+        запись в базу блокирована для других соединений, поэтому
+        новые строки получают подряд идущие rowid, последний из которых
+        возвращает `last_insert_rowid()` того же соединения.
+        """
+        Title.objects.bulk_create(titles)
+        if not titles or titles[0].pk is not None:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT last_insert_rowid()')
+            last_id = cursor.fetchone()[0]
+        first_id = last_id - len(titles) + 1
+        for offset, title in enumerate(titles):
+            title.pk = first_id + offset
+
+    def create(self, validated_data):
+        titles = [
+            Title(**{
+                field: value for field, value in item.items()
+                if field != 'genre'
+            })
+            for item in validated_data
+        ]
+        bulk = self.supports_bulk_create()
+        with transaction.atomic():
+            if bulk:
+                self.bulk_create(titles)
+            else:
+                for title in titles:
+                    title.save()
+            through = Title.genre.through
+            through.objects.bulk_create([
+                through(title_id=title.pk, genre_id=genre.pk)
+                for title, item in zip(titles, validated_data)
+                for genre in item['genre']
+            ])
+        if bulk:
+            titles_bulk_created.send(sender=self.__class__, titles=titles)
+        return titles
+
+
 class TitleWriteSerializer(serializers.ModelSerializer):
     """
     Сериализатор для модели Title.
@@ -58,14 +196,16 @@ class TitleWriteSerializer(serializers.ModelSerializer):
     Преобразует данные для создания или обновления объектов модели.
     """
 
-    genre = serializers.SlugRelatedField(
+    genre = CachedSlugRelatedField(
+        slug_cache=genre_slug_cache,
         queryset=Genre.objects.all(),
         slug_field='slug',
         many=True,
         allow_empty=False,
         allow_null=False,
     )
-    category = serializers.SlugRelatedField(
+    category = CachedSlugRelatedField(
+        slug_cache=category_slug_cache,
         queryset=Category.objects.all(),
         slug_field='slug',
         allow_empty=False,
@@ -81,12 +221,14 @@ class TitleWriteSerializer(serializers.ModelSerializer):
             'category',
         )
         model = Title
+        list_serializer_class = TitleBulkListSerializer
 
     def to_representation(self, instance):
         return TitleReadSerializer(instance).data
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsSerializerMixin,
+                        serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         read_only=True,
         slug_field='username',
@@ -98,7 +240,8 @@ class CommentSerializer(serializers.ModelSerializer):
         model = Comment
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsSerializerMixin,
+                       serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         read_only=True,
         slug_field='username',
@@ -0,0 +1,131 @@
+"""
+Обработчики сигналов API.
+
+Версии кешей увеличиваются, а индекс подсказок обновляется после
+фиксации транзакции (`transaction.on_commit`): иначе параллельный
+запрос мог бы прочитать еще старые строки и закешировать их
+под новой версией.
+"""
+from django.core.signals import request_finished, request_started
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import Category, Genre, Review, Title
+from reviews.signals import catalog_bulk_loaded, titles_bulk_created
+
+from .cache import (CATALOG_VERSION_KEY, begin_version_scope, bump_version,
+                    end_version_scope)
+from .leaderboard import LEADERBOARD_VERSION_KEY, update_title
+from .serializers import category_slug_cache, genre_slug_cache
+from .suggest import suggest_index
+
+SLUG_CACHES = {Genre: genre_slug_cache, Category: category_slug_cache}
+
+
+@receiver(request_started)
+def start_request_versions(sender, **kwargs):
+    """Версии кешей читаются из БД не более одного раза за запрос."""
+    begin_version_scope()
+
+
+@receiver(request_finished)
+def finish_request_versions(sender, **kwargs):
+    """Следующий запрос снова прочитает версии из БД."""
+    end_version_scope()
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Category)
+def update_suggest_index(sender, instance, raw, **kwargs):
+    """Обновляет индекс подсказок при сохранении объекта."""
+    if not raw:
+        transaction.on_commit(lambda: suggest_index.update(instance))
+
+
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Category)
+def remove_from_suggest_index(sender, instance, **kwargs):
+    """Удаляет объект из индекса подсказок."""
+    pk = instance.pk
+    transaction.on_commit(lambda: suggest_index.remove(sender, pk))
+
+
+def bump_on_commit(*keys: str) -> None:
+    """Увеличивает версии одним запросом после фиксации транзакции."""
+    transaction.on_commit(lambda: bump_version(*keys))
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Category)
+def invalidate_versions_on_change(sender, signal, **kwargs):
+    """
+    Делает недействительными кеши, зависящие от измененного объекта.
+
+    Кеш ответов каталога зависит от всех объектов, рейтинги лучших -
+    от произведений и удаления жанров и категорий, кеши slug -
+    от жанров и категорий соответственно. Версии при изменении
+    отзыва увеличивает `update_leaderboard_on_review_change`.
+    """
+    keys = [CATALOG_VERSION_KEY]
+    if sender is Title or signal is post_delete:
+        keys.append(LEADERBOARD_VERSION_KEY)
+    if sender in SLUG_CACHES:
+        keys.append(SLUG_CACHES[sender].version_key)
+    bump_on_commit(*keys)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_versions_on_genre_change(sender, action, **kwargs):
+    """Делает недействительными кеши при изменении жанров произведения."""
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_on_commit(CATALOG_VERSION_KEY, LEADERBOARD_VERSION_KEY)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def update_leaderboard_on_review_change(sender, instance, **kwargs):
+    """
+    Обновляет позицию произведения в рейтингах лучших.
+
+    Выполняется после фиксации транзакции, когда рейтинг
+    произведения уже пересчитан. Версия каталога увеличивается
+    тем же запросом, что и версия оценок рейтинга.
+    """
+    title_id = instance.title_id
+    transaction.on_commit(
+        lambda: update_title(title_id, CATALOG_VERSION_KEY)
+    )
+
+
+@receiver(catalog_bulk_loaded)
+def invalidate_catalog_on_bulk_load(sender, **kwargs):
+    """Сбрасывает кеши после массовой загрузки данных."""
+    bump_on_commit(
+        CATALOG_VERSION_KEY, LEADERBOARD_VERSION_KEY,
+        *(slug_cache.version_key for slug_cache in SLUG_CACHES.values()),
+    )
+    transaction.on_commit(suggest_index.expire)
+
+
+@receiver(titles_bulk_created)
+def update_caches_on_titles_bulk_create(sender, titles, **kwargs):
+    """
+    Обновляет кеши после создания произведений через bulk_create.
+
+    Жанры и категории не меняются, поэтому кеши slug не сбрасываются,
+    а новые произведения добавляются в индекс подсказок по одному.
+    """
+    bump_on_commit(CATALOG_VERSION_KEY, LEADERBOARD_VERSION_KEY)
+
+    def update_suggest_index():
+        for title in titles:
+            suggest_index.update(title)
+
+    transaction.on_commit(update_suggest_index)
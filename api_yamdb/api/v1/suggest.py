@@ -0,0 +1,312 @@
+"""Подсказки по префиксу названий на основе сжатого префиксного дерева."""
+import logging
+import threading
+import time
+import unicodedata
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connections
+
+from reviews.models import Category, Genre, Title
+
+logger = logging.getLogger('suggest')
+
+
+def normalize_key(value: str) -> str:
+    """Приводит строку к ключу дерева: NFKC и Unicode casefolding."""
+    return unicodedata.normalize('NFKC', value).casefold().strip()
+
+
+class _Node:
+    """Узел сжатого префиксного дерева."""
+
+    __slots__ = ('label', 'children', 'items')
+
+    def __init__(self, label: str = '') -> None:
+        self.label = label
+        self.children: Dict[str, '_Node'] = {}
+        self.items: Dict[int, dict] = {}
+
+
+class RadixTrie:
+    """
+    Сжатое префиксное дерево (radix tree).
+
+    Ребра хранят подстроки, а не отдельные символы,
+    поэтому глубина дерева не зависит от длины названий.
+    В одном узле может храниться несколько объектов с одинаковым ключом.
+    """
+
+    def __init__(self) -> None:
+        self.root = _Node()
+
+    def insert(self, key: str, pk: int, payload: dict) -> None:
+        """Добавляет объект с ключом `key`."""
+        node, rest = self.root, key
+        while rest:
+            child = node.children.get(rest[0])
+            if child is None:
+                child = _Node(rest)
+                node.children[rest[0]] = child
+                node, rest = child, ''
+                continue
+            common = self._common_prefix_length(child.label, rest)
+            if common < len(child.label):
+                split = _Node(child.label[:common])
+                child.label = child.label[common:]
+                split.children[child.label[0]] = child
+                node.children[rest[0]] = split
+                child = split
+            node, rest = child, rest[common:]
+        node.items[pk] = payload
+
+    def remove(self, key: str, pk: int) -> None:
+        """Удаляет объект с ключом `key`, сжимая опустевшие ветви."""
+        path = [self.root]
+        node, rest = self.root, key
+        while rest:
+            child = node.children.get(rest[0])
+            if child is None or not rest.startswith(child.label):
+                return
+            node, rest = child, rest[len(child.label):]
+            path.append(node)
+        node.items.pop(pk, None)
+
+        for parent, child in zip(reversed(path[:-1]), reversed(path[1:])):
+            if child.items or len(child.children) > 1:
+                break
+            if not child.children:
+                del parent.children[child.label[0]]
+                continue
+            (grandchild,) = child.children.values()
+            grandchild.label = child.label + grandchild.label
+            parent.children[child.label[0]] = grandchild
+            break
+
+    def search(self, prefix: str, limit: int) -> List[dict]:
+        """Возвращает до `limit` объектов с ключом, начинающимся с `prefix`."""
+        node = self._find(prefix)
+        if node is None or limit <= 0:
+            return []
+        result = []
+        for payload in self._walk(node):
+            result.append(payload)
+            if len(result) >= limit:
+                break
+        return result
+
+    def _find(self, prefix: str) -> Optional[_Node]:
+        node, rest = self.root, prefix
+        while rest:
+            child = node.children.get(rest[0])
+            if child is None:
+                return None
+            if child.label.startswith(rest):
+                return child
+            if not rest.startswith(child.label):
+                return None
+            node, rest = child, rest[len(child.label):]
+        return node
+
+    def _walk(self, node: _Node) -> Iterator[dict]:
+        """Обходит поддерево в лексикографическом порядке ключей."""
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            yield from current.items.values()
+            stack.extend(
+                current.children[char]
+                for char in sorted(current.children, reverse=True)
+            )
+
+    @staticmethod
+    def _common_prefix_length(first: str, second: str) -> int:
+        length = 0
+        for left, right in zip(first, second):
+            if left != right:
+                break
+            length += 1
+        return length
+
+
+class SuggestIndex:
+    """
+    Индекс подсказок процесса для произведений, жанров и категорий.
+
+    Строится при первом запросе и обновляется инкрементально
+    сигналами post_save/post_delete. Раз в `SUGGEST_INDEX_TTL` секунд
+    индекс перестраивается в фоновом потоке, чтобы учесть изменения,
+    сделанные другими процессами (например, командой db_fill).
+    Новые деревья строятся без блокировки индекса, поэтому запросы
+    во время перестроения обслуживаются прежними деревьями.
+    """
+
+    sources = {
+        'titles': (Title, ('id', 'name')),
+        'genres': (Genre, ('name', 'slug')),
+        'categories': (Category, ('name', 'slug')),
+    }
+
+    def __init__(self, ttl: int = settings.SUGGEST_INDEX_TTL) -> None:
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.build_lock = threading.Lock()
+        self.expires_at: Optional[float] = None
+        self.tries: Dict[str, RadixTrie] = {}
+        self.keys: Dict[str, Dict[int, str]] = {}
+        # Изменения, полученные во время перестроения индекса.
+        self.pending: Optional[List[Tuple]] = None
+        self.rebuild_thread: Optional[threading.Thread] = None
+
+    def kind_for_model(self, model) -> Optional[str]:
+        for kind, (source_model, _) in self.sources.items():
+            if model is source_model:
+                return kind
+        return None
+
+    def load(self) -> Tuple[Dict[str, RadixTrie], Dict[str, Dict[int, str]]]:
+        """Строит новые деревья по базе данных."""
+        tries = {kind: RadixTrie() for kind in self.sources}
+        keys = {kind: {} for kind in self.sources}
+        for kind, (model, fields) in self.sources.items():
+            rows = model.objects.order_by().values('pk', *fields)
+            for row in rows.iterator():
+                pk = row.pop('pk')
+                key = normalize_key(row['name'])
+                tries[kind].insert(key, pk, row)
+                keys[kind][pk] = key
+        return tries, keys
+
+    def build(self) -> None:
+        """
+        Полностью перестраивает индекс по базе данных.
+
+        Изменения, пришедшие во время чтения базы данных, применяются
+        к новым деревьям перед заменой ими прежних.
+        """
+        with self.build_lock:
+            self._build()
+
+    def _build(self) -> None:
+        with self.lock:
+            self.pending = []
+        try:
+            tries, keys = self.load()
+        except BaseException:
+            with self.lock:
+                self.pending = None
+            raise
+        with self.lock:
+            for change in self.pending:
+                self._apply(tries, keys, *change)
+            self.tries, self.keys = tries, keys
+            self.pending = None
+            self.expires_at = time.monotonic() + self.ttl
+
+    def schedule_rebuild(self) -> Optional[threading.Thread]:
+        """
+        Запускает перестроение индекса в фоновом потоке.
+
+        Возвращает поток или None, если индекс уже перестраивается.
+        """
+        if not self.build_lock.acquire(blocking=False):
+            return None
+        thread = threading.Thread(
+            target=self._rebuild_in_background,
+            name='suggest-index-rebuild',
+            daemon=True,
+        )
+        self.rebuild_thread = thread
+        try:
+            thread.start()
+        except BaseException:
+            self.build_lock.release()
+            raise
+        return thread
+
+    def _rebuild_in_background(self) -> None:
+        try:
+            self._build()
+        except Exception:
+            logger.exception('Не удалось перестроить индекс подсказок')
+        finally:
+            self.build_lock.release()
+            connections.close_all()
+
+    def ensure_built(self) -> None:
+        """
+        Строит индекс, если его еще нет, или запускает перестроение.
+
+        Запрос ждет построения, только если индекса еще нет совсем:
+        устаревший индекс обслуживает запросы до замены новым.
+        """
+        expires_at = self.expires_at
+        if expires_at is None:
+            with self.build_lock:
+                if self.expires_at is None:
+                    self._build()
+        elif time.monotonic() > expires_at:
+            self.schedule_rebuild()
+
+    def update(self, instance) -> None:
+        """Добавляет или обновляет объект в индексе."""
+        kind = self.kind_for_model(type(instance))
+        if kind is None:
+            return
+        _, fields = self.sources[kind]
+        payload = {field: getattr(instance, field) for field in fields}
+        self._change(kind, instance.pk, normalize_key(instance.name), payload)
+
+    def remove(self, model, pk: int) -> None:
+        """Удаляет объект модели `model` из индекса."""
+        kind = self.kind_for_model(model)
+        if kind is not None:
+            self._change(kind, pk)
+
+    def expire(self) -> None:
+        """Помечает индекс устаревшим: следующий запрос перестроит его."""
+        with self.lock:
+            if self.expires_at is not None:
+                self.expires_at = 0.0
+
+    def reset(self) -> None:
+        """Сбрасывает индекс, он будет построен при следующем запросе."""
+        with self.lock:
+            self.expires_at = None
+            self.tries, self.keys = {}, {}
+
+    def suggest(self, query: str, limit: int) -> Dict[str, List[dict]]:
+        """Возвращает до `limit` подсказок каждого типа для префикса."""
+        prefix = normalize_key(query)
+        if not prefix:
+            return {kind: [] for kind in self.sources}
+        self.ensure_built()
+        with self.lock:
+            return {
+                kind: self.tries[kind].search(prefix, limit)
+                if kind in self.tries else []
+                for kind in self.sources
+            }
+
+    def _change(self, kind: str, pk: int, key: Optional[str] = None,
+                payload: Optional[dict] = None) -> None:
+        """Применяет изменение к индексу и запоминает его при перестроении."""
+        with self.lock:
+            if self.pending is not None:
+                self.pending.append((kind, pk, key, payload))
+            if self.expires_at is not None:
+                self._apply(self.tries, self.keys, kind, pk, key, payload)
+
+    @staticmethod
+    def _apply(tries, keys, kind, pk, key=None, payload=None) -> None:
+        """Удаляет объект из деревьев и добавляет его заново с `key`."""
+        old_key = keys[kind].pop(pk, None)
+        if old_key is not None:
+            tries[kind].remove(old_key, pk)
+        if key is not None:
+            tries[kind].insert(key, pk, payload)
+            keys[kind][pk] = key
+
+
+suggest_index = SuggestIndex()
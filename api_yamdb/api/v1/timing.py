@@ -0,0 +1,144 @@
+"""Заголовок Server-Timing с разбивкой времени обработки запроса."""
+import time
+from typing import Dict, List, Tuple
+
+from .budgets import QueryRecorder
+
+
+class ServerTiming:
+    """
+    Замеры этапов обработки запроса.
+
+    Этапы: `auth` - аутентификация (JWT и загрузка пользователя),
+    `perm` - проверка разрешений, `db` - SQL-запросы остальных этапов,
+    `serialize` - код обработчика без SQL (выборка и сериализация),
+    `render` - рендеринг ответа, `total` - весь запрос.
+    Этапы не пересекаются: SQL аутентификации и проверки разрешений
+    входит в `auth` и `perm`, а не в `db`.
+    """
+
+    descriptions = {
+        'auth': 'Authentication',
+        'perm': 'Permission checks',
+        'db': 'SQL queries',
+        'serialize': 'View and serialization',
+        'render': 'Rendering',
+        'total': 'Total',
+    }
+
+    def __init__(self, recorder: QueryRecorder) -> None:
+        self.recorder = recorder
+        self.started = time.perf_counter()
+        self.durations: Dict[str, float] = dict.fromkeys(
+            self.descriptions, 0.0
+        )
+        self.marks: Dict[str, Tuple[float, float]] = {}
+        self.stage_db_ms = 0.0
+        self.handler_stage_ms = 0.0
+
+    def add(self, name: str, started: float, db_started: float) -> None:
+        """
+        Добавляет к этапу время, прошедшее с `started`.
+
+        Время SQL с момента `db_started` исключается из этапа `db`,
+        а время этапа внутри обработчика (проверка разрешений
+        на объект) - из этапа `serialize`.
+        """
+        elapsed = (time.perf_counter() - started) * 1000
+        db_elapsed = self.recorder.db_time_ms - db_started
+        self.durations[name] += elapsed
+        self.stage_db_ms += db_elapsed
+        if 'handler' in self.marks and 'finalize' not in self.marks:
+            self.handler_stage_ms += elapsed - db_elapsed
+
+    def mark(self, name: str) -> None:
+        """Запоминает момент времени и суммарное время SQL."""
+        self.marks[name] = (time.perf_counter(), self.recorder.db_time_ms)
+
+    def finish(self) -> None:
+        """Вычисляет время SQL и обработчика после завершения dispatch."""
+        self.durations['db'] = max(
+            self.recorder.db_time_ms - self.stage_db_ms, 0.0
+        )
+        if 'handler' in self.marks and 'finalize' in self.marks:
+            handler_at, handler_db = self.marks['handler']
+            finalize_at, finalize_db = self.marks['finalize']
+            self.durations['serialize'] = max(
+                (finalize_at - handler_at) * 1000
+                - (finalize_db - handler_db)
+                - self.handler_stage_ms,
+                0.0,
+            )
+        self.mark('dispatched')
+
+    def header(self) -> str:
+        """Возвращает значение заголовка Server-Timing."""
+        self.durations['total'] = (time.perf_counter() - self.started) * 1000
+        entries: List[str] = [
+            f'{name};dur={self.durations[name]:.2f};'
+            f'desc="{description}"'
+            for name, description in self.descriptions.items()
+        ]
+        return ', '.join(entries)
+
+
+class ServerTimingMixin:
+    """
+    Добавляет заголовок Server-Timing к ответам view.
+
+    Время этапов измеряется в точках `dispatch` APIView: аутентификация,
+    проверка разрешений, обработчик и рендеринг ответа.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        with QueryRecorder() as recorder:
+            self.server_timing = ServerTiming(recorder)
+            response = super().dispatch(request, *args, **kwargs)
+            self.server_timing.finish()
+        timing = self.server_timing
+        if (hasattr(response, 'add_post_render_callback')
+                and not response.is_rendered):
+            dispatched_at, _ = timing.marks['dispatched']
+
+            def set_header(rendered):
+                timing.durations['render'] = (
+                    time.perf_counter() - dispatched_at
+                ) * 1000
+                rendered['Server-Timing'] = timing.header()
+
+            response.add_post_render_callback(set_header)
+        else:
+            response['Server-Timing'] = timing.header()
+        return response
+
+    def perform_authentication(self, request):
+        started = time.perf_counter()
+        db_started = self.server_timing.recorder.db_time_ms
+        try:
+            super().perform_authentication(request)
+        finally:
+            self.server_timing.add('auth', started, db_started)
+
+    def check_permissions(self, request):
+        started = time.perf_counter()
+        db_started = self.server_timing.recorder.db_time_ms
+        try:
+            super().check_permissions(request)
+        finally:
+            self.server_timing.add('perm', started, db_started)
+
+    def check_object_permissions(self, request, obj):
+        started = time.perf_counter()
+        db_started = self.server_timing.recorder.db_time_ms
+        try:
+            super().check_object_permissions(request, obj)
+        finally:
+            self.server_timing.add('perm', started, db_started)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.server_timing.mark('handler')
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        self.server_timing.mark('finalize')
+        return super().finalize_response(request, response, *args, **kwargs)
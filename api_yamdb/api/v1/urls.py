@@ -5,6 +5,7 @@ from rest_framework.routers import DefaultRouter
 from . import views
 
 router_v1 = DefaultRouter()
+router_v1.APIRootView = views.APIRootView
 
 router_v1.register('users', views.UsersViewSet, basename='users')
 router_v1.register('categories', views.CategoryViewSet, basename='categories')
@@ -28,5 +29,15 @@ auth_urls = [
 
 urlpatterns = [
     path('auth/', include(auth_urls)),
+    path('suggest/', views.SuggestView.as_view(), name='suggest'),
+    path(
+        'cache/stats/', views.CacheStatsView.as_view(), name='cache_stats'
+    ),
+    path('profiles/', views.ProfileListView.as_view(), name='profiles'),
+    path(
+        'profiles/<str:profile_id>/',
+        views.ProfileDetailView.as_view(),
+        name='profile_detail'
+    ),
     path('', include(router_v1.urls)),
 ]
@@ -3,10 +3,12 @@ from http import HTTPStatus
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models import Avg
+from django.http import (FileResponse, Http404, HttpResponse,
+                         HttpResponseForbidden, StreamingHttpResponse)
 from django.shortcuts import get_object_or_404
+from django.utils.crypto import constant_time_compare
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, status, viewsets
+from rest_framework import filters, routers, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import (IsAuthenticated,
                                         IsAuthenticatedOrReadOnly)
@@ -14,25 +16,40 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from reviews.models import Category, Genre, Review, Title
+from reviews.models import Category, Comment, Genre, Review, Title
 
+from .cache import get_cache_stats, get_catalog_version
 from .email_service import send_code_to_email
-from .filters import TitleFilter
-from .pagination import BaseLimitOffsetPagination
+from .fast_read import (comment_read_plan, review_read_plan,
+                        title_read_plan)
+from .filters import StableOrderingFilter, TitleFilter, TitleTopFacetForm
+from .leaderboard import get_top_ids
+from .metrics import render_metrics
+from .mixins import (BatchLookupMixin, CachedListMixin, CachedRetrieveMixin,
+                     ConditionalGetMixin, FastReadMixin, NestedParentMixin,
+                     SparseFieldsetMixin, StreamingPageMixin)
+from .pagination import BaseLimitOffsetPagination, SwitchablePagination
 from .permissions import (IsAdminModerAuthorOrReadOnly, IsAdminOnly,
-                          IsAdminOrReadOnly)
+                          IsAdminOrExportToken, IsAdminOrReadOnly)
+from .profiler import profile_store
+from .renderers import CSVRenderer, NDJSONRenderer
 from .serializers import (CategorySerializer, CommentSerializer,
                           GenreSerializer, MeSerializer, ObtainTokenSerializer,
                           ReviewSerializer, SignUpSerializer,
                           TitleReadSerializer, TitleWriteSerializer,
                           UserSerializer)
+from .suggest import suggest_index
+from .timing import ServerTimingMixin
 from .viewsets import CreateListDestroyViewSet
 
 
 User = get_user_model()
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(ServerTimingMixin, StreamingPageMixin,
+                   SparseFieldsetMixin, ConditionalGetMixin,
+                   CachedRetrieveMixin, BatchLookupMixin, FastReadMixin,
+                   viewsets.ModelViewSet):
     """
     ViewSet для модели Title.
 
@@ -40,13 +57,15 @@ class TitleViewSet(viewsets.ModelViewSet):
     Права доступа на добавление/изменение только для админов.
     """
 
-    queryset = Title.objects.prefetch_related(
-        'genre').select_related('category').annotate(
-        rating=Avg('reviews__score'))
+    queryset = Title.objects.all()
+    select_related_fields = ('category',)
+    prefetch_related_fields = ('genre',)
+    fast_read_plan = title_read_plan
     permission_classes = (IsAdminOrReadOnly,)
-    filter_backends = (DjangoFilterBackend,)
+    filter_backends = (DjangoFilterBackend, StableOrderingFilter)
     filterset_class = TitleFilter
-    pagination_class = BaseLimitOffsetPagination
+    ordering_fields = ('rating', 'year', 'name')
+    pagination_class = SwitchablePagination
     http_method_names = ('get', 'post', 'patch', 'delete')
 
     def get_serializer_class(self):
@@ -54,8 +73,95 @@ class TitleViewSet(viewsets.ModelViewSet):
             return TitleWriteSerializer
         return TitleReadSerializer
 
+    def get_queryset(self):
+        return self.apply_sparse_fieldset(super().get_queryset())
+
+    def get_etag_version(self):
+        """Версия каталога."""
+        return get_catalog_version()
+
+    @action(detail=False, methods=('post',))
+    def bulk(self, request):
+        """
+        Массовое создание произведений.
+
+        Ошибки возвращаются для каждого объекта по индексу, корректные
+        объекты создаются. С параметром `atomic=true` при любой ошибке
+        не создается ни одного объекта.
+        """
+        serializer = TitleWriteSerializer(
+            data=request.data,
+            many=True,
+            context=self.get_serializer_context(),
+        )
+        validated_data, errors = serializer.validate_each()
+        atomic = request.query_params.get('atomic', '').lower() == 'true'
+        if errors and (atomic or not validated_data):
+            return Response(
+                {'created': [], 'errors': errors},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        titles = serializer.create(validated_data)
+        created = self.get_queryset().in_bulk([title.pk for title in titles])
+        return Response(
+            {
+                'created': TitleReadSerializer(
+                    [created[title.pk] for title in titles], many=True
+                ).data,
+                'errors': errors,
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+    @action(detail=False)
+    def top(self, request):
+        """
+        Лучшие произведения по рейтингу.
+
+        Фильтры `genre`, `category` (slug) и `year` задают фасет,
+        список для каждого фасета хранится в кеше (см. `api.v1.leaderboard`).
+        """
+        facets = TitleTopFacetForm(request.query_params)
+        if not facets.is_valid():
+            return Response(facets.errors, status=status.HTTP_400_BAD_REQUEST)
+        ids = get_top_ids(**facets.cleaned_data)
+        titles = self.get_queryset().in_bulk(ids)
+        return Response(
+            TitleReadSerializer(
+                [titles[pk] for pk in ids if pk in titles], many=True
+            ).data
+        )
+
+    @action(
+        detail=False,
+        permission_classes=(IsAdminOrExportToken,),
+        renderer_classes=(NDJSONRenderer, CSVRenderer),
+    )
+    def export(self, request):
+        """
+        Потоковая выгрузка всего каталога в формате NDJSON или CSV.
+
+        Формат выбирается параметром `format` или заголовком Accept.
+        Поддерживаются те же фильтры, что и у списка произведений.
+        """
+        renderer = request.accepted_renderer
+        queryset = self.filter_queryset(self.get_queryset())
+        items = title_read_plan.iterate(
+            queryset, settings.CATALOG_EXPORT_CHUNK_SIZE
+        )
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f'{content_type}; charset={renderer.charset}'
+        response = StreamingHttpResponse(
+            renderer.render_stream(items), content_type=content_type
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="titles.{renderer.format}"'
+        )
+        return response
+
 
-class CategoryViewSet(CreateListDestroyViewSet):
+class CategoryViewSet(CachedListMixin, CreateListDestroyViewSet):
     """
     ViewSet для модели Category.
 
@@ -71,7 +177,7 @@ class CategoryViewSet(CreateListDestroyViewSet):
     pagination_class = BaseLimitOffsetPagination
 
 
-class GenreViewSet(CreateListDestroyViewSet):
+class GenreViewSet(CachedListMixin, CreateListDestroyViewSet):
     """
     ViewSet для модели Genre.
 
@@ -87,53 +193,166 @@ class GenreViewSet(CreateListDestroyViewSet):
     pagination_class = BaseLimitOffsetPagination
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(ServerTimingMixin, SparseFieldsetMixin,
+                     NestedParentMixin, ConditionalGetMixin, FastReadMixin,
+                     viewsets.ModelViewSet):
     """ViewSet для модели Comment."""
 
     serializer_class = CommentSerializer
+    fast_read_plan = comment_read_plan
+    select_related_fields = ('author',)
     permission_classes = (
         IsAuthenticatedOrReadOnly, IsAdminModerAuthorOrReadOnly)
-    pagination_class = BaseLimitOffsetPagination
+    pagination_class = SwitchablePagination
     http_method_names = ('get', 'post', 'patch', 'delete')
-
-    def review_obj(self):
-        """Получает объект отзыва из url."""
-        return get_object_or_404(Review, pk=self.kwargs['review_id'])
+    parent_field = 'review'
+    parent_lookups = {'review_id': 'review_id', 'title_id': 'review__title_id'}
+    parent_fields = {'count': 'comments_count', 'version': 'comments_version'}
 
     def perform_create(self, serializer):
         serializer.save(
             author=self.request.user,
-            review=self.review_obj(),
+            review=self.get_parent(),
         )
 
     def get_queryset(self):
-        return self.review_obj().comments.all()
+        return self.apply_sparse_fieldset(
+            self.filter_by_parent(Comment.objects.all())
+        )
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(ServerTimingMixin, SparseFieldsetMixin,
+                    NestedParentMixin, ConditionalGetMixin, BatchLookupMixin,
+                    FastReadMixin, viewsets.ModelViewSet):
     """ViewSet для модели Review."""
 
     serializer_class = ReviewSerializer
-    pagination_class = BaseLimitOffsetPagination
+    fast_read_plan = review_read_plan
+    select_related_fields = ('author',)
+    pagination_class = SwitchablePagination
     permission_classes = (
         IsAuthenticatedOrReadOnly, IsAdminModerAuthorOrReadOnly)
     http_method_names = ('get', 'post', 'patch', 'delete')
-
-    def title_obj(self):
-        """Получает объект произведения из url."""
-        return get_object_or_404(Title, pk=self.kwargs['title_id'])
+    parent_field = 'title'
+    parent_lookups = {'title_id': 'title_id'}
+    parent_fields = {'count': 'reviews_count', 'version': 'reviews_version'}
 
     def perform_create(self, serializer):
         serializer.save(
             author=self.request.user,
-            title=self.title_obj(),
+            title=self.get_parent(),
         )
 
     def get_queryset(self):
-        return self.title_obj().reviews.all()
+        return self.apply_sparse_fieldset(
+            self.filter_by_parent(Review.objects.all())
+        )
+
+
+class APIRootView(ServerTimingMixin, routers.APIRootView):
+    """Корень API со ссылками на ресурсы."""
+
+
+class SuggestView(ServerTimingMixin, APIView):
+    """
+    Подсказки по префиксу названий произведений, жанров и категорий.
+
+    Ответ строится по индексу в памяти процесса, без запросов к БД.
+    """
+
+    def get(self, request):
+        query = request.query_params.get('q', '')
+        try:
+            limit = int(request.query_params.get(
+                'limit', settings.SUGGEST_DEFAULT_LIMIT
+            ))
+        except ValueError:
+            limit = settings.SUGGEST_DEFAULT_LIMIT
+        limit = max(0, min(limit, settings.SUGGEST_MAX_LIMIT))
+        return Response(
+            suggest_index.suggest(query, limit), status=HTTPStatus.OK
+        )
+
+
+class CacheStatsView(ServerTimingMixin, APIView):
+    """Счетчики попаданий и промахов кеша ответов. Доступно только админу."""
+
+    permission_classes = (IsAdminOnly,)
+    cached_viewsets = (TitleViewSet, CategoryViewSet, GenreViewSet)
+
+    def get(self, request):
+        endpoints = [
+            f'{viewset.__name__}.{action}'
+            for viewset in self.cached_viewsets
+            for action in viewset.cached_actions
+        ]
+        return Response(get_cache_stats(endpoints), status=HTTPStatus.OK)
+
+
+class ProfileListView(ServerTimingMixin, APIView):
+    """Список сохраненных профилей запросов. Доступно только админу."""
+
+    permission_classes = (IsAdminOnly,)
+
+    def get(self, request):
+        profiles = []
+        for profile_id in profile_store.list_ids():
+            report = profile_store.get(profile_id)
+            if report is not None:
+                profiles.append({
+                    field: report[field] for field in (
+                        'id', 'method', 'path', 'view', 'status',
+                        'duration_ms', 'db_time_ms',
+                    )
+                })
+        return Response(profiles, status=HTTPStatus.OK)
+
+
+class ProfileDetailView(ServerTimingMixin, APIView):
+    """
+    Профиль запроса: статистика cProfile, SQL-запросы и их планы.
+
+    С параметром `download` возвращает файл статистики cProfile
+    для `pstats` или snakeviz. Доступно только админу.
+    """
+
+    permission_classes = (IsAdminOnly,)
+
+    def get(self, request, profile_id):
+        report = profile_store.get(profile_id)
+        if report is None:
+            raise Http404
+        if 'download' in request.query_params:
+            try:
+                stats = profile_store.stats_path(profile_id).open('rb')
+            except FileNotFoundError:
+                raise Http404
+            return FileResponse(
+                stats, as_attachment=True, filename=f'{profile_id}.prof'
+            )
+        return Response(report, status=HTTPStatus.OK)
+
+
+def metrics_view(request):
+    """
+    Метрики в формате Prometheus для сервера мониторинга.
+
+    Токен передается в заголовке `Authorization: Bearer <токен>`
+    (`bearer_token` в конфигурации Prometheus) и сравнивается
+    с настройкой METRICS_TOKEN. Пустой токен в настройках
+    закрывает доступ к метрикам.
+    """
+    scheme, _, token = request.headers.get('Authorization', '').partition(
+        ' '
+    )
+    if not (settings.METRICS_TOKEN and scheme == 'Bearer' and token
+            and constant_time_compare(token, settings.METRICS_TOKEN)):
+        return HttpResponseForbidden()
+    content, content_type = render_metrics()
+    return HttpResponse(content, content_type=content_type)
 
 
-class APISignUpView(APIView):
+class APISignUpView(ServerTimingMixin, APIView):
     """Передать email и username, отправить код подтверждения."""
 
     def post(self, request):
@@ -144,7 +363,7 @@ class APISignUpView(APIView):
         return Response(serializer.data, status=HTTPStatus.OK)
 
 
-class TokenObtainView(APIView):
+class TokenObtainView(ServerTimingMixin, APIView):
     """
     Получение JWT-токена в обмен на username и confirmation code.
     Права доступа: Доступно без токена.
@@ -160,12 +379,18 @@ class TokenObtainView(APIView):
         return Response({'token': access_str}, status=HTTPStatus.OK)
 
 
-class UsersViewSet(viewsets.ModelViewSet):
+class UsersViewSet(ServerTimingMixin, StreamingPageMixin,
+                   BatchLookupMixin, viewsets.ModelViewSet):
     """ViewSet для модели Users."""
 
     queryset = User.objects.all()
     serializer_class = UserSerializer
     lookup_field = 'username'
+    # Имя пользователя может содержать точку (UnicodeUsernameValidator).
+    lookup_value_regex = '[^/]+'
+    batch_query_param = 'usernames'
+    batch_lookup_field = 'username'
+    batch_value_type = str
     pagination_class = BaseLimitOffsetPagination
     permission_classes = (IsAdminOnly,)
     filter_backends = (filters.SearchFilter,)
@@ -3,9 +3,11 @@ from rest_framework.mixins import (CreateModelMixin, DestroyModelMixin,
                                    ListModelMixin)
 from rest_framework.viewsets import GenericViewSet
 
+from .timing import ServerTimingMixin
+
 
 class CreateListDestroyViewSet(
-    CreateModelMixin, ListModelMixin,
+    ServerTimingMixin, CreateModelMixin, ListModelMixin,
     DestroyModelMixin, GenericViewSet
 ):
     """Класс для создания, просмотра и удаления объектов."""
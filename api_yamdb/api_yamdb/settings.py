@@ -1,4 +1,6 @@
 """Настройки проекта."""
+import os
+import tempfile
 from datetime import timedelta
 from pathlib import Path
 
@@ -32,6 +34,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.v1.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -39,6 +42,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.v1.middleware.QueryBudgetMiddleware',
+    'api.v1.middleware.ProfilerMiddleware',
 ]
 
 ROOT_URLCONF = 'api_yamdb.urls'
@@ -62,6 +67,17 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
+# Версии кешей хранятся в БД (reviews.ResourceVersion), поэтому
+# изменения, сделанные одним процессом, инвалидируют кеш ответов
+# всех процессов и с кешем в памяти процесса. Общий кеш (например,
+# Memcached) позволяет процессам использовать ответы друг друга.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+RESPONSE_CACHE_TIMEOUT = 300
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
@@ -117,6 +133,48 @@ CSV_DATA_PATH = STATICFILES_DIRS[0] / 'data/'
 
 # Pagination
 DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 10000
+PAGINATION_COUNT_CACHE_TIMEOUT = 60
+
+# Fast read path for list endpoints (see api.v1.fast_read)
+FAST_READ_ENABLED = True
+
+# Streaming of large list pages (see api.v1.renderers)
+STREAMING_RESPONSE_MIN_LIMIT = 500
+STREAMING_RESPONSE_CHUNK_SIZE = 100
+
+# Catalog export: token for partners (header X-Export-Token), empty disables
+CATALOG_EXPORT_TOKEN = os.getenv('CATALOG_EXPORT_TOKEN', '')
+CATALOG_EXPORT_CHUNK_SIZE = 1000
+
+# Top rated titles leaderboard (see api.v1.leaderboard)
+TITLE_TOP_SIZE = 10
+TITLE_TOP_CACHE_TIMEOUT = 60 * 60
+
+# Logging of query budget violations (see api.v1.budgets)
+QUERY_BUDGET_LOGGING = False
+
+# Prometheus metrics at /metrics (see api.v1.metrics). The scraper sends
+# the token as "Authorization: Bearer <token>", empty disables the endpoint.
+METRICS_ENABLED = True
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+# Per-request profiler (see api.v1.profiler). Reports contain raw SQL,
+# so they are written outside the source tree by default.
+PROFILER_DIR = Path(os.getenv(
+    'PROFILER_DIR', Path(tempfile.gettempdir()) / 'api_yamdb_profiles'
+))
+PROFILER_MAX_ENTRIES = 20
+PROFILER_STATS_LIMIT = 50
+
+# Bulk operations
+TITLE_BULK_MAX_SIZE = 100
+BATCH_LOOKUP_MAX_SIZE = 100
+
+# Prefix suggestions
+SUGGEST_INDEX_TTL = 300
+SUGGEST_DEFAULT_LIMIT = 10
+SUGGEST_MAX_LIMIT = 50
 
 # User settings
 DEFAULT_USER_ROLE = 'user'
@@ -128,7 +186,11 @@ ADMIN_ROLE = 'admin'
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
-    )
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.v1.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
 }
 
 # JWT settings
@@ -164,5 +226,15 @@ LOGGING = {
             'level': 'DEBUG',
             'propagate': True,
         },
+        'budgets': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+            'propagate': True,
+        },
+        'suggest': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+            'propagate': True,
+        },
     },
 }
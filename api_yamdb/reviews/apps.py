@@ -1,8 +1,22 @@
 from django.apps import AppConfig
+from django.db import connections
+from django.db.models.signals import post_migrate
 from django.utils.translation import gettext_lazy as _
 
 
+def ensure_title_search(sender, using, **kwargs):
+    """Восстанавливает триггеры FTS5, если миграция пересоздала таблицу."""
+    from .search import install_title_search
+
+    install_title_search(connections[using])
+
+
 class ReviewsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'reviews'
     verbose_name = _('Отзывы')
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+        post_migrate.connect(ensure_title_search, sender=self)
@@ -8,7 +8,8 @@ from django.db import transaction
 
 from ..csv_config import CSV_MAPPING, M2M_MODELS_MAPPING
 from ..services import (fill_many_to_many_tables,
-                        fill_simple_and_foreign_key_tables)
+                        fill_simple_and_foreign_key_tables,
+                        refresh_after_bulk_load)
 
 logger = logging.getLogger('import')
 
@@ -37,6 +38,8 @@ class Command(BaseCommand):
         **e.g**: (предполагается, что таблица category заполнена)
             - `python(3) manage.py db_fill --title`
             - `python(3) manage.py db_fill --genre_title`
+        3) ***Таблицы M2M перед заполнением очищаются. С параметром
+        `--incremental` связи из csv добавляются к существующим.***
     """
 
     help = 'Команда для заполнения таблиц в базе данных.'
@@ -61,6 +64,11 @@ class Command(BaseCommand):
             action='store_true',
             help='Заполнение всех таблиц',
         )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Добавление связей M2M без очистки таблиц',
+        )
 
     def handle(self, *args, **options):
         """
@@ -75,11 +83,13 @@ class Command(BaseCommand):
                 if options.get('all', False):
                     self.fill_all_tables(
                         CSV_MAPPING, M2M_MODELS_MAPPING,
+                        options.get('incremental', False),
                     )
                 else:
                     self.fill_selected_tables(
                         options, CSV_MAPPING, M2M_MODELS_MAPPING,
                     )
+                self.after_fill()
         except Exception as e:
             self.stdout.write(self.style.ERROR(f'Ошибка при заполнении: {e}'))
         self.stdout.write(self.style.SUCCESS('Данные успешно заполнены!'))
@@ -88,6 +98,7 @@ class Command(BaseCommand):
         self,
         simple_model_mapping: Dict,
         m2m_model_mapping: Dict,
+        incremental: bool = False,
     ) -> None:
         """
         Заполняет все таблицы, переданные в команде:
@@ -98,7 +109,13 @@ class Command(BaseCommand):
             fill_simple_and_foreign_key_tables(simple_model_mapping, table)
 
         for m2m_table in m2m_model_mapping:
-            fill_many_to_many_tables(m2m_model_mapping, m2m_table)
+            fill_many_to_many_tables(
+                m2m_model_mapping, m2m_table, incremental
+            )
+
+    def after_fill(self) -> None:
+        """Обновляет денормализованные данные после заполнения таблиц."""
+        refresh_after_bulk_load(sender=self.__class__)
 
     def fill_selected_tables(
         self, options: Dict,
@@ -114,5 +131,6 @@ class Command(BaseCommand):
         for m2m_table in m2m_model_mapping:
             if options.get(m2m_table, False):
                 fill_many_to_many_tables(
-                    m2m_model_mapping, m2m_table
+                    m2m_model_mapping, m2m_table,
+                    options.get('incremental', False),
                 )
@@ -6,6 +6,9 @@ from users.models import User
 from api_yamdb.settings import CSV_DATA_PATH
 
 BULK_CREATE_BATCH_SIZE = 300
+GENERATE_BATCH_SIZE = 10000
+# Интервал логирования скорости загрузки таблицы, в секундах
+PROGRESS_LOG_INTERVAL = 5
 
 
 CSV_MAPPING = {
@@ -53,6 +56,7 @@ CSV_MAPPING = {
     'review': {
         'model': Review,
         'fields': {
+            'id': 'id',
             'author': ('author', User),
             'title': ('title_id', Title),
             'text': 'text',
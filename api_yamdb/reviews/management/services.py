@@ -1,24 +1,61 @@
 """Логика обработки данных из csv-файлов и заполнения таблиц."""
 import csv
 import logging
-from typing import Dict, List
+import time
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
-from django.core.exceptions import ObjectDoesNotExist
 from django.db.models import Model
 
-from .csv_config import BULK_CREATE_BATCH_SIZE
-from .exceptions import FileDoesNotExist, FileFormatError, TableFillError
+from reviews.models import Review, Title
+from reviews.signals import catalog_bulk_loaded
+
+from .csv_config import BULK_CREATE_BATCH_SIZE, PROGRESS_LOG_INTERVAL
+from .exceptions import (FileDoesNotExist, FileFormatError, MappingError,
+                         TableFillError)
 from .utils import Data, M2MData
 
 logger = logging.getLogger('import')
 
 
-def map_data(fields: Dict, line: Dict) -> Dict:
+def refresh_after_bulk_load(sender) -> None:
+    """
+    Обновляет денормализованные данные после массовой загрузки.
+
+    bulk_create и пакетные INSERT не отправляют сигналы моделей,
+    поэтому рейтинг произведений и счетчики комментариев
+    пересчитываются целиком, а подписчики `catalog_bulk_loaded`
+    сбрасывают свои кеши.
+    """
+    Title.objects.refresh_ratings()
+    Review.objects.refresh_comments_counts()
+    logger.info('Рейтинг произведений и счетчики комментариев пересчитаны')
+    catalog_bulk_loaded.send(sender=sender)
+
+
+def parse_related_id(value, line_number: int, related_model) -> Optional[int]:
+    """Преобразует id связанного объекта из csv-файла в число."""
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except ValueError as e:
+        error_msg = (
+            f'Строка {line_number}: некорректный id связанного объекта '
+            f'{related_model.__name__} {value!r}!'
+        )
+        logger.debug(error_msg)
+        raise TableFillError(error_msg) from e
+
+
+def map_data(fields: Dict, line: Dict, line_number: int) -> Dict:
     """
     Преобразует данные из csv-файла в словарь для создания объекта модели.
 
     Возвращает словарь, где ключи - это поля модели,
-    а значения - данные из csv-файла.
+    а значения - данные из csv-файла. Связанные объекты не загружаются:
+    их id записываются в поля `<field>_id` и проверяются
+    функцией `check_related_ids`.
     """
     mapped_data: Dict = {}
 
@@ -27,18 +64,37 @@ def map_data(fields: Dict, line: Dict) -> Dict:
             mapped_data[field] = line.get(value)
         else:
             related_field_id, related_model = value
-            try:
-                mapped_data[field] = related_model.objects.get(
-                    id=line[related_field_id]
-                )
-            except ObjectDoesNotExist as e:
+            mapped_data[f'{field}_id'] = parse_related_id(
+                line.get(related_field_id), line_number, related_model
+            )
+    return mapped_data
+
+
+def check_related_ids(fields: Dict, rows: List[Tuple[int, Dict]]) -> None:
+    """
+    Проверяет, что связанные объекты пакета строк существуют.
+
+    `rows` - пары из номера строки csv-файла и результата `map_data`.
+    Для каждой связанной модели выполняется один запрос с `IN`.
+    """
+    for field, value in fields.items():
+        if not isinstance(value, tuple):
+            continue
+        _, related_model = value
+        attname = f'{field}_id'
+        ids = {data[attname] for _, data in rows} - {None}
+        existing = set(
+            related_model.objects.filter(id__in=ids)
+            .values_list('id', flat=True)
+        )
+        for line_number, data in rows:
+            if data[attname] is not None and data[attname] not in existing:
                 error_msg = (
-                    f'Связанный объект {related_model.__name__}'
-                    f'{line.get(related_field_id)} не найден!'
+                    f'Строка {line_number}: связанный объект '
+                    f'{related_model.__name__} {data[attname]} не найден!'
                 )
                 logger.debug(error_msg)
-                raise TableFillError(error_msg) from e
-    return mapped_data
+                raise TableFillError(error_msg)
 
 
 def bulk_fill(
@@ -57,7 +113,7 @@ def bulk_fill(
         model.objects.bulk_create(
             batch, batch_size=batch_size, ignore_conflicts=True
         )
-        logger.info(
+        logger.debug(
             'Создано %d объектов модели %s', len(batch), model.__name__
         )
     except TableFillError as e:
@@ -67,24 +123,84 @@ def bulk_fill(
             f'Ошибка при заполнении таблицы {e}') from e
 
 
+class FillProgress:
+    """
+    Считает загруженные строки таблицы и логирует скорость загрузки.
+
+    Промежуточная скорость логируется не чаще раза
+    в `PROGRESS_LOG_INTERVAL` секунд.
+    """
+
+    def __init__(self, table_name: str,
+                 interval: float = PROGRESS_LOG_INTERVAL) -> None:
+        self.table_name = table_name
+        self.interval = interval
+        self.count = 0
+        self.started = self.logged = time.perf_counter()
+
+    @property
+    def rate(self) -> float:
+        elapsed = time.perf_counter() - self.started
+        return self.count / elapsed if elapsed else 0.0
+
+    def add(self, count: int) -> None:
+        self.count += count
+        now = time.perf_counter()
+        if now - self.logged >= self.interval:
+            self.logged = now
+            logger.info(
+                'Таблица %s: загружено %d строк (%.0f строк/с)',
+                self.table_name, self.count, self.rate,
+            )
+
+    def finish(self) -> None:
+        logger.info(
+            'Таблица %s заполнена: %d строк за %.1f с (%.0f строк/с)',
+            self.table_name, self.count,
+            time.perf_counter() - self.started, self.rate,
+        )
+
+
+def iter_mapped_rows(fields: Dict, reader) -> Iterator[Tuple[int, Dict]]:
+    """Возвращает пары из номера строки csv-файла и результата `map_data`."""
+    for line_number, line in enumerate(reader, start=2):
+        yield line_number, map_data(fields, line, line_number)
+
+
+def iter_chunks(rows: Iterable, size: int) -> Iterator[List]:
+    """Разбивает последовательность на списки длиной не более `size`."""
+    iterator = iter(rows)
+    chunk = list(islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, size))
+
+
 def fill_simple_and_foreign_key_tables(mapping: Dict, table_name: str) -> None:
     """
     Заполняет таблицы с простыми моделями и
     моделями, связанными через ForeignKey.
+
+    Файл обрабатывается потоком: строки читаются, преобразуются,
+    проверяются и сохраняются пакетами по `BULK_CREATE_BATCH_SIZE`,
+    поэтому потребление памяти не зависит от размера файла.
     """
 
     data = Data(mapping, table_name)
+    model = data.get_simple_model()
+    progress = FillProgress(table_name)
 
     try:
         logger.info('Попытка чтения csv-файла %s', data.path)
         with open(data.path, 'r', encoding='utf-8') as file:
             reader = csv.DictReader(file)
-            mapped_data_list = []
-            for line in reader:
-                mapped_data_list.append(map_data(data.fields, line))
-            if mapped_data_list:
-                bulk_fill(data.get_simple_model(), mapped_data_list)
-        logger.info('Таблица %s заполнена', table_name)
+            for chunk in iter_chunks(
+                iter_mapped_rows(data.fields, reader), BULK_CREATE_BATCH_SIZE
+            ):
+                check_related_ids(data.fields, chunk)
+                bulk_fill(model, [mapped_data for _, mapped_data in chunk])
+                progress.add(len(chunk))
+        progress.finish()
 
     except FileNotFoundError as e:
         logger.debug('Файл %s не найден: %e', table_name, e)
@@ -96,46 +212,91 @@ def fill_simple_and_foreign_key_tables(mapping: Dict, table_name: str) -> None:
         raise FileFormatError(
             f'Ошибка при чтении файла {data.path}') from e
 
-    except ObjectDoesNotExist as e:
-        logger.debug('Ошибка при заполнении таблицы: %e', e)
-        raise TableFillError(
-            f'Ошибка при заполнении таблицы {e}') from e
 
+def get_through_attname(through: Model, related_model: Model) -> str:
+    """Возвращает атрибут промежуточной модели со ссылкой на модель."""
+    for field in through._meta.concrete_fields:
+        if field.is_relation and field.related_model is related_model:
+            return field.attname
+    raise MappingError(
+        f'Модель {related_model.__name__} не связана '
+        f'с таблицей {through._meta.db_table}!'
+    )
+
+
+class ExistingIds(set):
+    """Множество id объектов модели, загруженное одним запросом."""
 
-def fill_many_to_many_tables(m2m_mapping: Dict, table_name: str) -> None:
+    def __init__(self, model: Model) -> None:
+        super().__init__(model.objects.values_list('id', flat=True))
+        self.model = model
+
+
+def map_m2m_line(sides: List[Tuple], line: Dict, line_number: int) -> Dict:
+    """
+    Преобразует строку csv-файла M2M в поля промежуточной модели.
+
+    `sides` - тройки из столбца csv-файла, атрибута промежуточной модели
+    и множества существующих id связанной модели.
+    """
+    mapped_data: Dict = {}
+    for column, attname, existing_ids in sides:
+        related_id = parse_related_id(
+            line.get(column), line_number, existing_ids.model
+        )
+        if related_id not in existing_ids:
+            error_msg = (
+                f'Строка {line_number}: связанный объект '
+                f'{existing_ids.model.__name__} {line.get(column)} '
+                'не найден!'
+            )
+            logger.debug(error_msg)
+            raise TableFillError(error_msg)
+        mapped_data[attname] = related_id
+    return mapped_data
+
+
+def fill_many_to_many_tables(
+        m2m_mapping: Dict, table_name: str, incremental: bool = False) -> None:
     """
     Заполняет таблицы, связанные с помощью ManyToManyField.
+
+    Id связанных объектов проверяются по множествам, загруженным
+    один раз, а связи сохраняются в промежуточную таблицу
+    через bulk_create пакетами по `BULK_CREATE_BATCH_SIZE`.
+    Уже существующие связи пропускаются. Без `incremental`
+    промежуточная таблица предварительно очищается.
     """
 
     data = M2MData(m2m_mapping, table_name)
-    model = data.get_m2m_models()[0][1]
-    related_model_name = data.get_related_model_name()
-    getattr(model, related_model_name).through.objects.all().delete()
-    logger.info('Таблица %s  предварительно очищена', table_name)
+    models = data.get_m2m_models()
+    through = getattr(
+        models[0][1], data.get_related_model_name()
+    ).through
+    if not incremental:
+        through.objects.all().delete()
+        logger.info('Таблица %s  предварительно очищена', table_name)
+    sides = [
+        (column, get_through_attname(through, model), ExistingIds(model))
+        for column, model in models
+    ]
+    progress = FillProgress(table_name)
 
     try:
         with open(data.path, 'r', encoding='utf-8') as file:
             reader = csv.DictReader(file)
-            for line in reader:
-                models = data.get_m2m_models()
-                (model_id, model), (related_model_id, related_model) = models
-
-                model_object = model.objects.get(
-                    id=line.get(model_id)
-                )
-                related_model_object = related_model.objects.get(
-                    id=line.get(related_model_id)
-                )
-                related_objects = getattr(
-                    model_object, data.get_related_model_name()
+            for chunk in iter_chunks(
+                enumerate(reader, start=2), BULK_CREATE_BATCH_SIZE
+            ):
+                through.objects.bulk_create(
+                    [
+                        through(**map_m2m_line(sides, line, line_number))
+                        for line_number, line in chunk
+                    ],
+                    ignore_conflicts=True,
                 )
-                related_objects.add(related_model_object)
-        logger.info('Таблица %s заполнена', table_name)
-
-    except ObjectDoesNotExist as e:
-        logger.info('Ошибка при заполнении таблицы: %e', e)
-        raise TableFillError(
-            f'Ошибка при заполнении таблицы {e}') from e
+                progress.add(len(chunk))
+        progress.finish()
 
     except FileNotFoundError as e:
         logger.error('Файл %s не найден: %e', table_name, e)
@@ -0,0 +1,23 @@
+# Generated by Django 3.2 on 2026-10-17 20:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0014_title_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='comments_version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Версия комментариев'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='reviews_version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Версия отзывов'),
+        ),
+    ]
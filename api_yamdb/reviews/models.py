@@ -1,7 +1,9 @@
 """Модели приложения reviews."""
 from django.conf import settings
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, Count, F, OuterRef, Subquery, Sum, When
+from django.db.models.functions import Coalesce
 from django.utils.text import Truncator, slugify
 from django.utils.translation import gettext_lazy as _
 
@@ -60,6 +62,67 @@ class Genre(AbstractNameSlugBaseModel):
         return f'Название жанра: {self.name}'
 
 
+class TitleQuerySet(models.QuerySet):
+    """QuerySet произведений с поддержкой денормализованного рейтинга."""
+
+    def shift_rating(
+            self, score_delta: int, count_delta: int, **updates) -> int:
+        """
+        Инкрементально изменяет сумму оценок и количество отзывов.
+
+        Рейтинг пересчитывается в том же UPDATE-запросе,
+        при отсутствии отзывов он становится равным None.
+        В `updates` можно передать другие поля для того же запроса.
+        """
+        rating_sum = F('rating_sum') + score_delta
+        reviews_count = F('reviews_count') + count_delta
+        return self.update(
+            rating_sum=rating_sum,
+            reviews_count=reviews_count,
+            rating=Case(
+                When(
+                    reviews_count__gt=-count_delta,
+                    then=rating_sum / reviews_count,
+                ),
+                default=None,
+                output_field=models.PositiveSmallIntegerField(),
+            ),
+            **updates,
+        )
+
+    def refresh_ratings(self) -> int:
+        """
+        Полностью пересчитывает рейтинг по таблице отзывов.
+
+        Используется после массовой загрузки данных,
+        при которой сигналы моделей не отправляются.
+        """
+        reviews = Review.objects.filter(
+            title=OuterRef('pk')
+        ).order_by().values('title')
+        updated = self.update(
+            rating_sum=Coalesce(
+                Subquery(reviews.annotate(total=Sum('score')).values('total')),
+                0,
+            ),
+            reviews_count=Coalesce(
+                Subquery(reviews.annotate(total=Count('pk')).values('total')),
+                0,
+            ),
+        )
+        self.update(
+            rating=Case(
+                When(
+                    reviews_count__gt=0,
+                    then=F('rating_sum') / F('reviews_count'),
+                ),
+                default=None,
+                output_field=models.PositiveSmallIntegerField(),
+            ),
+        )
+        return updated
+
+
 class Title(models.Model):
     """Модель произведения."""
 
@@ -88,12 +151,42 @@ class Title(models.Model):
         verbose_name=_('Категория'),
         db_index=True,
     )
+    rating_sum = models.PositiveIntegerField(
+        _('Сумма оценок'),
+        default=0,
+        editable=False,
+    )
+    reviews_count = models.PositiveIntegerField(
+        _('Количество отзывов'),
+        default=0,
+        editable=False,
+    )
+    rating = models.PositiveSmallIntegerField(
+        _('Рейтинг'),
+        null=True,
+        blank=True,
+        editable=False,
+    )
+    reviews_version = models.PositiveIntegerField(
+        _('Версия отзывов'),
+        default=0,
+        editable=False,
+    )
+
+    objects = TitleQuerySet.as_manager()
 
     class Meta:
         default_related_name = 'titles'
         verbose_name = _('Произведение')
         verbose_name_plural = _('Произведения')
         ordering = ('name',)
+        indexes = [
+            models.Index(fields=('name', 'id'), name='title_name_id_idx'),
+            models.Index(
+                fields=('rating', 'id'), name='title_rating_id_idx'
+            ),
+            models.Index(fields=('year', 'id'), name='title_year_id_idx'),
+        ]
 
     def __str__(self):
         return f'Название произведения: {self.name}'
@@ -125,6 +218,38 @@ class AbstractTextAuthorPubdateModel(models.Model):
         abstract = True
         ordering = ('-pub_date',)
 
+    def save(self, *args, **kwargs):
+        """
+        Сохраняет объект.
+
+        Денормализованные счетчики родительских объектов обновляются
+        обработчиками post_save в той же транзакции.
+        """
+        with transaction.atomic(using=kwargs.get('using')):
+            self.prepare_save(kwargs.get('using'))
+            super().save(*args, **kwargs)
+
+    def prepare_save(self, using=None):
+        """Выполняется в транзакции сохранения перед записью объекта."""
+
+
+class ReviewQuerySet(models.QuerySet):
+    """QuerySet отзывов с поддержкой денормализованных счетчиков."""
+
+    def refresh_comments_counts(self) -> int:
+        """Пересчитывает количество комментариев по таблице комментариев."""
+        comments = Comment.objects.filter(
+            review=OuterRef('pk')
+        ).order_by().values('review')
+        return self.update(
+            comments_count=Coalesce(
+                Subquery(
+                    comments.annotate(total=Count('pk')).values('total')
+                ),
+                0,
+            ),
+        )
+
 
 class Review(AbstractTextAuthorPubdateModel):
     """Модель отзыва."""
@@ -153,11 +278,29 @@ class Review(AbstractTextAuthorPubdateModel):
             ),
         ]
     )
+    comments_count = models.PositiveIntegerField(
+        _('Количество комментариев'),
+        default=0,
+        editable=False,
+    )
+    comments_version = models.PositiveIntegerField(
+        _('Версия комментариев'),
+        default=0,
+        editable=False,
+    )
+
+    objects = ReviewQuerySet.as_manager()
 
     class Meta(AbstractTextAuthorPubdateModel.Meta):
         default_related_name = 'reviews'
         verbose_name = _('Отзыв')
         verbose_name_plural = _('Отзывы')
+        indexes = [
+            models.Index(
+                fields=('title', '-pub_date', 'id'),
+                name='review_title_pub_date_idx',
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=['author', 'title'],
@@ -172,6 +315,22 @@ class Review(AbstractTextAuthorPubdateModel):
         )
         return Truncator(desc).words(settings.NAME_FIELD_TRUNCATOR)
 
+    def prepare_save(self, using=None):
+        """
+        Блокирует строку отзыва и запоминает сохраненную оценку.
+
+        Оценка перечитывается в транзакции записи, а не берется
+        из загруженного объекта, поэтому при параллельном изменении
+        отзыва разница оценок считается от последней сохраненной.
+        """
+        self._loaded_score = None
+        if not self._state.adding:
+            self._loaded_score = type(self).objects.using(
+                using
+            ).select_for_update().filter(pk=self.pk).values_list(
+                'score', flat=True
+            ).first()
+
 
 class Comment(AbstractTextAuthorPubdateModel):
     """Модель комментария."""
@@ -186,6 +345,12 @@ class Comment(AbstractTextAuthorPubdateModel):
         default_related_name = 'comments'
         verbose_name = _('Комментарий')
         verbose_name_plural = _('Комментарии')
+        indexes = [
+            models.Index(
+                fields=('review', '-pub_date', 'id'),
+                name='comment_review_pub_date_idx',
+            ),
+        ]
 
     def __str__(self):
         desc = (
@@ -193,3 +358,28 @@ class Comment(AbstractTextAuthorPubdateModel):
             f'Комментарий: {self.text}'
         )
         return Truncator(desc).words(settings.NAME_FIELD_TRUNCATOR)
+
+
+class ResourceVersion(models.Model):
+    """
+    Счетчик версии ресурса, общий для всех процессов.
+
+    Версии входят в ключи кешей API (каталог, рейтинги лучших,
+    справочники slug), поэтому их увеличение делает кеши
+    недействительными во всех процессах, а не только в том,
+    который изменил данные.
+    """
+
+    name = models.CharField(
+        _('Ресурс'),
+        max_length=settings.CHARFIELD_MAX_LENGTH,
+        primary_key=True,
+    )
+    value = models.BigIntegerField(_('Версия'), default=0)
+
+    class Meta:
+        verbose_name = _('Версия ресурса')
+        verbose_name_plural = _('Версии ресурсов')
+
+    def __str__(self):
+        return f'{self.name}: {self.value}'
@@ -0,0 +1,111 @@
+"""Полнотекстовый поиск по названиям произведений (SQLite FTS5)."""
+import re
+
+from django.db import connection
+
+TITLE_SEARCH_TABLE = 'reviews_title_fts'
+
+TITLE_SEARCH_SQL = (
+    f'CREATE VIRTUAL TABLE IF NOT EXISTS {TITLE_SEARCH_TABLE} USING fts5('
+    "name, content='reviews_title', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    f'CREATE TRIGGER IF NOT EXISTS {TITLE_SEARCH_TABLE}_ai '
+    'AFTER INSERT ON reviews_title BEGIN '
+    f'INSERT INTO {TITLE_SEARCH_TABLE}(rowid, name) '
+    'VALUES (new.id, new.name); END',
+    f'CREATE TRIGGER IF NOT EXISTS {TITLE_SEARCH_TABLE}_ad '
+    'AFTER DELETE ON reviews_title BEGIN '
+    f'INSERT INTO {TITLE_SEARCH_TABLE}({TITLE_SEARCH_TABLE}, rowid, name) '
+    "VALUES ('delete', old.id, old.name); END",
+    f'CREATE TRIGGER IF NOT EXISTS {TITLE_SEARCH_TABLE}_au '
+    'AFTER UPDATE OF name ON reviews_title BEGIN '
+    f'INSERT INTO {TITLE_SEARCH_TABLE}({TITLE_SEARCH_TABLE}, rowid, name) '
+    "VALUES ('delete', old.id, old.name); "
+    f'INSERT INTO {TITLE_SEARCH_TABLE}(rowid, name) '
+    'VALUES (new.id, new.name); END',
+)
+TITLE_SEARCH_TRIGGERS = tuple(
+    f'{TITLE_SEARCH_TABLE}_{suffix}' for suffix in ('ai', 'ad', 'au')
+)
+
+
+def supports_title_search(db_connection=connection) -> bool:
+    """Проверяет, что база данных поддерживает индекс FTS5."""
+    return db_connection.vendor == 'sqlite'
+
+
+def install_title_search(db_connection=connection) -> None:
+    """
+    Создает таблицу FTS5 и триггеры синхронизации с reviews_title.
+
+    Операция идемпотентна. Если триггеры отсутствовали (например,
+    SQLite пересоздал таблицу reviews_title при миграции),
+    индекс перестраивается целиком.
+    """
+    if not supports_title_search(db_connection):
+        return
+    if 'reviews_title' not in db_connection.introspection.table_names():
+        return
+    with db_connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT COUNT(*) FROM sqlite_master "
+            "WHERE type = 'trigger' AND name IN (%s, %s, %s)",
+            TITLE_SEARCH_TRIGGERS,
+        )
+        installed = cursor.fetchone()[0] == len(TITLE_SEARCH_TRIGGERS)
+        for statement in TITLE_SEARCH_SQL:
+            cursor.execute(statement)
+        if not installed:
+            cursor.execute(
+                f'INSERT INTO {TITLE_SEARCH_TABLE}({TITLE_SEARCH_TABLE}) '
+                "VALUES ('rebuild')"
+            )
+
+
+def uninstall_title_search(db_connection=connection) -> None:
+    """Удаляет таблицу FTS5 и триггеры синхронизации."""
+    if not supports_title_search(db_connection):
+        return
+    with db_connection.cursor() as cursor:
+        for trigger in TITLE_SEARCH_TRIGGERS:
+            cursor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        cursor.execute(f'DROP TABLE IF EXISTS {TITLE_SEARCH_TABLE}')
+
+
+def build_match_query(query: str) -> str:
+    """
+    Преобразует пользовательский запрос в выражение MATCH.
+
+    Каждое слово экранируется кавычками, последнее слово
+    ищется по префиксу.
+    """
+    words = re.findall(r'\w+', query.casefold())
+    if not words:
+        return ''
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def search_titles(queryset, query: str):
+    """
+    Фильтрует произведения по названию и сортирует по релевантности bm25.
+
+    Для баз данных без FTS5 используется поиск `icontains`.
+    """
+    match = build_match_query(query)
+    if not match:
+        return queryset.none()
+    if not supports_title_search():
+        return queryset.filter(name__icontains=query)
+    title_table = queryset.model._meta.db_table
+    return queryset.extra(
+        tables=[TITLE_SEARCH_TABLE],
+        where=[
+            f'{TITLE_SEARCH_TABLE}.rowid = {title_table}.id',
+            f'{TITLE_SEARCH_TABLE} MATCH %s',
+        ],
+        params=[match],
+        select={'search_rank': f'bm25({TITLE_SEARCH_TABLE})'},
+        order_by=['search_rank', 'id'],
+    )
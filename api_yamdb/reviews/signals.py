@@ -0,0 +1,115 @@
+"""Обработчики сигналов приложения reviews."""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import Signal, receiver
+
+from .models import Comment, Review, Title
+
+User = get_user_model()
+
+# Отправляется после массовой загрузки данных в обход сигналов моделей.
+catalog_bulk_loaded = Signal()
+# Отправляется после создания произведений через bulk_create
+# (аргумент `titles`), при котором post_save не отправляется.
+titles_bulk_created = Signal()
+
+
+@receiver(post_save, sender=Review)
+def update_title_on_review_save(sender, instance, created, raw, **kwargs):
+    """
+    Обновляет рейтинг и версию отзывов произведения
+    при создании или изменении отзыва.
+    """
+    if raw:
+        return
+    titles = Title.objects.filter(pk=instance.title_id)
+    next_version = F('reviews_version') + 1
+    loaded_score = getattr(instance, '_loaded_score', None)
+    if created:
+        titles.shift_rating(instance.score, 1, reviews_version=next_version)
+    elif loaded_score is None:
+        titles.refresh_ratings()
+        titles.update(reviews_version=next_version)
+    elif loaded_score != instance.score:
+        titles.shift_rating(
+            instance.score - loaded_score, 0, reviews_version=next_version
+        )
+    else:
+        titles.update(reviews_version=next_version)
+    instance._loaded_score = instance.score
+
+
+@receiver(post_delete, sender=Review)
+def update_title_on_review_delete(sender, instance, **kwargs):
+    """
+    Обновляет рейтинг и версию отзывов произведения при удалении отзыва.
+
+    Срабатывает в том числе при каскадном удалении пользователя.
+    """
+    Title.objects.filter(pk=instance.title_id).shift_rating(
+        -instance.score, -1, reviews_version=F('reviews_version') + 1
+    )
+
+
+@receiver(post_save, sender=Comment)
+def update_review_on_comment_save(sender, instance, created, raw, **kwargs):
+    """
+    Обновляет счетчик и версию комментариев отзыва
+    при создании или изменении комментария.
+    """
+    if raw:
+        return
+    updates = {'comments_version': F('comments_version') + 1}
+    if created:
+        updates['comments_count'] = F('comments_count') + 1
+    Review.objects.filter(pk=instance.review_id).update(**updates)
+
+
+@receiver(post_delete, sender=Comment)
+def update_review_on_comment_delete(sender, instance, **kwargs):
+    """Обновляет счетчик и версию комментариев отзыва при удалении."""
+    Review.objects.filter(pk=instance.review_id).update(
+        comments_count=F('comments_count') - 1,
+        comments_version=F('comments_version') + 1,
+    )
+
+
+@receiver(pre_save, sender=User)
+def remember_previous_username(sender, instance, raw, update_fields=None,
+                               **kwargs):
+    """Запоминает имя пользователя из БД перед сохранением."""
+    instance._previous_username = None
+    if raw or instance.pk is None or (
+            update_fields is not None and 'username' not in update_fields):
+        return
+    instance._previous_username = sender.objects.filter(
+        pk=instance.pk
+    ).values_list('username', flat=True).first()
+
+
+@receiver(post_save, sender=User)
+def update_versions_on_username_change(sender, instance, created, raw,
+                                       **kwargs):
+    """
+    Обновляет версии отзывов и комментариев при смене имени автора.
+
+    Отзывы и комментарии выводят автора по имени, поэтому после
+    фиксации транзакции увеличиваются версии отзывов произведений
+    и комментариев отзывов, в которых пользователь - автор.
+    """
+    previous = getattr(instance, '_previous_username', None)
+    if created or raw or previous in (None, instance.username):
+        return
+    author_id = instance.pk
+
+    def bump_versions():
+        Title.objects.filter(reviews__author_id=author_id).update(
+            reviews_version=F('reviews_version') + 1
+        )
+        Review.objects.filter(comments__author_id=author_id).update(
+            comments_version=F('comments_version') + 1
+        )
+
+    transaction.on_commit(bump_versions)
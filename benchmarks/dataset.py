@@ -0,0 +1,43 @@
+"""
+Детерминированный набор данных для нагрузочных тестов.
+
+Набор генерируется командой `db_generate --csv` в CSV-файлы
+в формате `CSV_MAPPING` и загружается в базу данных механизмом
+команды `db_fill`. Размер задается коэффициентом `scale`:
+при `scale=1` создается 100 произведений, около 5 тысяч отзывов
+и 20 тысяч комментариев, при `scale=1000` - 100 тысяч произведений,
+около 5 млн отзывов и 20 млн комментариев. Одинаковые `scale`
+и `seed` дают одинаковые файлы.
+"""
+from pathlib import Path
+from typing import Dict
+
+from django.db import transaction
+
+from reviews.management.commands.db_fill import Command as FillCommand
+from reviews.management.csv_config import CSV_MAPPING, M2M_MODELS_MAPPING
+from reviews.management.generator import CsvSink, generate
+
+
+def write_dataset(directory: Path, scale: int, seed: int) -> Dict[str, int]:
+    """Записывает CSV-файлы набора данных и возвращает количество строк."""
+    return generate(CsvSink(directory), scale, seed)
+
+
+def relocate(mapping: Dict, directory: Path) -> Dict:
+    """Возвращает копию маппинга с путями к файлам в каталоге."""
+    return {
+        table: {**config, 'path': str(directory / Path(config['path']).name)}
+        for table, config in mapping.items()
+    }
+
+
+def load_dataset(directory: Path) -> None:
+    """Загружает набор данных из каталога механизмом `db_fill --all`."""
+    command = FillCommand()
+    with transaction.atomic():
+        command.fill_all_tables(
+            relocate(CSV_MAPPING, directory),
+            relocate(M2M_MODELS_MAPPING, directory),
+        )
+        command.after_fill()
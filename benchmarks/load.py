@@ -0,0 +1,591 @@
+"""
+Нагрузочный тест эндпоинтов /api/v1/ на синтетическом наборе данных.
+
+Скрипт создает базу данных в файле, загружает в нее детерминированный
+набор данных (см. benchmarks/dataset.py), запускает многопоточный
+WSGI-сервер на локальном порту и нагружает каждый эндпоинт
+параллельными HTTP-запросами. Отчет в формате JSON содержит
+p50/p95/p99 времени ответа, пропускную способность и количество
+SQL-запросов на запрос (по метрике `yamdb_db_queries_per_request`).
+Ключи отчета отсортированы, поэтому отчеты разных коммитов можно
+сравнивать обычным diff или параметром `--baseline`. Сценарии
+`--writes` (создание, изменение и удаление объектов) изменяют данные,
+поэтому для сравнимых результатов их не следует запускать с `--keepdb`
+на одной базе. Объекты для удаления и новых отзывов создаются перед
+нагрузкой, по одному на запрос. SQLite допускает одного писателя,
+а транзакция, начатая чтением, при конфликте сразу получает
+"database is locked", поэтому на SQLite сценарии --writes выполняются
+без параллелизма (`concurrency` в отчете эндпоинта). Эндпоинты без
+сценария перечислены в отчете (`meta.excluded`) с причиной.
+
+Запуск из корня репозитория:
+    PYTHONPATH=api_yamdb python benchmarks/load.py --scale 1 \
+        --output report.json
+    PYTHONPATH=api_yamdb python benchmarks/load.py --scale 1 --keepdb \
+        --baseline report.json
+"""
+import argparse
+import http.client
+import json
+import os
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import quote
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.core.servers.basehttp import (ThreadedWSGIServer,  # noqa: E402
+                                          WSGIRequestHandler)
+from django.core.wsgi import get_wsgi_application  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from prometheus_client import REGISTRY  # noqa: E402
+from rest_framework_simplejwt.tokens import RefreshToken  # noqa: E402
+
+from dataset import load_dataset, write_dataset  # noqa: E402
+from reviews.models import (Category, Comment, Genre, Review,  # noqa: E402
+                            Title)
+from users.models import User  # noqa: E402
+
+QUERIES_METRIC = 'yamdb_db_queries_per_request'
+PATH_VARIANTS = 50
+BULK_SIZE = 10
+WRITE_PREFIX = 'benchmark'
+EXCLUDED = {
+    'GET /api/v1/profiles/{profile_id}/': (
+        'профили сохраняются только для запросов с X-Profile, '
+        'время ответа зависит от размера сохраненного профиля'
+    ),
+}
+
+
+class Scenario(NamedTuple):
+    """
+    Нагрузка на эндпоинт: запросы по кругу перебирают пути.
+
+    Если заданы `bodies`, тела запросов перебираются вместе с путями,
+    иначе каждый запрос отправляет `body`.
+    """
+
+    name: str
+    method: str
+    paths: List[str]
+    token: Optional[str] = None
+    body: Optional[object] = None
+    expected_status: Optional[int] = None
+    bodies: Optional[List[dict]] = None
+
+    def is_error(self, status: int) -> bool:
+        if self.expected_status is not None:
+            return status != self.expected_status
+        return not HTTPStatus.OK <= status < HTTPStatus.BAD_REQUEST
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    """Обработчик запросов без логирования каждого запроса."""
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server() -> ThreadedWSGIServer:
+    """Запускает WSGI-сервер приложения на свободном локальном порту."""
+    server = ThreadedWSGIServer(('127.0.0.1', 0), QuietRequestHandler)
+    server.set_app(get_wsgi_application())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def prepare_database(args) -> None:
+    """Создает базу данных и загружает набор данных, если она пуста."""
+    settings.DATABASES['default']['TEST']['NAME'] = str(args.database)
+    connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, keepdb=args.keepdb
+    )
+    if not Title.objects.exists():
+        with tempfile.TemporaryDirectory() as directory:
+            started = time.perf_counter()
+            write_dataset(Path(directory), args.scale, args.seed)
+            load_dataset(Path(directory))
+            print(
+                f'Набор данных загружен за '
+                f'{time.perf_counter() - started:.1f} с'
+            )
+
+
+def get_dataset_sizes() -> Dict[str, int]:
+    return {
+        'categories': Category.objects.count(),
+        'genres': Genre.objects.count(),
+        'titles': Title.objects.count(),
+        'users': User.objects.count(),
+        'reviews': Review.objects.count(),
+        'comments': Comment.objects.count(),
+    }
+
+
+def get_admin_token() -> str:
+    admin, _ = User.objects.get_or_create(
+        username=f'{WRITE_PREFIX}-admin',
+        defaults={
+            'email': f'{WRITE_PREFIX}-admin@yamdb.fake', 'role': 'admin'
+        },
+    )
+    return str(RefreshToken.for_user(admin).access_token)
+
+
+def spread(values: List, count: int = PATH_VARIANTS) -> List:
+    """Возвращает до `count` значений, равномерно взятых из списка."""
+    step = max(len(values) // count, 1)
+    return values[::step][:count]
+
+
+def create_write_targets(count: int) -> Dict[str, List]:
+    """
+    Создает объекты для сценариев удаления и создания отзывов.
+
+    На каждый запрос сценария приходится свой объект, поэтому
+    повторные запросы не получают 404 или 400. Отзывы и комментарии
+    создаются через `create()`, чтобы обновились счетчики родителей.
+    """
+    admin = User.objects.get(username=f'{WRITE_PREFIX}-admin')
+    category = Category.objects.order_by('id').first()
+    Title.objects.bulk_create(
+        Title(name=f'Нагрузочный тест {index}', year=2000,
+              category=category)
+        for index in range(3 * count + 1)
+    )
+    titles = list(
+        Title.objects.filter(name__startswith='Нагрузочный тест')
+        .order_by('-id').values_list('id', flat=True)[:3 * count + 1]
+    )
+    reviews = [
+        Review.objects.create(
+            title_id=title_id, author=admin, text='Отзыв', score=5
+        )
+        for title_id in titles[2 * count:]
+    ]
+    review = reviews.pop()
+    comments = [
+        Comment.objects.create(review=review, author=admin, text='Текст')
+        for _ in range(count)
+    ]
+    slugs = [f'{WRITE_PREFIX}-delete-{index}' for index in range(count)]
+    Category.objects.bulk_create(
+        Category(name=slug, slug=slug) for slug in slugs
+    )
+    Genre.objects.bulk_create(Genre(name=slug, slug=slug) for slug in slugs)
+    User.objects.bulk_create(
+        User(username=slug, email=f'{slug}@yamdb.fake') for slug in slugs
+    )
+    return {
+        'new_review_titles': titles[:count],
+        'titles': titles[count:2 * count],
+        'reviews': [(review.title_id, review.id) for review in reviews],
+        'comments': [
+            (review.title_id, review.id, comment.id) for comment in comments
+        ],
+        'slugs': slugs,
+    }
+
+
+def build_write_scenarios(token: str, count: int) -> List[Scenario]:
+    """Возвращает сценарии, изменяющие данные."""
+    api = '/api/v1'
+    targets = create_write_targets(count)
+    title_ids = spread(list(Title.objects.values_list('id', flat=True)))
+    reviews = spread(list(
+        Review.objects.filter(comments_count__gt=0)
+        .order_by('id').values_list('title_id', 'id')
+    ))
+    title_id, review_id = reviews[0]
+    comments = spread(list(
+        Comment.objects.filter(review_id=review_id)
+        .order_by('id').values_list('id', flat=True)
+    ))
+    usernames = spread(list(
+        User.objects.filter(role='user')
+        .exclude(username__startswith=WRITE_PREFIX)
+        .values_list('username', flat=True)
+    ))
+    category = Category.objects.order_by('id').values_list(
+        'slug', flat=True
+    ).first()
+    genres = list(Genre.objects.order_by('id').values_list(
+        'slug', flat=True
+    )[:2])
+    title = {
+        'name': 'Произведение нагрузочного теста', 'year': 2000,
+        'category': category, 'genre': genres,
+    }
+    names = [f'{WRITE_PREFIX}-new-{index}' for index in range(count)]
+    slugs = targets['slugs']
+    return [
+        Scenario('auth-signup', 'POST', [f'{api}/auth/signup/'], None, {
+            'username': f'{WRITE_PREFIX}-signup',
+            'email': f'{WRITE_PREFIX}-signup@yamdb.fake',
+        }),
+        Scenario('auth-token', 'POST', [f'{api}/auth/token/'], None, {
+            'username': f'{WRITE_PREFIX}-admin',
+            'confirmation_code': 'invalid',
+        }, HTTPStatus.BAD_REQUEST),
+        Scenario('users-create', 'POST', [f'{api}/users/'], token, bodies=[
+            {'username': name, 'email': f'{name}@yamdb.fake'}
+            for name in names
+        ]),
+        Scenario('users-partial-update', 'PATCH', [
+            f'{api}/users/{username}/' for username in usernames
+        ], token, {'bio': 'Нагрузочный тест.'}),
+        Scenario('users-me-update', 'PATCH', [f'{api}/users/me/'], token, {
+            'bio': 'Нагрузочный тест.',
+        }),
+        Scenario('users-delete', 'DELETE', [
+            f'{api}/users/{slug}/' for slug in slugs
+        ], token),
+        Scenario('categories-create', 'POST', [f'{api}/categories/'], token,
+                 bodies=[{'name': name, 'slug': name} for name in names]),
+        Scenario('categories-delete', 'DELETE', [
+            f'{api}/categories/{slug}/' for slug in slugs
+        ], token),
+        Scenario('genres-create', 'POST', [f'{api}/genres/'], token,
+                 bodies=[{'name': name, 'slug': name} for name in names]),
+        Scenario('genres-delete', 'DELETE', [
+            f'{api}/genres/{slug}/' for slug in slugs
+        ], token),
+        Scenario('titles-create', 'POST', [f'{api}/titles/'], token, title),
+        Scenario('titles-bulk', 'POST', [f'{api}/titles/bulk/'], token,
+                 [title] * BULK_SIZE),
+        Scenario('titles-partial-update', 'PATCH', [
+            f'{api}/titles/{pk}/' for pk in title_ids
+        ], token, {'description': 'Описание нагрузочного теста.'}),
+        Scenario('titles-delete', 'DELETE', [
+            f'{api}/titles/{pk}/' for pk in targets['titles']
+        ], token),
+        Scenario('reviews-create', 'POST', [
+            f'{api}/titles/{pk}/reviews/'
+            for pk in targets['new_review_titles']
+        ], token, {'text': 'Отзыв нагрузочного теста.', 'score': 7}),
+        Scenario('reviews-partial-update', 'PATCH', [
+            f'{api}/titles/{title}/reviews/{pk}/' for title, pk in reviews
+        ], token, {'text': 'Отзыв нагрузочного теста.'}),
+        Scenario('reviews-delete', 'DELETE', [
+            f'{api}/titles/{title}/reviews/{pk}/'
+            for title, pk in targets['reviews']
+        ], token),
+        Scenario('comments-create', 'POST', [
+            f'{api}/titles/{title_id}/reviews/{review_id}/comments/'
+        ], token, {'text': 'Комментарий нагрузочного теста.'}),
+        Scenario('comments-partial-update', 'PATCH', [
+            f'{api}/titles/{title_id}/reviews/{review_id}/comments/{pk}/'
+            for pk in comments
+        ], token, {'text': 'Комментарий нагрузочного теста.'}),
+        Scenario('comments-delete', 'DELETE', [
+            f'{api}/titles/{title}/reviews/{review}/comments/{pk}/'
+            for title, review, pk in targets['comments']
+        ], token),
+    ]
+
+
+def build_scenarios(token: str, writes: bool,
+                    count: int = PATH_VARIANTS) -> List[Scenario]:
+    """
+    Возвращает сценарии для всех эндпоинтов /api/v1/.
+
+    `count` - количество запросов к каждому эндпоинту с учетом
+    прогрева: столько объектов создается для сценариев `--writes`.
+    """
+    api = '/api/v1'
+    title_ids = spread(list(Title.objects.values_list('id', flat=True)))
+    reviews = spread(list(
+        Review.objects.filter(comments_count__gt=0)
+        .order_by('id').values_list('title_id', 'id')
+    ))
+    title_id, review_id = reviews[0]
+    offsets = [index * 10 for index in range(PATH_VARIANTS)]
+    usernames = spread(list(
+        User.objects.values_list('username', flat=True)
+    ))
+    scenarios = [
+        Scenario('api-root', 'GET', [f'{api}/']),
+        Scenario('titles-list', 'GET', [
+            f'{api}/titles/?offset={offset}' for offset in offsets
+        ]),
+        Scenario('titles-list-ordering', 'GET', [
+            f'{api}/titles/?ordering=-rating&offset={offset}'
+            for offset in offsets
+        ]),
+        Scenario('titles-list-fields', 'GET', [
+            f'{api}/titles/?fields=id,name&offset={offset}'
+            for offset in offsets
+        ]),
+        Scenario('titles-detail', 'GET', [
+            f'{api}/titles/{pk}/' for pk in title_ids
+        ]),
+        Scenario('titles-batch', 'GET', [
+            f'{api}/titles/?ids={",".join(map(str, title_ids[:20]))}'
+        ]),
+        Scenario('titles-top', 'GET', [f'{api}/titles/top/'] + [
+            f'{api}/titles/top/?genre={genre}'
+            for genre in Genre.objects.values_list('slug', flat=True)
+        ]),
+        Scenario('titles-export', 'GET', [f'{api}/titles/export/'], token),
+        Scenario('categories-list', 'GET', [f'{api}/categories/']),
+        Scenario('genres-list', 'GET', [f'{api}/genres/']),
+        Scenario('reviews-list', 'GET', [
+            f'{api}/titles/{title}/reviews/' for title, _ in reviews
+        ]),
+        Scenario('reviews-detail', 'GET', [
+            f'{api}/titles/{title}/reviews/{pk}/' for title, pk in reviews
+        ]),
+        Scenario('comments-list', 'GET', [
+            f'{api}/titles/{title}/reviews/{pk}/comments/'
+            for title, pk in reviews
+        ]),
+        Scenario('comments-detail', 'GET', [
+            f'{api}/titles/{title_id}/reviews/{review_id}/comments/{pk}/'
+            for pk in Comment.objects.filter(review_id=review_id)
+            .order_by('id').values_list('id', flat=True)[:PATH_VARIANTS]
+        ]),
+        Scenario('users-list', 'GET', [
+            f'{api}/users/?offset={offset}' for offset in offsets
+        ], token),
+        Scenario('users-detail', 'GET', [
+            f'{api}/users/{username}/' for username in usernames
+        ], token),
+        Scenario('users-batch', 'GET', [
+            f'{api}/users/?usernames={",".join(spread(usernames, 20))}'
+        ], token),
+        Scenario('users-me', 'GET', [f'{api}/users/me/'], token),
+        Scenario('suggest', 'GET', [
+            f'{api}/suggest/?q={quote(prefix)}'
+            for prefix in ('Тих', 'Последний г', 'Драм', 'Фил')
+        ]),
+        Scenario('cache-stats', 'GET', [f'{api}/cache/stats/'], token),
+        Scenario('profiles-list', 'GET', [f'{api}/profiles/'], token),
+    ]
+    if writes:
+        scenarios += build_write_scenarios(token, count)
+    return scenarios
+
+
+def send(port: int, scenario: Scenario, index: int) -> Tuple[float, int]:
+    """Выполняет запрос и возвращает время ответа в мс и статус."""
+    headers = {'Accept': '*/*'}
+    if scenario.token:
+        headers['Authorization'] = f'Bearer {scenario.token}'
+    body = scenario.body
+    if scenario.bodies:
+        body = scenario.bodies[index % len(scenario.bodies)]
+    if body is not None:
+        body = json.dumps(body)
+        headers['Content-Type'] = 'application/json'
+    path = scenario.paths[index % len(scenario.paths)]
+    client = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    started = time.perf_counter()
+    try:
+        client.request(scenario.method, path, body, headers)
+        response = client.getresponse()
+        response.read()
+        status = response.status
+    except OSError:
+        status = 0
+    finally:
+        client.close()
+    return (time.perf_counter() - started) * 1000, status
+
+
+def get_query_totals() -> Tuple[float, float]:
+    """Возвращает сумму и количество наблюдений метрики SQL-запросов."""
+    total = count = 0.0
+    for metric in REGISTRY.collect():
+        if metric.name != QUERIES_METRIC:
+            continue
+        for sample in metric.samples:
+            if sample.name == f'{QUERIES_METRIC}_sum':
+                total += sample.value
+            elif sample.name == f'{QUERIES_METRIC}_count':
+                count += sample.value
+    return total, count
+
+
+def percentile(quantiles: List[float], value: int) -> float:
+    return round(quantiles[value - 1], 3)
+
+
+def run_scenario(port: int, scenario: Scenario, args) -> dict:
+    """
+    Нагружает эндпоинт и возвращает статистику.
+
+    Прогрев и нагрузка используют разные индексы путей, поэтому
+    сценарии удаления не обращаются к одному объекту дважды.
+    """
+    concurrency = args.concurrency
+    if scenario.method != 'GET' and connection.vendor == 'sqlite':
+        concurrency = 1
+    for index in range(args.warmup):
+        send(port, scenario, index)
+    queries_before, observed_before = get_query_totals()
+    with ThreadPoolExecutor(concurrency) as executor:
+        started = time.perf_counter()
+        results = list(executor.map(
+            lambda index: send(port, scenario, index),
+            range(args.warmup, args.warmup + args.requests),
+        ))
+        elapsed = time.perf_counter() - started
+    queries, observed = get_query_totals()
+    timings = [timing for timing, _ in results]
+    quantiles = statistics.quantiles(timings, n=100, method='inclusive')
+    observed -= observed_before
+    return {
+        'method': scenario.method,
+        'path': scenario.paths[0],
+        'concurrency': concurrency,
+        'requests': len(results),
+        'errors': sum(
+            1 for _, status in results if scenario.is_error(status)
+        ),
+        'throughput_rps': round(len(results) / elapsed, 1),
+        'latency_ms': {
+            'p50': percentile(quantiles, 50),
+            'p95': percentile(quantiles, 95),
+            'p99': percentile(quantiles, 99),
+            'max': round(max(timings), 3),
+        },
+        'queries_per_request': (
+            round((queries - queries_before) / observed, 2)
+            if observed else None
+        ),
+    }
+
+
+def get_commit() -> Optional[str]:
+    """Возвращает текущий коммит, с пометкой о незакоммиченных изменениях."""
+    try:
+        commit = subprocess.run(
+            ('git', 'rev-parse', '--short', 'HEAD'),
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ('git', 'status', '--porcelain', '--untracked-files=no'),
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f'{commit}-dirty' if dirty else commit
+
+
+def ratio(current: float, baseline: float) -> Optional[float]:
+    return round(current / baseline, 3) if baseline else None
+
+
+def compare(report: dict, baseline: dict) -> dict:
+    """Возвращает отношения метрик отчета к метрикам базового отчета."""
+    result = {}
+    for name, current in report['endpoints'].items():
+        previous = baseline.get('endpoints', {}).get(name)
+        if previous is None:
+            continue
+        result[name] = {
+            **{
+                f'{key}_ratio': ratio(
+                    current['latency_ms'][key], previous['latency_ms'][key]
+                )
+                for key in ('p50', 'p95', 'p99')
+            },
+            'throughput_ratio': ratio(
+                current['throughput_rps'], previous['throughput_rps']
+            ),
+            'queries_per_request_delta': (
+                round(current['queries_per_request']
+                      - previous['queries_per_request'], 2)
+                if None not in (current['queries_per_request'],
+                                previous['queries_per_request'])
+                else None
+            ),
+        }
+    return result
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--scale', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=200,
+                        help='Количество запросов к каждому эндпоинту')
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--only', nargs='*',
+                        help='Имена сценариев, например titles-list')
+    parser.add_argument('--writes', action='store_true',
+                        help='Добавить сценарии, изменяющие данные')
+    parser.add_argument('--database', type=Path, help='Файл базы данных')
+    parser.add_argument('--keepdb', action='store_true',
+                        help='Использовать ранее загруженную базу данных')
+    parser.add_argument('--output', type=Path, help='Файл отчета')
+    parser.add_argument('--baseline', type=Path,
+                        help='Отчет для сравнения, например другого коммита')
+    args = parser.parse_args()
+    if args.database is None:
+        args.database = Path(tempfile.gettempdir()) / (
+            f'yamdb_bench_scale{args.scale}_seed{args.seed}.sqlite3'
+        )
+    return args
+
+
+def main() -> None:
+    args = parse_args()
+    setup_test_environment()
+    prepare_database(args)
+    scenarios = [
+        scenario for scenario in build_scenarios(
+            get_admin_token(), args.writes, args.warmup + args.requests
+        )
+        if not args.only or scenario.name in args.only
+    ]
+    dataset = get_dataset_sizes()
+    server = start_server()
+    port = server.server_address[1]
+    try:
+        endpoints = {
+            scenario.name: run_scenario(port, scenario, args)
+            for scenario in scenarios
+        }
+    finally:
+        server.shutdown()
+    report = {
+        'meta': {
+            'commit': get_commit(),
+            'scale': args.scale,
+            'seed': args.seed,
+            'concurrency': args.concurrency,
+            'requests': args.requests,
+            'dataset': dataset,
+            'excluded': EXCLUDED,
+        },
+        'endpoints': endpoints,
+    }
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+        report['comparison'] = {
+            'baseline_commit': baseline.get('meta', {}).get('commit'),
+            'endpoints': compare(report, baseline),
+        }
+    output = json.dumps(report, indent=2, ensure_ascii=False, sort_keys=True)
+    if args.output:
+        args.output.write_text(output + '\n', encoding='utf-8')
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+"""
+Сравнение чтения списков через сериализаторы и через быстрый путь.
+
+Скрипт создает тестовую базу данных, заполняет ее синтетическими
+данными и измеряет время ответов списков произведений, отзывов
+и комментариев при `FAST_READ_ENABLED=False` и `True`.
+
+Запуск из корня репозитория:
+    PYTHONPATH=api_yamdb python benchmarks/read_path.py --titles 2000
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+django.setup()
+
+from django.core.cache import cache  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import override_settings  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from api.v1.views import (CommentViewSet, ReviewViewSet,  # noqa: E402
+                          TitleViewSet)
+from reviews.models import (Category, Comment, Genre, Review,  # noqa: E402
+                            Title)
+from users.models import User  # noqa: E402
+
+
+def fill(titles: int, reviews: int, comments: int) -> None:
+    """Заполняет базу данных синтетическими данными."""
+    Category.objects.bulk_create(
+        Category(name=f'Категория {index}', slug=f'category-{index}')
+        for index in range(10)
+    )
+    Genre.objects.bulk_create(
+        Genre(name=f'Жанр {index}', slug=f'genre-{index}')
+        for index in range(20)
+    )
+    categories = list(Category.objects.order_by('id'))
+    genres = list(Genre.objects.order_by('id'))
+    Title.objects.bulk_create(
+        Title(
+            name=f'Произведение {index}',
+            year=1900 + index % 120,
+            description='Описание произведения. ' * 10,
+            category=categories[index % len(categories)],
+        )
+        for index in range(titles)
+    )
+    title_ids = list(Title.objects.values_list('id', flat=True))
+    Title.genre.through.objects.bulk_create(
+        Title.genre.through(
+            title_id=title_id, genre_id=genres[(title_id + shift) % 20].id
+        )
+        for title_id in title_ids
+        for shift in range(3)
+    )
+    User.objects.bulk_create(
+        User(username=f'user{index}', email=f'user{index}@yamdb.fake')
+        for index in range(reviews)
+    )
+    user_ids = list(User.objects.values_list('id', flat=True))
+    Review.objects.bulk_create(
+        Review(
+            title_id=title_ids[0],
+            author_id=user_id,
+            text='Текст отзыва. ' * 5,
+            score=1 + index % 10,
+        )
+        for index, user_id in enumerate(user_ids)
+    )
+    review_id = Review.objects.values_list('id', flat=True)[0]
+    Comment.objects.bulk_create(
+        Comment(
+            review_id=review_id,
+            author_id=user_ids[index % len(user_ids)],
+            text='Текст комментария. ' * 3,
+        )
+        for index in range(comments)
+    )
+    Title.objects.refresh_ratings()
+    Review.objects.refresh_comments_counts()
+
+
+def measure(view, path: str, kwargs: dict, repeat: int) -> dict:
+    """Возвращает время ответа в миллисекундах для обоих путей чтения."""
+    factory = APIRequestFactory()
+    result = {}
+    for fast_read in (False, True):
+        timings = []
+        with override_settings(FAST_READ_ENABLED=fast_read):
+            for _ in range(repeat):
+                cache.clear()
+                request = factory.get(path, {'limit': 100})
+                started = time.perf_counter()
+                response = view(request, **kwargs)
+                response.render()
+                timings.append((time.perf_counter() - started) * 1000)
+        result['fast' if fast_read else 'serializer'] = {
+            'median_ms': round(statistics.median(timings), 3),
+            'min_ms': round(min(timings), 3),
+        }
+    result['speedup'] = round(
+        result['serializer']['median_ms'] / result['fast']['median_ms'], 2
+    )
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--titles', type=int, default=2000)
+    parser.add_argument('--reviews', type=int, default=500)
+    parser.add_argument('--comments', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    fill(args.titles, args.reviews, args.comments)
+    title_id = Title.objects.filter(reviews__isnull=False).values_list(
+        'id', flat=True
+    )[0]
+    review_id = Review.objects.values_list('id', flat=True)[0]
+    list_action = {'get': 'list'}
+    report = {
+        'titles': measure(
+            TitleViewSet.as_view(list_action), '/api/v1/titles/', {},
+            args.repeat,
+        ),
+        'reviews': measure(
+            ReviewViewSet.as_view(list_action),
+            f'/api/v1/titles/{title_id}/reviews/',
+            {'title_id': title_id},
+            args.repeat,
+        ),
+        'comments': measure(
+            CommentViewSet.as_view(list_action),
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+            {'title_id': title_id, 'review_id': review_id},
+            args.repeat,
+        ),
+    }
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
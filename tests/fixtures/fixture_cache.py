@@ -0,0 +1,12 @@
+import pytest
+from django.core.cache import cache
+
+from api.v1.suggest import suggest_index
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    cache.clear()
+    suggest_index.reset()
+    yield
+    cache.clear()
@@ -297,6 +297,17 @@ class Test01UserAPI:
                 'некорректные данные.'
             )
 
+    def test_06_01_users_username_with_dot(self, admin_client,
+                                           django_user_model):
+        user = django_user_model.objects.create_user(
+            username='anna.petrova', email='anna.petrova@yamdb.fake'
+        )
+        response = admin_client.get(f'{self.USERS_URL}{user.username}/')
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос администратора к `{self.USERS_URL}'
+            '{username}/` находит пользователя с точкой в имени.'
+        )
+
     def test_06_users_username_get_not_admin(self, user_client,
                                              moderator_client, admin):
         for test_client in (user_client, moderator_client):
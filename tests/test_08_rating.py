@@ -0,0 +1,109 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Review, Title
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_rating(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('rating')
+
+    def test_01_rating_is_maintained(self, admin_client, user_client,
+                                     moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        user_review = create_single_review(
+            user_client, title_id, 'user review', 9
+        ).json()
+        create_single_review(moderator_client, title_id, 'moder review', 4)
+        assert self.get_rating(admin_client, title_id) == 6, (
+            'Проверьте, что при создании отзыва рейтинг произведения '
+            'пересчитывается как целая часть средней оценки.'
+        )
+
+        response = user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=user_review['id']
+            ),
+            data={'score': 2}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_rating(admin_client, title_id) == 3, (
+            'Проверьте, что при изменении оценки отзыва '
+            'рейтинг произведения пересчитывается.'
+        )
+
+        response = user_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=user_review['id']
+            )
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.reviews_count, title.rating) == (
+            4, 1, 4
+        ), (
+            'Проверьте, что при удалении отзыва сумма оценок, количество '
+            'отзывов и рейтинг произведения пересчитываются.'
+        )
+
+    def test_02_rating_after_author_cascade_delete(self, admin_client,
+                                                   user_client, user):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'user review', 7)
+        user.delete()
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.reviews_count, title.rating) == (
+            0, 0, None
+        ), (
+            'Проверьте, что при каскадном удалении автора отзыва '
+            'рейтинг произведения сбрасывается.'
+        )
+
+    def test_03_refresh_ratings(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'user review', 8)
+        Title.objects.update(rating_sum=0, reviews_count=0, rating=None)
+        Title.objects.refresh_ratings()
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.reviews_count, title.rating) == (
+            8, 1, 8
+        ), (
+            'Проверьте, что `Title.objects.refresh_ratings()` пересчитывает '
+            'рейтинг по таблице отзывов.'
+        )
+
+    def test_04_concurrent_score_updates(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        review_id = create_single_review(
+            user_client, title_id, 'user review', 5
+        ).json()['id']
+        first = Review.objects.get(pk=review_id)
+        second = Review.objects.get(pk=review_id)
+        first.score = 7
+        first.save()
+        second.score = 9
+        second.save()
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.reviews_count, title.rating) == (
+            9, 1, 9
+        ), (
+            'Проверьте, что при параллельном изменении отзыва разница '
+            'оценок считается от последней сохраненной оценки.'
+        )
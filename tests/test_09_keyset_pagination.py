@@ -0,0 +1,158 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+
+from reviews.models import Title
+from tests.utils import create_reviews, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09KeysetPagination:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def walk(self, client, url):
+        results = []
+        last_page = None
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что GET-запрос к `{url}` с курсором '
+                'возвращает ответ со статусом 200.'
+            )
+            last_page = response.json()
+            assert 'count' not in last_page, (
+                'Проверьте, что при пагинации по курсору `count` '
+                'не вычисляется.'
+            )
+            results.extend(last_page['results'])
+            url = last_page['next']
+        return results, last_page
+
+    def test_01_titles_cursor(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        results, last_page = self.walk(
+            client, f'{self.TITLES_URL}?cursor=&limit=1'
+        )
+        assert [title['name'] for title in results] == sorted(
+            title['name'] for title in titles
+        ), (
+            f'Проверьте, что пагинация по курсору `{self.TITLES_URL}` '
+            'обходит все произведения в порядке сортировки по названию.'
+        )
+
+        response = client.get(last_page['previous'])
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['results'] == results[:1], (
+            'Проверьте, что ссылка `previous` при пагинации по курсору '
+            'возвращает предыдущую страницу.'
+        )
+
+        response = client.get(f'{self.TITLES_URL}?limit=1&offset=1')
+        data = response.json()
+        assert data['count'] == len(titles) and data['results'] == [
+            results[1]
+        ], (
+            'Проверьте, что пагинация limit/offset по-прежнему работает.'
+        )
+
+    def test_02_reviews_cursor(self, client, admin_client, admin, user_client,
+                               user, moderator_client, moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        results, _ = self.walk(client, f'{url}?cursor=&limit=2')
+        assert sorted(review['id'] for review in results) == sorted(
+            review['id'] for review in reviews
+        ), (
+            f'Проверьте, что пагинация по курсору `{url}` '
+            'возвращает все отзывы без повторов.'
+        )
+
+    def test_03_invalid_cursor(self, client):
+        response = client.get(f'{self.TITLES_URL}?cursor=broken')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что для некорректного или неподписанного курсора '
+            'возвращается ответ со статусом 404.'
+        )
+
+    def test_04_cursor_is_stable(self, client, admin_client, monkeypatch):
+        create_titles(admin_client)
+        url = f'{self.TITLES_URL}?cursor=&limit=1'
+        first = client.get(url).json()['next']
+        monkeypatch.setattr('time.time', lambda: 4102444800.0)
+        assert client.get(url).json()['next'] == first, (
+            'Проверьте, что курсор не зависит от времени запроса: '
+            'иначе ответы и ETag страниц меняются каждую секунду.'
+        )
+
+    def create_rated_titles(self, admin_client):
+        create_titles(admin_client)
+        category_id = Title.objects.values_list(
+            'category_id', flat=True
+        ).first()
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {rating}', year=2000 + number,
+                  category_id=category_id, rating=rating)
+            for number, rating in enumerate((7, None, 3, 7, 9))
+        )
+        return list(Title.objects.values_list('id', 'rating'))
+
+    def test_05_nullable_ordering(self, client, admin_client):
+        titles = self.create_rated_titles(admin_client)
+        expected = [
+            pk for pk, _ in sorted(
+                titles,
+                key=lambda title: (title[1] is None, -(title[1] or 0),
+                                   title[0]),
+            )
+        ]
+        results, last_page = self.walk(
+            client, f'{self.TITLES_URL}?ordering=-rating&cursor=&limit=2'
+        )
+        assert [title['id'] for title in results] == expected, (
+            'Проверьте, что пагинация по курсору учитывает сортировку '
+            'по полю с NULL: пустые значения идут в конце.'
+        )
+        response = client.get(last_page['previous'])
+        assert [
+            title['id'] for title in response.json()['results']
+        ] == expected[-3:-1], (
+            'Проверьте, что ссылка `previous` учитывает NULL '
+            'в ключе сортировки.'
+        )
+
+        ratings = [
+            (title['rating'], title['id']) for title in client.get(
+                self.TITLES_URL, {'ordering': 'rating', 'limit': 10}
+            ).json()['results']
+        ]
+        for previous, current in zip(ratings, ratings[1:]):
+            if previous[0] == current[0]:
+                assert previous[1] < current[1], (
+                    'Проверьте, что при сортировке по `ordering` '
+                    'равные значения упорядочены по `id`.'
+                )
+
+    def test_06_sparse_fields_keep_ordering(self, client, admin_client):
+        titles = self.create_rated_titles(admin_client)
+        for fast_read in (True, False):
+            cache.clear()
+            with override_settings(FAST_READ_ENABLED=fast_read):
+                results, _ = self.walk(
+                    client, f'{self.TITLES_URL}?fields=id,name'
+                    '&ordering=-year&cursor=&limit=2'
+                )
+            assert [title['id'] for title in results] == list(
+                Title.objects.order_by('-year').values_list('id', flat=True)
+            ) and len(results) == len(titles), (
+                'Проверьте, что при выборе полей `fields` пагинация '
+                'по курсору учитывает сортировку `ordering`.'
+            )
@@ -0,0 +1,71 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Review
+from tests.utils import create_comments, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10PaginationCount:
+
+    TITLES_URL = '/api/v1/titles/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_count_false(self, client, admin_client):
+        create_titles(admin_client)
+        response = client.get(f'{self.TITLES_URL}?limit=1&count=false')
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert data['count'] is None, (
+            'Проверьте, что при `count=false` подсчет объектов '
+            'не выполняется и `count` равен None.'
+        )
+        assert data['next'] and len(data['results']) == 1, (
+            'Проверьте, что ссылка `next` формируется без подсчета объектов.'
+        )
+        response = client.get(data['next'])
+        assert response.json()['next'] is None, (
+            'Проверьте, что на последней странице ссылка `next` отсутствует.'
+        )
+
+    def test_02_count_cached(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get(f'{self.TITLES_URL}?limit=1&count=cached')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['count'] == len(titles), (
+            'Проверьте, что при `count=cached` возвращается '
+            'количество объектов.'
+        )
+
+    def test_03_nested_count_from_counter(self, client, admin_client, admin,
+                                          user_client, user,
+                                          moderator_client, moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        review = Review.objects.get(pk=reviews[0]['id'])
+        assert review.comments_count == len(comments), (
+            'Проверьте, что счетчик комментариев отзыва обновляется '
+            'при создании комментариев.'
+        )
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        response = client.get(f'{url}?limit=1')
+        assert response.json()['count'] == len(comments), (
+            f'Проверьте, что `count` для `{self.COMMENTS_URL_TEMPLATE}` '
+            'берется из счетчика комментариев отзыва.'
+        )
+
+        admin_client.delete(f'{url}{comments[0]["id"]}/')
+        review.refresh_from_db()
+        assert review.comments_count == len(comments) - 1, (
+            'Проверьте, что счетчик комментариев отзыва обновляется '
+            'при удалении комментария.'
+        )
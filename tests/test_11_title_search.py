@@ -0,0 +1,53 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Title
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def search(self, client, query):
+        response = client.get(self.TITLES_URL, {'search': query})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}` с параметром '
+            '`search` возвращает ответ со статусом 200.'
+        )
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search_is_case_insensitive_for_cyrillic(self, client,
+                                                        admin_client):
+        create_titles(admin_client)
+        assert self.search(client, 'КРЕПКИЙ орешек') == ['Крепкий орешек'], (
+            'Проверьте, что поиск по названию произведения '
+            'не зависит от регистра кириллических символов.'
+        )
+        assert self.search(client, 'термин') == ['Терминатор'], (
+            'Проверьте, что последнее слово поискового запроса '
+            'ищется по префиксу.'
+        )
+        assert self.search(client, '"*') == [], (
+            'Проверьте, что запрос без слов не находит произведений.'
+        )
+
+    def test_02_search_index_follows_changes(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        Title.objects.filter(pk=titles[0]['id']).update(
+            name='Побег из Шоушенка'
+        )
+        assert self.search(client, 'шоушенка') == ['Побег из Шоушенка'], (
+            'Проверьте, что индекс поиска обновляется '
+            'при изменении названия произведения.'
+        )
+        assert self.search(client, 'Терминатор') == [], (
+            'Проверьте, что старое название удаляется из индекса поиска.'
+        )
+        Title.objects.filter(pk=titles[0]['id']).delete()
+        assert self.search(client, 'шоушенка') == [], (
+            'Проверьте, что индекс поиска обновляется '
+            'при удалении произведения.'
+        )
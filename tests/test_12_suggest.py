@@ -0,0 +1,103 @@
+from http import HTTPStatus
+
+import pytest
+
+from api.v1.suggest import RadixTrie, suggest_index
+from reviews.models import Title
+from tests.utils import create_titles
+
+
+class Test12RadixTrie:
+
+    def test_01_insert_search_remove(self):
+        trie = RadixTrie()
+        words = ('драма', 'дракон', 'драконы', 'детектив')
+        for pk, word in enumerate(words):
+            trie.insert(word, pk, {'name': word})
+        assert [item['name'] for item in trie.search('дра', 10)] == [
+            'дракон', 'драконы', 'драма'
+        ], (
+            'Проверьте, что поиск по префиксу возвращает ключи '
+            'в лексикографическом порядке.'
+        )
+        assert len(trie.search('д', 2)) == 2, (
+            'Проверьте, что количество подсказок ограничивается `limit`.'
+        )
+        trie.remove('дракон', 1)
+        assert [item['name'] for item in trie.search('драк', 10)] == [
+            'драконы'
+        ], 'Проверьте удаление ключа из префиксного дерева.'
+        assert trie.search('драконы', 10) == [{'name': 'драконы'}]
+        assert trie.search('х', 10) == []
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12SuggestAPI:
+
+    SUGGEST_URL = '/api/v1/suggest/'
+
+    def test_01_suggest(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        response = client.get(self.SUGGEST_URL, {'q': 'КРЕП'})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.SUGGEST_URL}` '
+            'возвращает ответ со статусом 200.'
+        )
+        data = response.json()
+        assert data['titles'] == [
+            {'id': titles[1]['id'], 'name': titles[1]['name']}
+        ], (
+            'Проверьте, что подсказки не зависят от регистра и содержат '
+            '`id` и `name` произведения.'
+        )
+
+        admin_client.post(
+            '/api/v1/genres/', data={'name': 'Криминал', 'slug': 'crime'}
+        )
+        data = client.get(self.SUGGEST_URL, {'q': 'к'}).json()
+        assert data['genres'] == [
+            {'name': 'Комедия', 'slug': 'comedy'},
+            {'name': 'Криминал', 'slug': 'crime'},
+        ], 'Проверьте, что индекс подсказок обновляется при создании жанра.'
+        assert data['categories'] == [categories[1]]
+
+        admin_client.delete(f'/api/v1/genres/{genres[1]["slug"]}/')
+        data = client.get(self.SUGGEST_URL, {'q': 'к'}).json()
+        assert data['genres'] == [{'name': 'Криминал', 'slug': 'crime'}], (
+            'Проверьте, что индекс подсказок обновляется при удалении жанра.'
+        )
+
+    def test_02_background_rebuild(self, client, admin_client):
+        create_titles(admin_client)
+        client.get(self.SUGGEST_URL, {'q': 'а'})
+        Title.objects.bulk_create([Title(name='Амадей', year=1984)])
+        suggest_index.expire()
+
+        data = client.get(self.SUGGEST_URL, {'q': 'амад'}).json()
+        assert data['titles'] == [], (
+            'Проверьте, что устаревший индекс обслуживает запросы, '
+            'пока новый индекс строится в фоновом потоке.'
+        )
+        suggest_index.rebuild_thread.join(timeout=10)
+        data = client.get(self.SUGGEST_URL, {'q': 'амад'}).json()
+        assert [item['name'] for item in data['titles']] == ['Амадей'], (
+            'Проверьте, что после перестроения индекс содержит '
+            'данные из базы данных.'
+        )
+
+    def test_03_changes_during_rebuild(self, admin_client, monkeypatch):
+        titles, _, _ = create_titles(admin_client)
+        removed = Title.objects.get(pk=titles[1]['id'])
+        load = suggest_index.load
+
+        def load_and_remove():
+            result = load()
+            suggest_index.remove(Title, removed.pk)
+            return result
+
+        monkeypatch.setattr(suggest_index, 'load', load_and_remove)
+        suggest_index.build()
+        assert suggest_index.suggest(removed.name, 10)['titles'] == [], (
+            'Проверьте, что изменения, сделанные во время перестроения '
+            'индекса, применяются к новому индексу.'
+        )
@@ -0,0 +1,78 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import transaction
+
+from api.v1.cache import get_catalog_version
+from reviews.models import Genre
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13ResponseCache:
+
+    TITLES_URL = '/api/v1/titles/'
+    GENRES_URL = '/api/v1/genres/'
+    CACHE_STATS_URL = '/api/v1/cache/stats/'
+
+    def test_01_cache_hit_and_invalidation(self, client, admin_client,
+                                           user_client,
+                                           django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        first = client.get(self.TITLES_URL)
+        assert first.status_code == HTTPStatus.OK
+        with django_assert_num_queries(1):
+            second = client.get(self.TITLES_URL)
+        assert second.json() == first.json(), (
+            f'Проверьте, что повторный GET-запрос к `{self.TITLES_URL}` '
+            'возвращается из кеша, а к базе данных выполняется только '
+            'запрос версий.'
+        )
+
+        create_single_review(user_client, titles[0]['id'], 'text', 8)
+        results = client.get(self.TITLES_URL).json()['results']
+        ratings = {title['id']: title['rating'] for title in results}
+        assert ratings[titles[0]['id']] == 8, (
+            'Проверьте, что создание отзыва делает кеш каталога '
+            'недействительным.'
+        )
+
+        client.get(self.GENRES_URL)
+        admin_client.patch(
+            f'{self.TITLES_URL}{titles[0]["id"]}/',
+            data={'genre': ['drama']}
+        )
+        detail = client.get(f'{self.TITLES_URL}{titles[0]["id"]}/').json()
+        assert [genre['slug'] for genre in detail['genre']] == ['drama'], (
+            'Проверьте, что изменение жанров произведения делает кеш '
+            'каталога недействительным.'
+        )
+
+    def test_02_cache_stats(self, client, admin_client, user_client):
+        client.get(self.TITLES_URL)
+        client.get(self.TITLES_URL)
+        response = user_client.get(self.CACHE_STATS_URL)
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            f'Проверьте, что `{self.CACHE_STATS_URL}` доступен только админу.'
+        )
+        response = admin_client.get(self.CACHE_STATS_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['TitleViewSet.list'] == {
+            'hits': 1, 'misses': 1
+        }, (
+            'Проверьте, что счетчики попаданий и промахов кеша '
+            'учитываются для каждого эндпоинта.'
+        )
+
+    def test_03_invalidation_after_commit(self):
+        version = get_catalog_version()
+        with transaction.atomic():
+            Genre.objects.create(name='Драма', slug='drama')
+            assert get_catalog_version() == version, (
+                'Проверьте, что версия каталога увеличивается только '
+                'после фиксации транзакции.'
+            )
+        assert get_catalog_version() != version, (
+            'Проверьте, что сохранение жанра делает кеш каталога '
+            'недействительным.'
+        )
@@ -0,0 +1,135 @@
+from http import HTTPStatus
+
+import pytest
+from django.db.models import F
+
+from api.v1.cache import CATALOG_VERSION_KEY
+from reviews.models import ResourceVersion
+from tests.utils import (create_comments, create_single_comment,
+                         create_single_review, create_titles)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14ConditionalGet:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def check_not_modified(self, client, url, django_assert_max_num_queries,
+                           max_queries):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        etag = response.get('ETag')
+        assert etag, (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит ETag.'
+        )
+        with django_assert_max_num_queries(max_queries):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с совпадающим '
+            'If-None-Match возвращает ответ со статусом 304.'
+        )
+        assert not response.content
+        return etag
+
+    def test_01_titles(self, client, admin_client, user_client,
+                       django_assert_max_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        etag = self.check_not_modified(
+            client, self.TITLES_URL, django_assert_max_num_queries, 1
+        )
+        create_single_review(user_client, titles[0]['id'], 'text', 5)
+        response = client.get(self.TITLES_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после изменения каталога ETag меняется.'
+        )
+
+    def test_02_reviews_and_comments(self, client, admin_client, admin,
+                                     user_client, user,
+                                     django_assert_max_num_queries):
+        author_map = {admin: admin_client, user: user_client}
+        _, reviews, titles = create_comments(admin_client, author_map)
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        etag = self.check_not_modified(
+            client, reviews_url, django_assert_max_num_queries, 1
+        )
+        user_client.patch(
+            f'{reviews_url}{reviews[1]["id"]}/', data={'text': 'new text'}
+        )
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение отзыва меняет ETag списка отзывов.'
+        )
+
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        etag = self.check_not_modified(
+            client, comments_url, django_assert_max_num_queries, 1
+        )
+        create_single_comment(
+            user_client, titles[0]['id'], reviews[0]['id'], 'new comment'
+        )
+        response = client.get(comments_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что новый комментарий меняет ETag списка комментариев.'
+        )
+
+    def test_03_version_shared_between_processes(self, client, admin_client):
+        create_titles(admin_client)
+        etag = client.get(self.TITLES_URL)['ETag']
+        ResourceVersion.objects.filter(name=CATALOG_VERSION_KEY).update(
+            value=F('value') + 1
+        )
+        response = client.get(self.TITLES_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что версия каталога хранится в базе данных, '
+            'а не в кеше процесса: изменение, сделанное другим '
+            'процессом, должно менять ETag.'
+        )
+
+    def test_04_author_rename(self, client, admin_client, admin, user_client,
+                              user):
+        author_map = {admin: admin_client, user: user_client}
+        _, reviews, titles = create_comments(admin_client, author_map)
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        etags = {url: client.get(url)['ETag']
+                 for url in (reviews_url, comments_url)}
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'username': 'renamed'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        for url, etag in etags.items():
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.OK, (
+                'Проверьте, что смена имени автора меняет ETag списков '
+                f'отзывов и комментариев: `{url}`.'
+            )
+            assert 'renamed' in response.content.decode()
+
+    def test_05_wildcard_if_none_match(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get(
+            f'{self.TITLES_URL}99999/', HTTP_IF_NONE_MATCH='*'
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что GET-запрос к несуществующему произведению '
+            'с `If-None-Match: *` возвращает ответ со статусом 404.'
+        )
+        response = client.get(
+            f'{self.TITLES_URL}{titles[0]["id"]}/', HTTP_IF_NONE_MATCH='*'
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что GET-запрос к существующему произведению '
+            'с `If-None-Match: *` возвращает ответ со статусом 304.'
+        )
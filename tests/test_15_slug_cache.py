@@ -0,0 +1,85 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.relations import SlugRelatedField
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15SlugCache:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_slugs_resolved_from_cache(self, admin_client):
+        _, categories, genres = create_titles(admin_client)
+        data = {
+            'name': 'Чужой',
+            'year': 1979,
+            'genre': [genres[0]['slug'], genres[2]['slug']],
+            'category': categories[0]['slug'],
+        }
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(self.TITLES_URL, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+        lookups = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and ('"slug" =' in query['sql'] or '"slug" IN' in query['sql'])
+        ]
+        assert not lookups, (
+            'Проверьте, что slug жанров и категорий разрешаются '
+            'из кеша без отдельных запросов к базе данных.'
+        )
+
+    def test_02_cache_follows_changes(self, admin_client):
+        _, categories, _ = create_titles(admin_client)
+        data = {
+            'name': 'Чужой',
+            'year': 1979,
+            'genre': ['sci-fi'],
+            'category': categories[0]['slug'],
+        }
+        response = admin_client.post(self.TITLES_URL, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        message = SlugRelatedField.default_error_messages['does_not_exist']
+        assert response.json()['genre'] == [
+            str(message).format(slug_name='slug', value='sci-fi')
+        ], (
+            'Проверьте, что сообщение об ошибке для несуществующего slug '
+            'не изменилось.'
+        )
+        admin_client.post(
+            '/api/v1/genres/', data={'name': 'Фантастика', 'slug': 'sci-fi'}
+        )
+        response = admin_client.post(self.TITLES_URL, data=data)
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что кеш slug обновляется при создании жанра.'
+        )
+        assert response.json()['genre'] == [
+            {'name': 'Фантастика', 'slug': 'sci-fi'}
+        ]
+
+    def test_03_missing_slug_does_not_reload(self, admin_client):
+        _, categories, _ = create_titles(admin_client)
+        data = {
+            'name': 'Чужой',
+            'year': 1979,
+            'genre': ['sci-fi'],
+            'category': categories[0]['slug'],
+        }
+        admin_client.post(self.TITLES_URL, data=data)
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(self.TITLES_URL, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        reloads = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "reviews_genre"' in query['sql']
+        ]
+        assert not reloads, (
+            'Проверьте, что несуществующий slug не перечитывает '
+            'справочник, пока его версия не изменилась.'
+        )
@@ -0,0 +1,163 @@
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.v1.cache import CATALOG_VERSION_KEY, get_version
+from api.v1.serializers import TitleBulkListSerializer, genre_slug_cache
+from api.v1.suggest import suggest_index
+from reviews.models import Title
+from reviews.signals import titles_bulk_created
+from tests.utils import create_categories, create_genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16TitleBulkCreate:
+
+    BULK_URL = '/api/v1/titles/bulk/'
+
+    def get_payload(self, admin_client):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        return [
+            {
+                'name': 'Чужой',
+                'year': 1979,
+                'genre': [genres[0]['slug'], genres[2]['slug']],
+                'category': categories[0]['slug'],
+            },
+            {
+                'name': 'Невалидный год',
+                'year': 'дветыщи',
+                'genre': [genres[1]['slug']],
+                'category': categories[0]['slug'],
+            },
+            {
+                'name': 'Мастер и Маргарита',
+                'year': 1967,
+                'genre': [genres[2]['slug']],
+                'category': categories[1]['slug'],
+                'description': 'Рукописи не горят.',
+            },
+        ]
+
+    def test_01_bulk_create_with_errors(self, admin_client, user_client):
+        payload = self.get_payload(admin_client)
+        response = user_client.post(self.BULK_URL, payload, format='json')
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            f'Проверьте, что `{self.BULK_URL}` доступен только админу.'
+        )
+
+        response = admin_client.post(self.BULK_URL, payload, format='json')
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос администратора к `{self.BULK_URL}` '
+            'создает корректные произведения и возвращает статус 201.'
+        )
+        data = response.json()
+        assert [title['name'] for title in data['created']] == [
+            'Чужой', 'Мастер и Маргарита'
+        ]
+        assert sorted(
+            genre['slug'] for genre in data['created'][0]['genre']
+        ) == ['drama', 'horror'], (
+            'Проверьте, что жанры созданных произведений сохраняются.'
+        )
+        assert [error['index'] for error in data['errors']] == [1], (
+            'Проверьте, что ошибки возвращаются с индексом объекта.'
+        )
+        assert 'year' in data['errors'][0]['errors']
+        assert Title.objects.count() == 2
+
+    def test_02_bulk_create_atomic(self, admin_client):
+        payload = self.get_payload(admin_client)
+        response = admin_client.post(
+            f'{self.BULK_URL}?atomic=true', payload, format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что с параметром `atomic=true` при ошибке '
+            'возвращается ответ со статусом 400.'
+        )
+        assert Title.objects.count() == 0, (
+            'Проверьте, что с параметром `atomic=true` при ошибке '
+            'произведения не создаются.'
+        )
+
+    def test_03_bulk_create_limits(self, admin_client):
+        payload = self.get_payload(admin_client)[:1]
+        response = admin_client.post(
+            self.BULK_URL,
+            payload * (settings.TITLE_BULK_MAX_SIZE + 1),
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что количество произведений в запросе ограничено.'
+        )
+        response = admin_client.post(self.BULK_URL, {}, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_04_bulk_create_keeps_unrelated_caches(self, admin_client):
+        payload = self.get_payload(admin_client)
+        suggest_index.suggest('а', 1)
+        genre_version = get_version(genre_slug_cache.version_key)
+        catalog_version = get_version(CATALOG_VERSION_KEY)
+        admin_client.post(self.BULK_URL, payload, format='json')
+        assert get_version(genre_slug_cache.version_key) == genre_version, (
+            'Проверьте, что массовое создание произведений не сбрасывает '
+            'кеш slug жанров.'
+        )
+        assert get_version(CATALOG_VERSION_KEY) != catalog_version
+        assert suggest_index.expires_at is not None, (
+            'Проверьте, что массовое создание произведений не сбрасывает '
+            'индекс подсказок.'
+        )
+        assert suggest_index.suggest('чуж', 10)['titles'], (
+            'Проверьте, что созданные произведения добавляются '
+            'в индекс подсказок.'
+        )
+
+        catalog_version = get_version(CATALOG_VERSION_KEY)
+        titles = Title.objects.bulk_create(
+            [Title(id=1000, name='Амадей', year=1984)]
+        )
+        titles_bulk_created.send(sender=TitleBulkListSerializer, titles=titles)
+        assert get_version(CATALOG_VERSION_KEY) != catalog_version, (
+            'Проверьте, что после bulk_create версия каталога увеличивается.'
+        )
+        assert suggest_index.suggest('амад', 10)['titles'], (
+            'Проверьте, что после bulk_create произведения добавляются '
+            'в индекс подсказок.'
+        )
+
+    def test_05_bulk_create_single_insert(self, admin_client):
+        payload = self.get_payload(admin_client)
+        Title.objects.create(name='Уже есть', year=2000)
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(
+                self.BULK_URL, payload, format='json'
+            )
+        assert response.status_code == HTTPStatus.CREATED
+        inserts = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('INSERT INTO "reviews_title"')
+        ]
+        assert len(inserts) == 1, (
+            'Проверьте, что произведения создаются одним bulk_create.'
+        )
+        created = response.json()['created']
+        titles = dict(Title.objects.values_list('id', 'name'))
+        assert {title['id']: title['name'] for title in created} == {
+            pk: name for pk, name in titles.items() if name != 'Уже есть'
+        }, (
+            'Проверьте, что в ответе возвращаются id созданных произведений.'
+        )
+        assert sorted(
+            genre['slug'] for genre in created[0]['genre']
+        ) == ['drama', 'horror'], (
+            'Проверьте, что жанры связываются с созданными произведениями.'
+        )
+        assert suggest_index.suggest('маст', 10)['titles'], (
+            'Проверьте, что созданные произведения добавляются '
+            'в индекс подсказок.'
+        )
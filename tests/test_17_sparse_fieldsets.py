@@ -0,0 +1,86 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17SparseFieldsets:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_titles_fields(self, client, admin_client):
+        create_titles(admin_client)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(
+                self.TITLES_URL, {'fields': 'id,name,rating'}
+            )
+        assert response.status_code == HTTPStatus.OK
+        for title in response.json()['results']:
+            assert set(title) == {'id', 'name', 'rating'}, (
+                f'Проверьте, что параметр `fields` в запросе к '
+                f'`{self.TITLES_URL}` ограничивает поля ответа.'
+            )
+        sql = ' '.join(query['sql'] for query in context.captured_queries)
+        assert 'description' not in sql, (
+            'Проверьте, что невыбранные поля не загружаются из базы данных.'
+        )
+        assert 'reviews_genre' not in sql and 'reviews_category' not in sql, (
+            'Проверьте, что жанры и категория не загружаются, '
+            'если соответствующие поля не выбраны.'
+        )
+
+    def test_02_titles_omit(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get(
+            f'{self.TITLES_URL}{titles[0]["id"]}/',
+            {'omit': 'description,genre'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert set(response.json()) == {
+            'id', 'name', 'year', 'category', 'rating'
+        }, (
+            'Проверьте, что параметр `omit` исключает поля из ответа.'
+        )
+        assert response.json()['category']['slug'] == titles[0]['category']
+
+        response = client.get(self.TITLES_URL, {'fields': 'name,secret'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что запрос неизвестных полей возвращает '
+            'ответ со статусом 400.'
+        )
+
+    def test_03_reviews_and_comments_fields(self, client, admin_client,
+                                            user, user_client, moderator,
+                                            moderator_client):
+        author_map = {user: user_client, moderator: moderator_client}
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        response = client.get(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id']),
+            {'fields': 'id,score'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert [
+            set(review) for review in response.json()['results']
+        ] == [{'id', 'score'}] * len(reviews), (
+            'Проверьте, что параметр `fields` работает для отзывов.'
+        )
+        response = client.get(
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=titles[0]['id'], review_id=reviews[0]['id']
+            ),
+            {'omit': 'text'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert [
+            set(comment) for comment in response.json()['results']
+        ] == [{'id', 'author', 'pub_date'}] * len(comments), (
+            'Проверьте, что параметр `omit` работает для комментариев.'
+        )
@@ -0,0 +1,68 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18FastRead:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def get_content(self, client, url, params, fast_read):
+        cache.clear()
+        with override_settings(FAST_READ_ENABLED=fast_read):
+            response = client.get(url, params)
+        assert response.status_code == HTTPStatus.OK
+        return response.content
+
+    def test_01_fast_read_matches_serializers(self, client, admin_client,
+                                              user, user_client, moderator,
+                                              moderator_client):
+        author_map = {user: user_client, moderator: moderator_client}
+        _, reviews, titles = create_comments(admin_client, author_map)
+        cases = [
+            (self.TITLES_URL, {}),
+            (self.TITLES_URL, {'limit': 1, 'cursor': ''}),
+            (self.TITLES_URL, {'fields': 'id,name,rating'}),
+            (self.TITLES_URL, {'omit': 'genre', 'search': 'терминатор'}),
+            (self.TITLES_URL, {'genre': 'drama'}),
+            (self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id']), {}),
+            (
+                self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id']),
+                {'limit': 1, 'cursor': ''}
+            ),
+            (
+                self.COMMENTS_URL_TEMPLATE.format(
+                    title_id=titles[0]['id'], review_id=reviews[0]['id']
+                ),
+                {'omit': 'text'}
+            ),
+        ]
+        for url, params in cases:
+            assert self.get_content(client, url, params, True) == (
+                self.get_content(client, url, params, False)
+            ), (
+                f'Проверьте, что ответ на GET-запрос к `{url}` с параметрами '
+                f'{params} при быстром чтении совпадает с ответом '
+                'сериализатора.'
+            )
+
+    def test_02_fast_read_queries(self, client, admin_client, user,
+                                  user_client, moderator, moderator_client,
+                                  django_assert_max_num_queries):
+        author_map = {user: user_client, moderator: moderator_client}
+        create_comments(admin_client, author_map)
+        with django_assert_max_num_queries(3):
+            response = client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что быстрое чтение списка произведений выполняет '
+            'запрос версий, запрос строк страницы и один запрос жанров.'
+        )
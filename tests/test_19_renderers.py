@@ -0,0 +1,104 @@
+import json
+from collections.abc import Iterator
+from datetime import datetime
+from decimal import Decimal
+from http import HTTPStatus
+
+import pytest
+from django.test import override_settings
+from rest_framework.renderers import JSONRenderer
+
+from api.v1.pagination import BaseLimitOffsetPagination
+from api.v1.renderers import FastJSONRenderer
+from tests.utils import create_titles
+
+
+class Test19Renderers:
+
+    DATA = {
+        'count': 2,
+        'next': None,
+        'results': [
+            {'name': 'Мастер и Маргарита', 'rating': Decimal('7.5')},
+            {
+                'name': 'Строка с разделителем',
+                'pub_date': datetime(2023, 1, 1, 12, 30, 15, 123456),
+                1: [True, None],
+            },
+        ],
+    }
+
+    def test_01_fast_renderer_matches_json_renderer(self):
+        assert FastJSONRenderer().render(self.DATA) == (
+            JSONRenderer().render(self.DATA)
+        ), (
+            'Проверьте, что `FastJSONRenderer` кодирует данные так же, '
+            'как `JSONRenderer`.'
+        )
+        assert FastJSONRenderer().render(
+            self.DATA, 'application/json; indent=4'
+        ) == JSONRenderer().render(
+            self.DATA, 'application/json; indent=4'
+        )
+
+    def test_02_render_stream(self):
+        renderer = FastJSONRenderer()
+        for chunk_size in (1, 2, 10):
+            chunks = list(renderer.render_stream(self.DATA, chunk_size))
+            assert b''.join(chunks) == renderer.render(self.DATA), (
+                'Проверьте, что склеенные части потокового ответа '
+                'совпадают с результатом `render()`.'
+            )
+        assert b''.join(
+            renderer.render_stream({'results': []}, 2)
+        ) == b'{"results":[]}'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_large_pages_are_streamed(self, client, admin_client):
+        create_titles(admin_client)
+        url = '/api/v1/titles/'
+        response = client.get(url, {'limit': 2})
+        assert not response.streaming
+        expected = client.get(url, {'limit': 3}).json()
+        with override_settings(STREAMING_RESPONSE_MIN_LIMIT=3):
+            response = client.get(url, {'limit': 3})
+            assert response.status_code == HTTPStatus.OK
+            assert response.streaming, (
+                f'Проверьте, что большие страницы `{url}` отдаются '
+                'потоком.'
+            )
+            assert json.loads(b''.join(response.streaming_content)) == (
+                expected
+            )
+            response = admin_client.get('/api/v1/users/', {'limit': 3})
+            assert response.streaming, (
+                'Проверьте, что большие страницы `/api/v1/users/` '
+                'отдаются потоком.'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_streamed_pages_are_read_lazily(self, client, admin_client,
+                                               monkeypatch):
+        create_titles(admin_client)
+        url = '/api/v1/titles/'
+        params = {'limit': 2, 'fields': 'id,name,genre'}
+        for fast_read in (True, False):
+            with override_settings(FAST_READ_ENABLED=fast_read):
+                expected = client.get(url, params).json()
+                with override_settings(STREAMING_RESPONSE_MIN_LIMIT=2,
+                                       STREAMING_RESPONSE_CHUNK_SIZE=1):
+                    response = client.get(url, params)
+                    assert response.streaming
+                    assert isinstance(response.streaming_content, Iterator)
+                    assert json.loads(
+                        b''.join(response.streaming_content)
+                    ) == expected, (
+                        'Проверьте, что страница, прочитанная из БД '
+                        'по частям, совпадает с обычным ответом.'
+                    )
+
+        monkeypatch.setattr(BaseLimitOffsetPagination, 'max_limit', 1)
+        data = client.get(url, {'limit': 1000}).json()
+        assert len(data['results']) == 1 and 'limit=1' in data['next'], (
+            'Проверьте, что `limit` ограничен настройкой `MAX_PAGE_SIZE`.'
+        )
@@ -0,0 +1,70 @@
+import csv
+import io
+import json
+from http import HTTPStatus
+
+import pytest
+from django.test import override_settings
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20CatalogExport:
+
+    EXPORT_URL = '/api/v1/titles/export/'
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_export_permissions(self, client, user_client, admin_client):
+        create_titles(admin_client)
+        for unauthorized in (client, user_client):
+            response = unauthorized.get(self.EXPORT_URL)
+            assert response.status_code in (
+                HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN
+            ), (
+                f'Проверьте, что `{self.EXPORT_URL}` недоступен '
+                'без прав администратора или токена выгрузки.'
+            )
+        with override_settings(CATALOG_EXPORT_TOKEN='partner-token'):
+            response = client.get(
+                self.EXPORT_URL, HTTP_X_EXPORT_TOKEN='wrong-token'
+            )
+            assert response.status_code == HTTPStatus.UNAUTHORIZED
+            response = client.get(
+                self.EXPORT_URL, HTTP_X_EXPORT_TOKEN='partner-token'
+            )
+            assert response.status_code == HTTPStatus.OK, (
+                'Проверьте, что выгрузка доступна по токену из настройки '
+                '`CATALOG_EXPORT_TOKEN`.'
+            )
+
+    def test_02_export_ndjson(self, admin_client):
+        create_titles(admin_client)
+        expected = admin_client.get(self.TITLES_URL).json()['results']
+        with override_settings(CATALOG_EXPORT_CHUNK_SIZE=1):
+            response = admin_client.get(self.EXPORT_URL, {'format': 'ndjson'})
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming, (
+            f'Проверьте, что `{self.EXPORT_URL}` отдает данные потоком.'
+        )
+        assert response['Content-Type'] == 'application/x-ndjson'
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        assert [json.loads(line) for line in lines] == expected, (
+            'Проверьте, что выгрузка NDJSON содержит все произведения '
+            'с жанрами, категорией и рейтингом.'
+        )
+
+    def test_03_export_csv_with_filter(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = admin_client.get(
+            self.EXPORT_URL, {'format': 'csv', 'genre': 'drama'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'] == 'text/csv; charset=utf-8'
+        content = b''.join(response.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+        assert [row['name'] for row in rows] == [titles[1]['name']], (
+            'Проверьте, что выгрузка учитывает фильтры списка произведений.'
+        )
+        assert rows[0]['genre'] == 'drama'
+        assert rows[0]['category'] == titles[1]['category']
@@ -0,0 +1,99 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+
+from api.v1.cache import get_version
+from api.v1.leaderboard import (LEADERBOARD_SCORES_KEY,
+                                LEADERBOARD_VERSION_KEY, get_facet_key)
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21TitleOrderingTop:
+
+    TITLES_URL = '/api/v1/titles/'
+    TOP_URL = '/api/v1/titles/top/'
+
+    def names(self, response):
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        results = data['results'] if isinstance(data, dict) else data
+        return [title['name'] for title in results]
+
+    def test_01_ordering(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[1]['id'], 'text', 9)
+        names = [title['name'] for title in titles]
+        assert self.names(
+            client.get(self.TITLES_URL, {'ordering': '-year'})
+        ) == names[::-1], (
+            'Проверьте, что список произведений сортируется '
+            'параметром `ordering`.'
+        )
+        assert self.names(
+            client.get(self.TITLES_URL, {'ordering': '-rating'})
+        )[0] == titles[1]['name']
+        response = client.get(
+            self.TITLES_URL, {'ordering': 'year', 'cursor': '', 'limit': 1}
+        )
+        assert self.names(response) == names[:1]
+        assert self.names(client.get(response.json()['next'])) == (
+            names[1:]
+        ), (
+            'Проверьте, что пагинация по курсору учитывает '
+            'параметр `ordering`.'
+        )
+
+    def test_02_top(self, client, admin_client, user_client,
+                    moderator_client, django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles
+        create_single_review(user_client, first['id'], 'text', 5)
+        create_single_review(user_client, second['id'], 'text', 7)
+        assert self.names(client.get(self.TOP_URL)) == [
+            second['name'], first['name']
+        ], (
+            f'Проверьте, что `{self.TOP_URL}` возвращает произведения '
+            'по убыванию рейтинга.'
+        )
+        assert self.names(
+            client.get(self.TOP_URL, {'genre': 'horror'})
+        ) == [first['name']], (
+            f'Проверьте, что `{self.TOP_URL}` учитывает фильтр по жанру.'
+        )
+        assert self.names(
+            client.get(self.TOP_URL, {'year': 1988, 'category': 'books'})
+        ) == [second['name']]
+        response = client.get(self.TOP_URL, {'year': 'давно'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+        create_single_review(moderator_client, first['id'], 'text', 10)
+        with django_assert_num_queries(3):
+            response = client.get(self.TOP_URL)
+        assert self.names(response) == [first['name'], second['name']], (
+            'Проверьте, что рейтинг лучших произведений обновляется '
+            'при добавлении отзыва без полного пересчета.'
+        )
+
+    def test_03_review_change_visible_to_other_processes(
+            self, client, admin_client, user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles
+        create_single_review(user_client, first['id'], 'text', 5)
+        create_single_review(user_client, second['id'], 'text', 7)
+        assert self.names(client.get(self.TOP_URL))[0] == second['name']
+        key = get_facet_key(
+            get_version(LEADERBOARD_VERSION_KEY),
+            get_version(LEADERBOARD_SCORES_KEY),
+            None, None, None,
+        )
+        other_process = {key: cache.get(key)}
+
+        create_single_review(moderator_client, first['id'], 'text', 10)
+        cache.clear()
+        cache.set_many(other_process)
+        assert self.names(client.get(self.TOP_URL))[0] == first['name'], (
+            'Проверьте, что изменение отзыва в одном процессе делает '
+            'недействительными рейтинги лучших в кеше других процессов.'
+        )
@@ -0,0 +1,68 @@
+from http import HTTPStatus
+
+import pytest
+from django.test import override_settings
+
+from tests.utils import create_reviews, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22BatchLookup:
+
+    TITLES_URL = '/api/v1/titles/'
+    USERS_URL = '/api/v1/users/'
+
+    def test_01_titles_by_ids(self, client, admin_client,
+                              django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        ids = f'{titles[1]["id"]},999,{titles[0]["id"]},{titles[1]["id"]}'
+        with django_assert_num_queries(3):
+            response = client.get(self.TITLES_URL, {'ids': ids})
+        assert response.status_code == HTTPStatus.OK
+        assert [title['id'] for title in response.json()] == [
+            titles[1]['id'], titles[0]['id']
+        ], (
+            'Проверьте, что параметр `ids` возвращает существующие '
+            'произведения в запрошенном порядке одним запросом.'
+        )
+        assert response.json()[1]['genre'], (
+            'Проверьте, что жанры произведений загружаются.'
+        )
+        response = client.get(self.TITLES_URL, {'ids': '1,два'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        with override_settings(BATCH_LOOKUP_MAX_SIZE=1):
+            response = client.get(
+                self.TITLES_URL,
+                {'ids': f'{titles[0]["id"]},{titles[1]["id"]}'}
+            )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что количество запрашиваемых объектов ограничено.'
+        )
+
+    def test_02_reviews_by_ids(self, client, admin_client, user, user_client,
+                               moderator, moderator_client):
+        author_map = {user: user_client, moderator: moderator_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        response = client.get(
+            f'{self.TITLES_URL}{titles[0]["id"]}/reviews/',
+            {'ids': f'{reviews[1]["id"]},{reviews[0]["id"]}'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert [review['author'] for review in response.json()] == [
+            reviews[1]['author'], reviews[0]['author']
+        ]
+
+    def test_03_users_by_usernames(self, admin_client, admin, user,
+                                   moderator, django_assert_num_queries):
+        usernames = f'{moderator.username},unknown,{user.username}'
+        with django_assert_num_queries(2):
+            response = admin_client.get(
+                self.USERS_URL, {'usernames': usernames}
+            )
+        assert response.status_code == HTTPStatus.OK
+        assert [item['username'] for item in response.json()] == [
+            moderator.username, user.username
+        ], (
+            'Проверьте, что параметр `usernames` возвращает пользователей '
+            'в запрошенном порядке.'
+        )
@@ -0,0 +1,98 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23NestedQueries:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+    QUERY_BUDGET = 1
+
+    def count_queries(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        return len(context.captured_queries)
+
+    @pytest.mark.parametrize('fast_read', (True, False))
+    def test_01_constant_queries(self, fast_read, client, admin_client,
+                                 admin, user, user_client, moderator,
+                                 moderator_client):
+        author_map = {
+            admin: admin_client, user: user_client, moderator: moderator_client
+        }
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        urls = (
+            reviews_url,
+            f'{reviews_url}{reviews[0]["id"]}/',
+            comments_url,
+            f'{comments_url}{comments[0]["id"]}/',
+        )
+        with override_settings(FAST_READ_ENABLED=fast_read):
+            for url in urls:
+                assert self.count_queries(client, url) <= (
+                    self.QUERY_BUDGET
+                ), (
+                    f'Проверьте, что GET-запрос к `{url}` выполняет '
+                    f'не более {self.QUERY_BUDGET} запросов к базе данных.'
+                )
+                assert self.count_queries(
+                    client, f'{url}?limit=1'
+                ) == self.count_queries(client, url), (
+                    f'Проверьте, что количество запросов к `{url}` '
+                    'не зависит от количества объектов.'
+                )
+
+    def test_02_parent_pairing(self, client, admin_client, user, user_client):
+        _, reviews, titles = create_comments(admin_client, {user: user_client})
+        response = client.get(self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[1]['id'], review_id=reviews[0]['id']
+        ))
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что комментарии отзыва недоступны по адресу '
+            'другого произведения.'
+        )
+
+    def test_03_parent_from_list_query(self, client, admin_client, user,
+                                       user_client):
+        _, reviews, titles = create_comments(admin_client, {user: user_client})
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        response = client.get(url)
+        etag = response['ETag']
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что ETag, построенный по полям родителя из запроса '
+            'списка, совпадает с ETag, проверяемым до выборки.'
+        )
+
+        empty_url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[1]['id'])
+        response = client.get(empty_url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['results'] == [] and response.has_header(
+            'ETag'
+        )
+        for missing_url in (
+            self.REVIEWS_URL_TEMPLATE.format(title_id=999),
+            self.COMMENTS_URL_TEMPLATE.format(title_id=999, review_id=999),
+        ):
+            assert client.get(missing_url).status_code == (
+                HTTPStatus.NOT_FOUND
+            ), (
+                f'Проверьте, что GET-запрос к `{missing_url}` '
+                'несуществующего родителя возвращает 404.'
+            )
@@ -0,0 +1,117 @@
+import logging
+from http import HTTPStatus
+
+import pytest
+from django.test import override_settings
+from django.urls import resolve
+from rest_framework.test import APIClient
+
+from api.v1.budgets import (ROUTE_BUDGETS, Budget, QueryRecorder,
+                            check_budget)
+from api.v1.urls import router_v1
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24QueryBudgets:
+
+    def test_01_every_route_has_budget(self):
+        routes = {pattern.name for pattern in router_v1.urls if pattern.name}
+        assert routes == set(ROUTE_BUDGETS), (
+            'Проверьте, что для каждого маршрута `router_v1` задан бюджет '
+            'запросов в `api.v1.budgets.ROUTE_BUDGETS`. Без бюджета: '
+            f'{sorted(routes - set(ROUTE_BUDGETS))}, лишние: '
+            f'{sorted(set(ROUTE_BUDGETS) - routes)}.'
+        )
+
+    def get_cases(self, user, comments, reviews, titles):
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        review_url = f'{title_url}reviews/{reviews[0]["id"]}/'
+        comment_url = f'{review_url}comments/{comments[0]["id"]}/'
+        title_data = {
+            'name': 'Чужой', 'year': 1979,
+            'genre': ['horror'], 'category': 'films',
+        }
+        return [
+            ('GET', '/api/v1/', None),
+            ('GET', '/api/v1/users/', None),
+            ('POST', '/api/v1/users/', {
+                'username': 'budget', 'email': 'budget@yamdb.fake'
+            }),
+            ('GET', f'/api/v1/users/{user.username}/', None),
+            ('PATCH', f'/api/v1/users/{user.username}/', {'bio': 'Био'}),
+            ('GET', '/api/v1/users/me/', None),
+            ('PATCH', '/api/v1/users/me/', {'bio': 'Био'}),
+            ('GET', '/api/v1/categories/', None),
+            ('POST', '/api/v1/categories/', {'name': 'Игры', 'slug': 'games'}),
+            ('GET', '/api/v1/genres/', None),
+            ('POST', '/api/v1/genres/', {'name': 'Мюзикл', 'slug': 'musical'}),
+            ('GET', '/api/v1/titles/', None),
+            ('POST', '/api/v1/titles/', title_data),
+            ('GET', title_url, None),
+            ('PATCH', title_url, {'description': 'Описание'}),
+            ('POST', '/api/v1/titles/bulk/', [title_data, title_data]),
+            ('GET', '/api/v1/titles/export/', None),
+            ('GET', '/api/v1/titles/top/', None),
+            ('GET', f'{title_url}reviews/', None),
+            ('GET', review_url, None),
+            ('PATCH', review_url, {'text': 'Новый текст'}),
+            ('GET', f'{review_url}comments/', None),
+            ('POST', f'{review_url}comments/', {'text': 'Комментарий'}),
+            ('GET', comment_url, None),
+            ('PATCH', comment_url, {'text': 'Новый текст'}),
+            ('DELETE', comment_url, None),
+            ('POST', f'/api/v1/titles/{titles[1]["id"]}/reviews/', {
+                'text': 'Отзыв', 'score': 7
+            }),
+            ('DELETE', review_url, None),
+            ('DELETE', '/api/v1/categories/games/', None),
+            ('DELETE', '/api/v1/genres/musical/', None),
+            ('DELETE', f'/api/v1/users/{user.username}/', None),
+            ('DELETE', title_url, None),
+        ]
+
+    def test_02_routes_within_budget(self, admin_client, admin, user,
+                                     user_client):
+        author_map = {admin: admin_client, user: user_client}
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        failures = []
+        for method, url, data in self.get_cases(
+                user, comments, reviews, titles):
+            route_name = resolve(url).url_name
+            budget = ROUTE_BUDGETS[route_name][method]
+            with QueryRecorder() as recorder:
+                response = getattr(admin_client, method.lower())(
+                    url, data, format='json'
+                )
+                if response.streaming:
+                    b''.join(response.streaming_content)
+            assert response.status_code < HTTPStatus.BAD_REQUEST, (
+                f'{method} {url}: статус {response.status_code}'
+            )
+            violations = check_budget(budget, recorder)
+            if violations:
+                failures.append(
+                    f'{method} {url} ({route_name}): '
+                    f'{"; ".join(violations)}\n{recorder.format_queries()}'
+                )
+        assert not failures, (
+            'Проверьте, что запросы укладываются в бюджеты '
+            '`api.v1.budgets.ROUTE_BUDGETS`:\n' + '\n\n'.join(failures)
+        )
+
+    def test_03_middleware_logs_violations(self, admin_client, caplog,
+                                           monkeypatch):
+        create_comments(admin_client, {})
+        monkeypatch.setitem(
+            ROUTE_BUDGETS, 'titles-list', {'GET': Budget(0, 0)}
+        )
+        with override_settings(QUERY_BUDGET_LOGGING=True):
+            with caplog.at_level(logging.WARNING, logger='budgets'):
+                response = APIClient().get('/api/v1/titles/')
+        assert response.status_code == HTTPStatus.OK
+        assert 'TitleViewSet.list' in caplog.text, (
+            'Проверьте, что middleware логирует превышение бюджета '
+            'с именем view.'
+        )
+        assert 'SELECT' in caplog.text
@@ -0,0 +1,87 @@
+from http import HTTPStatus
+
+import pytest
+from django.test import override_settings
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25Profiler:
+
+    TITLES_URL = '/api/v1/titles/'
+    PROFILES_URL = '/api/v1/profiles/'
+
+    def test_01_profile_is_recorded(self, tmp_path, admin_client,
+                                    user_client):
+        create_titles(admin_client)
+        with override_settings(PROFILER_DIR=tmp_path):
+            response = user_client.get(self.TITLES_URL, {'profile': 1})
+            assert 'X-Profile-Id' not in response, (
+                'Проверьте, что профилирование доступно только админу.'
+            )
+            response = admin_client.get(self.TITLES_URL)
+            assert 'X-Profile-Id' not in response, (
+                'Проверьте, что без триггера профиль не снимается.'
+            )
+            response = admin_client.get(
+                self.TITLES_URL, HTTP_X_PROFILE='1'
+            )
+            assert response.status_code == HTTPStatus.OK
+            profile_id = response['X-Profile-Id']
+
+            response = user_client.get(self.PROFILES_URL)
+            assert response.status_code == HTTPStatus.FORBIDDEN
+            response = admin_client.get(self.PROFILES_URL)
+            assert [item['id'] for item in response.json()] == [profile_id]
+
+            report = admin_client.get(
+                f'{self.PROFILES_URL}{profile_id}/'
+            ).json()
+            assert report['view'] == 'TitleViewSet.list'
+            assert report['stats'], (
+                'Проверьте, что профиль содержит статистику cProfile.'
+            )
+            selects = [
+                query for query in report['queries']
+                if query['sql'].startswith('SELECT')
+            ]
+            assert selects and all(query['plan'] for query in selects), (
+                'Проверьте, что для SQL-запросов сохраняется план EXPLAIN.'
+            )
+            response = admin_client.get(
+                f'{self.PROFILES_URL}{profile_id}/', {'download': 1}
+            )
+            assert response.status_code == HTTPStatus.OK
+            assert b''.join(response.streaming_content)
+
+    def test_02_ring_buffer(self, tmp_path, admin_client):
+        with override_settings(PROFILER_DIR=tmp_path, PROFILER_MAX_ENTRIES=2):
+            ids = [
+                admin_client.get(
+                    self.TITLES_URL, {'profile': 1}
+                )['X-Profile-Id']
+                for _ in range(3)
+            ]
+            response = admin_client.get(self.PROFILES_URL)
+        assert [item['id'] for item in response.json()] == ids[:0:-1], (
+            'Проверьте, что хранится не более `PROFILER_MAX_ENTRIES` '
+            'последних профилей.'
+        )
+        assert len(list(tmp_path.iterdir())) == 4
+        response = admin_client.get(f'{self.PROFILES_URL}../secret/')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_03_missing_stats_file(self, tmp_path, admin_client):
+        with override_settings(PROFILER_DIR=tmp_path):
+            profile_id = admin_client.get(
+                self.TITLES_URL, {'profile': 1}
+            )['X-Profile-Id']
+            (tmp_path / f'{profile_id}.prof').unlink()
+            response = admin_client.get(
+                f'{self.PROFILES_URL}{profile_id}/', {'download': 1}
+            )
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что при отсутствии файла статистики cProfile '
+            'возвращается ответ со статусом 404.'
+        )
@@ -0,0 +1,102 @@
+from http import HTTPStatus
+
+import pytest
+from django.test import override_settings
+from prometheus_client import REGISTRY
+
+from tests.utils import create_titles
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26Metrics:
+
+    METRICS_URL = '/metrics'
+    METRICS_TOKEN = 'scrape-token'
+    AUTHORIZATION = f'Bearer {METRICS_TOKEN}'
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_request_metrics(self, client, admin_client):
+        create_titles(admin_client)
+        labels = {'view': 'TitleViewSet.list', 'method': 'GET'}
+        requests_before = sample(
+            'yamdb_http_requests_total', status='200', **labels
+        )
+        latency_before = sample(
+            'yamdb_http_request_duration_seconds_count', **labels
+        )
+        queries_before = sample('yamdb_db_queries_per_request_sum', **labels)
+        hits_before = sample(
+            'yamdb_response_cache_total',
+            view='TitleViewSet.list', outcome='hit'
+        )
+
+        client.get(self.TITLES_URL)
+        client.get(self.TITLES_URL)
+
+        assert sample(
+            'yamdb_http_requests_total', status='200', **labels
+        ) == requests_before + 2, (
+            'Проверьте, что количество запросов учитывается '
+            'по имени view и действия.'
+        )
+        assert sample(
+            'yamdb_http_request_duration_seconds_count', **labels
+        ) == latency_before + 2
+        assert sample(
+            'yamdb_db_queries_per_request_sum', **labels
+        ) > queries_before, (
+            'Проверьте, что учитывается количество SQL-запросов.'
+        )
+        assert sample(
+            'yamdb_response_cache_total',
+            view='TitleViewSet.list', outcome='hit'
+        ) == hits_before + 1, (
+            'Проверьте, что учитываются попадания в кеш ответов.'
+        )
+
+    @override_settings(METRICS_TOKEN=METRICS_TOKEN)
+    def test_02_metrics_endpoint(self, client):
+        client.post('/api/v1/auth/signup/', data={})
+        response = client.get(
+            self.METRICS_URL, HTTP_AUTHORIZATION=self.AUTHORIZATION
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что эндпоинт `{self.METRICS_URL}` доступен.'
+        )
+        content = response.content.decode()
+        assert 'yamdb_http_requests_total{' in content
+        assert 'view="APISignUpView.post"' in content, (
+            'Проверьте, что метрики размечаются именем view и метода.'
+        )
+
+    @override_settings(METRICS_TOKEN=METRICS_TOKEN)
+    def test_03_multiprocess_registry(self, client, tmp_path, monkeypatch):
+        monkeypatch.setenv('PROMETHEUS_MULTIPROC_DIR', str(tmp_path))
+        response = client.get(
+            self.METRICS_URL, HTTP_AUTHORIZATION=self.AUTHORIZATION
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что в многопроцессном режиме метрики собираются '
+            'из каталога `PROMETHEUS_MULTIPROC_DIR`.'
+        )
+
+    def test_04_metrics_require_token(self, client):
+        response = client.get(self.METRICS_URL)
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что без METRICS_TOKEN метрики недоступны.'
+        )
+        with override_settings(METRICS_TOKEN=self.METRICS_TOKEN):
+            for headers in (
+                {},
+                {'HTTP_AUTHORIZATION': 'Bearer wrong-token'},
+                {'HTTP_AUTHORIZATION': self.METRICS_TOKEN},
+            ):
+                response = client.get(self.METRICS_URL, **headers)
+                assert response.status_code == HTTPStatus.FORBIDDEN, (
+                    f'Проверьте, что `{self.METRICS_URL}` доступен '
+                    'только с токеном из METRICS_TOKEN.'
+                )
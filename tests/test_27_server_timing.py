@@ -0,0 +1,88 @@
+import re
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+METRIC_PATTERN = re.compile(r'^(\w+);dur=(\d+\.\d{2});desc="[^"]*"$')
+
+
+def parse_server_timing(header):
+    metrics = {}
+    for entry in header.split(', '):
+        match = METRIC_PATTERN.match(entry)
+        assert match, f'Некорректная запись Server-Timing: `{entry}`'
+        metrics[match.group(1)] = float(match.group(2))
+    return metrics
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27ServerTiming:
+
+    TITLES_URL = '/api/v1/titles/'
+    STAGES = {'auth', 'perm', 'db', 'serialize', 'render', 'total'}
+
+    def check_header(self, response):
+        assert 'Server-Timing' in response, (
+            'Проверьте, что ответ API содержит заголовок Server-Timing'
+        )
+        metrics = parse_server_timing(response['Server-Timing'])
+        assert set(metrics) == self.STAGES, (
+            'Проверьте, что заголовок Server-Timing содержит этапы '
+            f'{sorted(self.STAGES)}'
+        )
+        assert metrics['total'] >= max(
+            metrics[name] for name in self.STAGES - {'total'}
+        ), (
+            'Проверьте, что время `total` не меньше времени каждого этапа'
+        )
+        return metrics
+
+    def test_01_viewset_responses(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        metrics = self.check_header(response)
+        assert metrics['db'] > 0, (
+            'Проверьте, что время SQL-запросов учитывается в этапе `db`'
+        )
+        response = admin_client.get(f'{self.TITLES_URL}{titles[0]["id"]}/')
+        assert response.status_code == HTTPStatus.OK
+        metrics = self.check_header(response)
+        assert metrics['auth'] > 0, (
+            'Проверьте, что время аутентификации учитывается в этапе `auth`'
+        )
+        response = admin_client.get('/api/v1/categories/')
+        self.check_header(response)
+
+    def test_02_error_responses(self, client, user_client):
+        response = client.post(self.TITLES_URL, data={})
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+        self.check_header(response)
+        response = user_client.get('/api/v1/cache/stats/')
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        self.check_header(response)
+        response = client.get(f'{self.TITLES_URL}999999/')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        self.check_header(response)
+
+    def test_03_api_views(self, client):
+        response = client.post('/api/v1/auth/signup/', data={})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        self.check_header(response)
+        response = client.get('/api/v1/')
+        assert response.status_code == HTTPStatus.OK
+        self.check_header(response)
+
+    def test_04_stages_do_not_overlap(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = admin_client.get(f'{self.TITLES_URL}{titles[0]["id"]}/')
+        metrics = self.check_header(response)
+        stages = sum(
+            metrics[name] for name in self.STAGES - {'total'}
+        )
+        assert stages <= metrics['total'] + 0.05, (
+            'Проверьте, что время SQL аутентификации и проверки '
+            'разрешений не учитывается повторно в этапе `db`'
+        )
@@ -0,0 +1,92 @@
+import csv
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count, Sum
+
+from reviews.management.csv_config import CSV_MAPPING, M2M_MODELS_MAPPING
+from reviews.models import Category, Comment, Review, Title
+from users.models import User
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28DbGenerate:
+
+    def test_01_generate_to_database(self, admin):
+        call_command('db_generate', scale=1, seed=1, batch_size=500)
+
+        assert Title.objects.count() == 100, (
+            'Проверьте, что при `--scale 1` создается 100 произведений'
+        )
+        assert User.objects.count() == 201, (
+            'Проверьте, что пользователи добавляются к существующим'
+        )
+        assert Review.objects.exists() and Comment.objects.exists()
+        assert not Title.objects.annotate(
+            genres=Count('genre')
+        ).filter(genres=0).exists(), (
+            'Проверьте, что у каждого произведения есть жанры'
+        )
+        duplicates = Review.objects.values('author', 'title').annotate(
+            total=Count('id')
+        ).filter(total__gt=1)
+        assert not duplicates.exists()
+        assert Title.objects.aggregate(
+            total=Sum('reviews_count')
+        )['total'] == Review.objects.count(), (
+            'Проверьте, что после генерации пересчитывается рейтинг'
+        )
+        assert Review.objects.aggregate(
+            total=Sum('comments_count')
+        )['total'] == Comment.objects.count(), (
+            'Проверьте, что после генерации пересчитываются '
+            'счетчики комментариев'
+        )
+        counts = list(
+            Title.objects.order_by('-reviews_count')
+            .values_list('reviews_count', flat=True)
+        )
+        assert counts[0] > 3 * counts[len(counts) // 2], (
+            'Проверьте, что количество отзывов на произведение '
+            'имеет тяжелый хвост'
+        )
+
+    def test_02_non_empty_catalog(self):
+        Category.objects.create(name='Фильм', slug='movie')
+        with pytest.raises(CommandError):
+            call_command('db_generate', scale=1)
+        assert not Title.objects.exists()
+
+    def test_03_csv_output(self, tmp_path):
+        first, second, other = (
+            tmp_path / 'first', tmp_path / 'second', tmp_path / 'other'
+        )
+        call_command('db_generate', scale=1, seed=5, csv=str(first))
+        call_command('db_generate', scale=1, seed=5, csv=str(second))
+        call_command('db_generate', scale=1, seed=6, csv=str(other))
+
+        assert not Title.objects.exists(), (
+            'Проверьте, что с параметром `--csv` база данных не изменяется'
+        )
+        for mapping in (CSV_MAPPING, M2M_MODELS_MAPPING):
+            for table, config in mapping.items():
+                path = first / f'{table}.csv'
+                with open(path, encoding='utf-8') as file:
+                    header = next(csv.reader(file))
+                for column in config['fields'].values():
+                    if isinstance(column, tuple):
+                        column = column[0]
+                    assert column in header, (
+                        f'Проверьте, что файл `{path.name}` содержит '
+                        f'столбец `{column}` из `CSV_MAPPING`'
+                    )
+                assert path.read_bytes() == (
+                    second / path.name
+                ).read_bytes(), (
+                    'Проверьте, что генерация с одинаковым `--seed` '
+                    'детерминирована'
+                )
+        assert (first / 'review.csv').read_bytes() != (
+            other / 'review.csv'
+        ).read_bytes()
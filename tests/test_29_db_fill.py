@@ -0,0 +1,150 @@
+import csv
+import logging
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.management import services
+from reviews.management.csv_config import CSV_MAPPING, M2M_MODELS_MAPPING
+from reviews.management.exceptions import TableFillError
+from reviews.management.services import (fill_many_to_many_tables,
+                                         fill_simple_and_foreign_key_tables)
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.models import User
+
+
+def count_rows(table, mapping=CSV_MAPPING):
+    with open(mapping[table]['path'], encoding='utf-8') as file:
+        return sum(1 for _ in csv.DictReader(file))
+
+
+def write_csv(path, rows):
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerows(rows)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29DbFill:
+
+    def test_01_fill_all(self):
+        call_command('db_fill', all=True)
+
+        for model, table in (
+            (User, 'users'), (Category, 'category'), (Genre, 'genre'),
+            (Title, 'titles'), (Review, 'review'), (Comment, 'comments'),
+        ):
+            assert model.objects.count() == count_rows(table), (
+                f'Проверьте, что команда `db_fill --all` загружает '
+                f'все строки файла {table}.csv'
+            )
+        assert Title.objects.filter(rating__isnull=False).exists()
+
+    def test_02_foreign_keys_without_per_row_queries(self):
+        call_command('db_fill', users=True, category=True, genre=True,
+                     titles=True)
+        with CaptureQueriesContext(connection) as context:
+            fill_simple_and_foreign_key_tables(CSV_MAPPING, 'review')
+        assert Review.objects.count() == count_rows('review')
+        assert len(context) < count_rows('review') // 10, (
+            'Проверьте, что связанные объекты проверяются пакетами, '
+            'а не запросом на каждую строку csv-файла'
+        )
+
+    def test_03_missing_reference_row_number(self, tmp_path):
+        call_command('db_fill', category=True)
+        path = tmp_path / 'titles.csv'
+        write_csv(path, (
+            ('id', 'name', 'year', 'category'),
+            (1, 'Побег из Шоушенка', 1994, 1),
+            (2, 'Крестный отец', 1972, 999),
+        ))
+        mapping = {'titles': {**CSV_MAPPING['titles'], 'path': str(path)}}
+        with pytest.raises(TableFillError, match='Строка 3.*999'):
+            fill_simple_and_foreign_key_tables(mapping, 'titles')
+
+        write_csv(path, (
+            ('id', 'name', 'year', 'category'),
+            (1, 'Побег из Шоушенка', 1994, 'movie'),
+        ))
+        with pytest.raises(TableFillError, match='Строка 2'):
+            fill_simple_and_foreign_key_tables(mapping, 'titles')
+
+    def test_04_streaming_chunks(self, tmp_path, monkeypatch, caplog):
+        call_command('db_fill', category=True)
+        path = tmp_path / 'titles.csv'
+        rows = [('id', 'name', 'year', 'category')]
+        rows += [(index, f'Произведение {index}', 2000, 1)
+                 for index in range(1, 26)]
+        write_csv(path, rows)
+        mapping = {'titles': {**CSV_MAPPING['titles'], 'path': str(path)}}
+        chunks = []
+        bulk_fill = services.bulk_fill
+        monkeypatch.setattr(services, 'BULK_CREATE_BATCH_SIZE', 10)
+        monkeypatch.setattr(
+            services, 'bulk_fill',
+            lambda model, data: chunks.append(len(data)) or bulk_fill(
+                model, data
+            )
+        )
+        with caplog.at_level(logging.INFO, logger='import'):
+            fill_simple_and_foreign_key_tables(mapping, 'titles')
+        assert chunks == [10, 10, 5], (
+            'Проверьте, что строки csv-файла сохраняются пакетами '
+            'по `BULK_CREATE_BATCH_SIZE`'
+        )
+        assert Title.objects.count() == 25
+        assert any(
+            'строк/с' in record.getMessage() for record in caplog.records
+        ), 'Проверьте, что логируется скорость загрузки таблицы'
+
+        Title.objects.all().delete()
+        write_csv(path, rows + [(26, 'Произведение 26', 2000, 999)])
+        with pytest.raises(TableFillError, match='Строка 27'):
+            fill_simple_and_foreign_key_tables(mapping, 'titles')
+
+    def test_05_many_to_many_bulk(self, tmp_path):
+        call_command('db_fill', genre=True, category=True, titles=True)
+        through = Title.genre.through
+        with CaptureQueriesContext(connection) as context:
+            fill_many_to_many_tables(M2M_MODELS_MAPPING, 'genre_title')
+        links = count_rows('genre_title', M2M_MODELS_MAPPING)
+        assert through.objects.count() == links, (
+            'Проверьте, что команда `db_fill --genre_title` загружает '
+            'все связи произведений и жанров'
+        )
+        assert len(context) < 10, (
+            'Проверьте, что связи M2M сохраняются пакетами, '
+            'а не запросами на каждую строку csv-файла'
+        )
+
+        path = tmp_path / 'genre_title.csv'
+        link = through.objects.first()
+        new_genre = Genre.objects.exclude(
+            titles=link.title_id
+        ).values_list('id', flat=True).first()
+        write_csv(path, (
+            ('id', 'title_id', 'genre_id'),
+            (1, link.title_id, link.genre_id),
+            (2, link.title_id, new_genre),
+        ))
+        mapping = {
+            'genre_title': {
+                **M2M_MODELS_MAPPING['genre_title'], 'path': str(path)
+            }
+        }
+        fill_many_to_many_tables(mapping, 'genre_title', incremental=True)
+        assert through.objects.count() == links + 1, (
+            'Проверьте, что в режиме `incremental` связи добавляются '
+            'к существующим, а повторные связи пропускаются'
+        )
+
+        write_csv(path, (
+            ('id', 'title_id', 'genre_id'),
+            (1, link.title_id, link.genre_id),
+            (2, link.title_id, 999),
+        ))
+        with pytest.raises(TableFillError, match='Строка 3.*Genre 999'):
+            fill_many_to_many_tables(mapping, 'genre_title')